@@ -2,10 +2,11 @@ import click
 
 from globus_sdk import TransferAPIError
 from globus_cli.parsing import common_options
-from globus_cli.safeio import formatted_print
+from globus_cli.safeio import formatted_print, iterable_response_to_dict
+from globus_cli.helpers import outformat_is_json, outformat_is_unix
 
-from globus_cli.services.transfer import (
-    iterable_response_to_dict, get_client, display_name_or_cname)
+from globus_cli.services.transfer import get_client, display_name_or_cname
+from globus_cli.services.paging import map_concurrently
 
 
 @click.command('list', help='List bookmarks for the current user')
@@ -18,8 +19,7 @@ def bookmark_list():
 
     bookmark_iterator = client.bookmark_list()
 
-    def get_ep_name(item):
-        ep_id = item['endpoint_id']
+    def lookup_ep_name(client, ep_id):
         try:
             ep_doc = client.get_endpoint(ep_id)
             return display_name_or_cname(ep_doc)
@@ -29,6 +29,17 @@ def bookmark_list():
             else:
                 raise err
 
+    # bookmarks all come in one response, but each endpoint is looked up
+    # separately -- do that concurrently, and once per endpoint, up front
+    ep_names = {}
+    if not outformat_is_json() and not outformat_is_unix():
+        ep_names = map_concurrently(
+            lookup_ep_name, [x['endpoint_id'] for x in bookmark_iterator],
+            get_client)
+
+    def get_ep_name(item):
+        return ep_names[item['endpoint_id']]
+
     formatted_print(
         bookmark_iterator,
         fields=[('Name', 'name'), ('Bookmark ID', 'id'),
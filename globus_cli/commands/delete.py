@@ -5,38 +5,79 @@ from globus_sdk import DeleteData
 
 from globus_cli.parsing import (
     common_options, task_submission_options, TaskPath, ENDPOINT_PLUS_OPTPATH,
-    shlex_process_stdin, delete_and_rm_options)
+    process_batch_input, delete_and_rm_options, batch_input_options,
+    task_chunking_options, BATCH_FORMAT_SHLEX)
 from globus_cli.safeio import (
     safeprint, formatted_print, FORMAT_TEXT_RECORD,
     err_is_terminal, term_is_interactive)
 
-from globus_cli.services.transfer import get_client, autoactivate
+from globus_cli.services.transfer import (
+    get_client, BackgroundAutoactivation, call_with_background_autoactivation)
+from globus_cli.services.chunked_submission import (
+    ChunkedTaskSubmitter, finish_chunked_submission,
+    abort_chunked_submission, read_submission_ids)
 
 
 @click.command('delete', short_help='Submit a delete task (asynchronous)',
-               help=('Delete a file or directory from one endpoint as an '
-                     'asynchronous task.'))
+               help=("""\
+    Delete a file or directory from one endpoint as an asynchronous task.
+
+    \b
+    Batched Input
+    ===
+
+    Using `--batch`, `globus delete` reads paths to delete from stdin, one per
+    line. Lines are split on spaces, respecting quotes. Other formats may be
+    used with `--batch-format`:
+
+    \b
+    null: NUL-delimited paths, as produced by `find -print0`
+    ndjson: objects like {"path": ...}
+    csv: rows of PATH, or with a header row of path
+
+    Use `--batch-file` to read batch input from a file instead of stdin.
+    """))
 @common_options
 @task_submission_options
 @delete_and_rm_options
+@batch_input_options
+@task_chunking_options
 @click.argument('endpoint_plus_path', metavar=ENDPOINT_PLUS_OPTPATH.metavar,
                 type=ENDPOINT_PLUS_OPTPATH)
-def delete_command(batch, ignore_missing, star_silent, recursive, enable_globs,
-                   endpoint_plus_path, label, submission_id, dry_run, deadline,
-                   skip_activation_check, notify):
+def delete_command(batch, batch_format, batch_file, ignore_missing,
+                   star_silent, recursive, enable_globs, endpoint_plus_path,
+                   label, submission_id, dry_run, deadline,
+                   skip_activation_check, notify, max_items_per_task,
+                   max_payload_bytes, submission_ids_file):
     """
     Executor for `globus delete`
     """
     endpoint_id, path = endpoint_plus_path
+
+    batch = batch or batch_file is not None
+    if batch_format != BATCH_FORMAT_SHLEX and not batch:
+        raise click.UsageError(
+            '--batch-format can only be used with --batch or --batch-file')
+
     if path is None and (not batch):
         raise click.UsageError(
             'delete requires either a PATH OR --batch')
 
+    chunked = max_items_per_task is not None or max_payload_bytes is not None
+    submission_ids = read_submission_ids(submission_ids_file, submission_id,
+                                         chunked)
+    if submission_ids:
+        submission_id = submission_ids[0]
+
     client = get_client()
 
     # attempt to activate unless --skip-activation-check is given
+    # this runs in the background while batch input is read, and is waited on
+    # before submission
+    activation = None
     if not skip_activation_check:
-        autoactivate(client, endpoint_id, if_expires_in=60)
+        activation = BackgroundAutoactivation(
+            (endpoint_id,), if_expires_in=60)
 
     delete_data = DeleteData(client, endpoint_id,
                              label=label,
@@ -48,6 +89,16 @@ def delete_command(batch, ignore_missing, star_silent, recursive, enable_globs,
                              interpret_globs=enable_globs,
                              **notify)
 
+    if chunked:
+        submitter = ChunkedTaskSubmitter(
+            delete_data, max_items=max_items_per_task,
+            max_payload_bytes=max_payload_bytes, dry_run=dry_run,
+            before_submit=activation and activation.wait,
+            submission_ids=submission_ids)
+        add_item = submitter.add_item
+    else:
+        add_item = delete_data.add_item
+
     if batch:
         # although this sophisticated structure (like that in transfer)
         # isn't strictly necessary, it gives us the ability to add options in
@@ -59,10 +110,18 @@ def delete_command(batch, ignore_missing, star_silent, recursive, enable_globs,
             Parse a line of batch input and add it to the delete submission
             item.
             """
-            delete_data.add_item(str(path))
+            add_item(str(path))
 
-        shlex_process_stdin(
-            process_batch_line, 'Enter paths to delete, line by line.')
+        try:
+            process_batch_input(
+                process_batch_line, 'Enter paths to delete, line by line.',
+                batch_format=batch_format, batch_file=batch_file)
+        except BaseException:
+            # bad lines exit, like any click command, but chunks may have been
+            # submitted already, and must be reported
+            if chunked:
+                abort_chunked_submission(submitter)
+            raise
     else:
         if not star_silent and enable_globs and path.endswith('*'):
             # not intuitive, but `click.confirm(abort=True)` prints to stdout
@@ -75,7 +134,14 @@ def delete_command(batch, ignore_missing, star_silent, recursive, enable_globs,
                     .format(path), err=True)):
                 safeprint('Aborted.', write_to_stderr=True)
                 click.get_current_context().exit(1)
-        delete_data.add_item(path)
+        add_item(path)
+
+    if activation is not None:
+        activation.wait()
+
+    if chunked:
+        finish_chunked_submission(submitter, (('Path', 'path'),))
+        return
 
     if dry_run:
         formatted_print(delete_data, response_key='DATA',
@@ -83,6 +149,8 @@ def delete_command(batch, ignore_missing, star_silent, recursive, enable_globs,
         # exit safely
         return
 
-    res = client.submit_delete(delete_data)
+    # resubmission is safe, as the submission ID is unchanged
+    res = call_with_background_autoactivation(
+        activation, client.submit_delete, delete_data)
     formatted_print(res, text_format=FORMAT_TEXT_RECORD,
                     fields=(('Message', 'message'), ('Task ID', 'task_id')))
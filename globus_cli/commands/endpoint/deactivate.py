@@ -4,6 +4,7 @@ from globus_cli.parsing import common_options, endpoint_id_arg
 from globus_cli.safeio import formatted_print, FORMAT_TEXT_RAW
 
 from globus_cli.services.transfer import get_client
+from globus_cli.services.activation_cache import invalidate_activation
 
 
 @click.command('deactivate', help='Deactivate an endpoint')
@@ -15,4 +16,5 @@ def endpoint_deactivate(endpoint_id):
     """
     client = get_client()
     res = client.endpoint_deactivate(endpoint_id)
+    invalidate_activation(endpoint_id)
     formatted_print(res, text_format=FORMAT_TEXT_RAW, response_key='message')
@@ -1,12 +1,14 @@
 import click
 
-from globus_cli.parsing import CaseInsensitiveChoice, common_options
-from globus_cli.safeio import formatted_print
+from globus_cli.parsing import (
+    CaseInsensitiveChoice, common_options, all_fields_option)
+from globus_cli.safeio import formatted_print, iterable_response_to_dict
+from globus_cli.helpers import projected_fields
 
 from globus_cli.services.auth import maybe_lookup_identity_id
 
-from globus_cli.services.transfer import (
-    ENDPOINT_LIST_FIELDS, get_client, iterable_response_to_dict)
+from globus_cli.services.transfer import ENDPOINT_LIST_FIELDS, get_client
+from globus_cli.services.paging import prefetching
 
 
 @click.command('search', help='Search for Globus endpoints')
@@ -21,8 +23,10 @@ from globus_cli.services.transfer import (
               help=('Filter search results to endpoints owned by a specific '
                     'identity. Can be the Identity ID, or the Identity '
                     'Username, as in "go@globusid.org"'))
+@all_fields_option
 @click.argument('filter_fulltext', required=False)
-def endpoint_search(filter_fulltext, filter_owner_id, filter_scope):
+def endpoint_search(filter_fulltext, filter_owner_id, filter_scope,
+                    all_fields):
     """
     Executor for `globus endpoint search`
     """
@@ -39,9 +43,17 @@ def endpoint_search(filter_fulltext, filter_owner_id, filter_scope):
     if owner_id:
         owner_id = maybe_lookup_identity_id(owner_id)
 
-    search_iterator = client.endpoint_search(
+    # only ask for the fields which will be output -- the display name may
+    # come from either of two fields
+    params = {}
+    projection = None if all_fields else projected_fields(
+        ENDPOINT_LIST_FIELDS, extra_keys=('display_name', 'canonical_name'))
+    if projection is not None:
+        params['fields'] = projection
+
+    search_iterator = prefetching(client.endpoint_search(
         filter_fulltext=filter_fulltext, filter_scope=filter_scope,
-        filter_owner_id=owner_id)
+        filter_owner_id=owner_id, **params), client_factory=get_client)
 
     formatted_print(search_iterator, fields=ENDPOINT_LIST_FIELDS,
                     json_converter=iterable_response_to_dict)
@@ -0,0 +1,114 @@
+import click
+
+from globus_cli.parsing import (
+    common_options, ENDPOINT_PLUS_OPTPATH, ComparisonType, SIZE_UNITS)
+from globus_cli.safeio import (
+    formatted_print, iterable_response_to_dict, OutputBuffer,
+    FORMAT_TEXT_TABLE)
+from globus_cli.helpers import is_verbose
+from globus_cli.services.transfer import (
+    get_client, BackgroundAutoactivation, call_with_background_autoactivation)
+from globus_cli.services.recursive_ls import LS_PAGE_SIZE
+from globus_cli.services.ls_filters import EntryFilter
+
+# the types of entries, by the letters find(1) uses for them
+ENTRY_TYPES = {'f': 'file', 'd': 'dir', 'l': 'link'}
+
+
+@click.command('find', help=("""\
+Search a directory on an endpoint, and everything in it, for files and
+directories matching all of the given tests
+
+\b
+Options may also be given with a single dash, as for find(1), so
+"-name '*.h5' -size +10G -mtime -7" finds HDF5 files larger than 10GiB
+modified in the last week.
+
+\b
+As much of each test as possible is sent to the endpoint as a filter, so that
+entries which don't match aren't sent to the CLI. With -size or -mtime, this
+takes two calls for each directory searched further."""),
+               short_help='Search for files and dirs on an endpoint')
+@common_options
+@click.argument('endpoint_plus_path', metavar=ENDPOINT_PLUS_OPTPATH.metavar,
+                type=ENDPOINT_PLUS_OPTPATH)
+@click.option('--name', '-name', metavar='GLOB',
+              help=('Find entries with names matching the glob pattern '
+                    '(*, ?, [seq])'))
+@click.option('--type', '-type', 'entry_type',
+              type=click.Choice(sorted(ENTRY_TYPES)),
+              help='Find files (f), directories (d), or symlinks (l)')
+@click.option('--size', '-size', type=ComparisonType(SIZE_UNITS),
+              help=('Find entries larger than (+N), smaller than (-N) or of '
+                    'exactly (N) the size, in bytes, or in units of c, k, M, '
+                    'G or T (powers of 1024). As find(1) does, sizes are '
+                    'rounded up to the unit, so -1M finds only empty files'))
+@click.option('--mtime', '-mtime', type=ComparisonType(),
+              help=('Find entries last modified more than (+N), less than '
+                    '(-N) or exactly (N) days ago, counting whole days, as '
+                    'find(1) does'))
+@click.option('--maxdepth', '-maxdepth', type=click.IntRange(min=1),
+              metavar='INTEGER',
+              help=('Descend at most this many levels of directories. 1 '
+                    'searches only the entries of the given directory'))
+@click.option('--exclude-dir', 'exclude_dirs', metavar='GLOB', multiple=True,
+              help=('Do not search directories with names matching the '
+                    'pattern, nor give them as results'))
+@click.option('--max-entries', type=click.IntRange(min=1), metavar='INTEGER',
+              help='Stop after finding this many entries')
+@click.option('--page-size', default=LS_PAGE_SIZE, show_default=True,
+              type=click.IntRange(min=1), metavar='INTEGER',
+              help=('The most entries fetched from the endpoint in one call. '
+                    'Larger directories are listed a page at a time'))
+def find_command(endpoint_plus_path, name, entry_type, size, mtime, maxdepth,
+                 exclude_dirs, max_entries, page_size):
+    """
+    Executor for `globus find`
+    """
+    endpoint_id, path = endpoint_plus_path
+
+    # names never contain "/", so such patterns could never match
+    if name and '/' in name:
+        raise click.UsageError('--name cannot contain "/"')
+    if any('/' in glob for glob in exclude_dirs):
+        raise click.UsageError('--exclude-dir cannot contain "/"')
+
+    client = get_client()
+    activation = BackgroundAutoactivation(
+        (endpoint_id,), if_expires_in=60)
+
+    # like find(1), hidden entries are found too
+    ls_params = {"show_hidden": 1}
+    if path:
+        ls_params["path"] = path
+
+    entry_filter = EntryFilter(
+        name=name, entry_type=ENTRY_TYPES.get(entry_type), size=size,
+        age=mtime)
+
+    # a maxdepth of 1 is a recursive ls with depth 0, and without one there
+    # is no limit
+    res = call_with_background_autoactivation(
+        activation, client.recursive_operation_ls, endpoint_id,
+        depth=maxdepth - 1 if maxdepth else float('inf'),
+        page_size=page_size, exclude_dirs=exclude_dirs,
+        max_entries=max_entries, entry_filter=entry_filter, **ls_params)
+
+    # entries are given as paths from the one given, if any
+    prefix = path.rstrip('/') + '/' if path else ''
+
+    def item_path(item):
+        return prefix + item['name']
+
+    def print_paths(res):
+        with OutputBuffer() as output:
+            for item in res:
+                output.echo(item_path(item))
+
+    formatted_print(
+        res, fields=[('Permissions', 'permissions'), ('User', 'user'),
+                     ('Group', 'group'), ('Size', 'size'),
+                     ('Last Modified', 'last_modified'), ('File Type', 'type'),
+                     ('Path', item_path)],
+        text_format=FORMAT_TEXT_TABLE if is_verbose() else print_paths,
+        json_converter=iterable_response_to_dict)
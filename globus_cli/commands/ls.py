@@ -1,10 +1,13 @@
 import click
 
 from globus_cli.parsing import common_options, ENDPOINT_PLUS_OPTPATH
-from globus_cli.safeio import formatted_print
-from globus_cli.helpers import is_verbose, outformat_is_text
+from globus_cli.safeio import (
+    formatted_print, iterable_response_to_dict, OutputBuffer,
+    FORMAT_TEXT_TABLE)
+from globus_cli.helpers import is_verbose
 from globus_cli.services.transfer import (
-    get_client, autoactivate, iterable_response_to_dict)
+    get_client, BackgroundAutoactivation, call_with_background_autoactivation)
+from globus_cli.services.recursive_ls import LS_PAGE_SIZE
 
 
 @click.command('ls', help=("""\
@@ -27,7 +30,12 @@ If none of these are given, "=" will be used
 "!~" does inverse "~" matching
 
 \b
-"~*.txt" matches all .txt files, for example"""),
+"~*.txt" matches all .txt files, for example
+
+--exclude-dir and --include take glob patterns (*, ?, [seq]) matched against
+the names of entries, and can be given more than once. Patterns using only "*"
+are passed on to the endpoint as filters where they can be, so that entries
+which don't match aren't sent to the CLI."""),
                short_help='List endpoint directory contents')
 @common_options
 @click.argument('endpoint_plus_path', metavar=ENDPOINT_PLUS_OPTPATH.metavar,
@@ -47,17 +55,34 @@ If none of these are given, "=" will be used
               help=('Limit to number of directories to traverse in '
                     '`--recursive` listings. A value of 0 indicates that '
                     'this should behave like a non-recursive `ls`'))
+@click.option('--page-size', default=LS_PAGE_SIZE, show_default=True,
+              type=click.IntRange(min=1), metavar='INTEGER',
+              help=('The most entries fetched from the endpoint in one call. '
+                    'Larger directories are listed a page at a time'))
+@click.option('--exclude-dir', 'exclude_dirs', metavar='GLOB', multiple=True,
+              help=('Leave out directories with names matching the pattern, '
+                    'and do not traverse them in `--recursive` listings'))
+@click.option('--include', metavar='GLOB', multiple=True,
+              help=('Only show entries with names matching the pattern. '
+                    'All directories are still traversed in `--recursive` '
+                    'listings'))
+@click.option('--max-entries', type=click.IntRange(min=1), metavar='INTEGER',
+              help='Stop after showing this many entries')
 def ls_command(endpoint_plus_path, recursive_depth_limit,
-               recursive, long_output, show_hidden, filter_val):
+               recursive, long_output, show_hidden, filter_val, page_size,
+               exclude_dirs, include, max_entries):
     """
     Executor for `globus ls`
     """
     endpoint_id, path = endpoint_plus_path
 
-    # do autoactivation before the `ls` call so that recursive invocations
-    # won't do this repeatedly, and won't have to instantiate new clients
+    # start autoactivation in the background, concurrently with the first
+    # `ls` call, which is only retried if the endpoint turns out not to be
+    # activated. Recursive invocations don't autoactivate repeatedly, and don't
+    # have to instantiate new clients
     client = get_client()
-    autoactivate(client, endpoint_id, if_expires_in=60)
+    activation = BackgroundAutoactivation(
+        (endpoint_id,), if_expires_in=60)
 
     # create the query paramaters to send to operation_ls
     ls_params = {"show_hidden": int(show_hidden)}
@@ -71,6 +96,11 @@ def ls_command(endpoint_plus_path, recursive_depth_limit,
             raise click.UsageError('--filter cannot contain "/"')
         # format into a simple filter clause which operates on filenames
         ls_params['filter'] = 'name:{}'.format(filter_val)
+    # names never contain "/", so such patterns could never match
+    for opt, globs in (('--exclude-dir', exclude_dirs),
+                       ('--include', include)):
+        if any('/' in glob for glob in globs):
+            raise click.UsageError('{} cannot contain "/"'.format(opt))
 
     # get the `ls` result
     if recursive:
@@ -80,22 +110,31 @@ def ls_command(endpoint_plus_path, recursive_depth_limit,
         # if we're asked to change or "improve" the behavior in the future, we
         # could do so with "type:dir" or "type:file" filters added in, and
         # potentially work out some viable behavior based on what people want
-        res = client.recursive_operation_ls(
-            endpoint_id, depth=recursive_depth_limit, **ls_params)
+        res = call_with_background_autoactivation(
+            activation, client.recursive_operation_ls,
+            endpoint_id, depth=recursive_depth_limit, page_size=page_size,
+            exclude_dirs=exclude_dirs, include=include,
+            max_entries=max_entries, **ls_params)
     else:
-        res = client.operation_ls(endpoint_id, **ls_params)
+        res = call_with_background_autoactivation(
+            activation, client.paged_operation_ls, endpoint_id,
+            page_size=page_size, exclude_dirs=exclude_dirs, include=include,
+            max_entries=max_entries, **ls_params)
 
     def cleaned_item_name(item):
         return item['name'] + ('/' if item['type'] == 'dir' else '')
 
+    def print_names(res):
+        with OutputBuffer() as output:
+            for item in res:
+                output.echo(cleaned_item_name(item))
+
     # and then print it, per formatting rules
     formatted_print(
         res, fields=[('Permissions', 'permissions'), ('User', 'user'),
                      ('Group', 'group'), ('Size', 'size'),
                      ('Last Modified', 'last_modified'), ('File Type', 'type'),
                      ('Filename', cleaned_item_name)],
-        simple_text=(
-            None
-            if long_output or is_verbose() or not outformat_is_text() else
-            "\n".join(cleaned_item_name(x) for x in res)),
+        text_format=(FORMAT_TEXT_TABLE if long_output or is_verbose() else
+                     print_names),
         json_converter=iterable_response_to_dict)
@@ -11,6 +11,7 @@ from globus_cli.commands.whoami import whoami_command
 
 from globus_cli.commands.get_identities import get_identities_command
 from globus_cli.commands.ls import ls_command
+from globus_cli.commands.find import find_command
 from globus_cli.commands.delete import delete_command
 from globus_cli.commands.rm import rm_command
 from globus_cli.commands.transfer import transfer_command
@@ -38,6 +39,7 @@ main.add_command(whoami_command)
 
 main.add_command(get_identities_command)
 main.add_command(ls_command)
+main.add_command(find_command)
 main.add_command(mkdir_command)
 main.add_command(rename_command)
 main.add_command(delete_command)
@@ -3,7 +3,8 @@ import click
 from globus_cli.parsing import common_options, ENDPOINT_PLUS_REQPATH
 from globus_cli.safeio import formatted_print, FORMAT_TEXT_RAW
 
-from globus_cli.services.transfer import get_client, autoactivate
+from globus_cli.services.transfer import (
+    get_client, BackgroundAutoactivation, call_with_background_autoactivation)
 
 
 @click.command('mkdir', help='Make a directory on an endpoint')
@@ -16,8 +17,12 @@ def mkdir_command(endpoint_plus_path):
     """
     endpoint_id, path = endpoint_plus_path
 
+    # autoactivate concurrently with the mkdir, which is only retried if the
+    # endpoint turns out not to be activated
     client = get_client()
-    autoactivate(client, endpoint_id, if_expires_in=60)
+    activation = BackgroundAutoactivation(
+        (endpoint_id,), if_expires_in=60)
 
-    res = client.operation_mkdir(endpoint_id, path=path)
+    res = call_with_background_autoactivation(
+        activation, client.operation_mkdir, endpoint_id, path=path)
     formatted_print(res, text_format=FORMAT_TEXT_RAW, response_key='message')
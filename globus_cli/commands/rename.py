@@ -3,7 +3,8 @@ import click
 from globus_cli.parsing import common_options, ENDPOINT_PLUS_REQPATH
 from globus_cli.safeio import formatted_print, FORMAT_TEXT_RAW
 
-from globus_cli.services.transfer import get_client, autoactivate
+from globus_cli.services.transfer import (
+    get_client, BackgroundAutoactivation, call_with_background_autoactivation)
 
 
 @click.command('rename', help='Rename a file or directory on an endpoint')
@@ -25,9 +26,13 @@ def rename_command(source, destination):
                                .format(source_ep, dest_ep))
     endpoint_id = source_ep
 
+    # autoactivate concurrently with the rename, which is only retried if the
+    # endpoint turns out not to be activated
     client = get_client()
-    autoactivate(client, endpoint_id, if_expires_in=60)
+    activation = BackgroundAutoactivation(
+        (endpoint_id,), if_expires_in=60)
 
-    res = client.operation_rename(endpoint_id, oldpath=source_path,
-                                  newpath=dest_path)
+    res = call_with_background_autoactivation(
+        activation, client.operation_rename, endpoint_id,
+        oldpath=source_path, newpath=dest_path)
     formatted_print(res, text_format=FORMAT_TEXT_RAW, response_key='message')
@@ -11,7 +11,8 @@ from globus_cli.safeio import (
     err_is_terminal, term_is_interactive)
 
 from globus_cli.services.transfer import (
-    get_client, autoactivate, task_wait_with_io)
+    get_client, BackgroundAutoactivation, call_with_background_autoactivation,
+    task_wait_with_io)
 
 
 @click.command(
@@ -37,8 +38,11 @@ def rm_command(ignore_missing, star_silent, recursive, enable_globs,
     client = get_client()
 
     # attempt to activate unless --skip-activation-check is given
+    # this runs in the background, and is waited on before submission
+    activation = None
     if not skip_activation_check:
-        autoactivate(client, endpoint_id, if_expires_in=60)
+        activation = BackgroundAutoactivation(
+            (endpoint_id,), if_expires_in=60)
 
     delete_data = DeleteData(client, endpoint_id,
                              label=label,
@@ -63,6 +67,9 @@ def rm_command(ignore_missing, star_silent, recursive, enable_globs,
             click.get_current_context().exit(1)
     delete_data.add_item(path)
 
+    if activation is not None:
+        activation.wait()
+
     if dry_run:
         formatted_print(delete_data, response_key='DATA',
                         fields=[('Path', 'path')])
@@ -71,7 +78,8 @@ def rm_command(ignore_missing, star_silent, recursive, enable_globs,
 
     # Print task submission to stderr so that `-Fjson` is still correctly
     # respected, as it will be by `task wait`
-    res = client.submit_delete(delete_data)
+    res = call_with_background_autoactivation(
+        activation, client.submit_delete, delete_data)
     task_id = res['task_id']
     safeprint('Delete task submitted under ID "{}"'.format(task_id),
               write_to_stderr=True)
@@ -1,18 +1,92 @@
 import click
+import time
 
-from globus_cli.safeio import formatted_print, safeprint, FORMAT_TEXT_RAW
-from globus_cli.parsing import common_options, task_id_arg
+from globus_cli.safeio import (
+    formatted_print, safeprint, OutputBuffer, FORMAT_TEXT_RAW)
+from globus_cli.safeio.json_backend import (
+    json_text, json_list_item, json_list_end)
+from globus_cli.parsing import common_options, task_id_arg, DurationType
+from globus_cli.helpers import (
+    outformat_is_json, outformat_is_text, get_jmespath_expression,
+    is_json_compact)
 
 from globus_cli.services.transfer import get_client
+from globus_cli.services.bulk_cancel import cancel_tasks
+
+
+def _list_cancellable_tasks(client, label, endpoint, older_than):
+    """
+    Get the IDs of all in-progress tasks matching the filters given.
+    Label and age are filtered by the service, endpoint here.
+    """
+    filter_string = 'type:TRANSFER,DELETE/status:ACTIVE,INACTIVE'
+    if label is not None:
+        filter_string += '/label:~' + label
+    if older_than is not None:
+        cutoff = time.strftime('%Y-%m-%d %H:%M:%S',
+                               time.gmtime(time.time() - older_than))
+        filter_string += '/request_time:,' + cutoff
+
+    fields = 'task_id'
+    if endpoint is not None:
+        fields += ',source_endpoint_id,destination_endpoint_id'
+
+    return [
+        task_row['task_id']
+        for task_row in client.task_list(
+            filter=filter_string, fields=fields, num_results=None)
+        if endpoint is None or endpoint in (
+            task_row.get('source_endpoint_id'),
+            task_row.get('destination_endpoint_id'))
+    ]
+
+
+def _stream_json(task_ids, results):
+    """
+    Print the document of all cancellations, with a result for each task, in
+    order
+    """
+    compact = is_json_compact()
+    with OutputBuffer() as output:
+        if compact:
+            output.write(u'{"task_ids":' + json_text(task_ids, compact=True) +
+                         u',"results":[')
+        else:
+            output.write(u'{\n  "task_ids": ' +
+                         json_text(task_ids).replace(u'\n', u'\n  ') +
+                         u',\n  "results": [')
+        count = 0
+        for result in results:
+            output.write(json_list_item(result, count, depth=1,
+                                        compact=compact))
+            count += 1
+        output.write(json_list_end(count, depth=1, compact=compact) +
+                     (u'}\n' if compact else u'\n}\n'))
 
 
 @click.command('cancel', short_help='Cancel a task',
-               help='Cancel a task owned by the current user')
+               help=("""\
+    Cancel a task owned by the current user.
+
+    With `--all`, every in-progress task is cancelled, or only those matching
+    `--label`, `--endpoint`, and `--older-than`. The tasks are cancelled
+    concurrently, and results are printed once all of them are done, in the
+    order of the tasks.
+    """))
 @common_options
 @task_id_arg(required=False)
 @click.option('--all', '-a', is_flag=True,
               help='Cancel all in-progress tasks that you own')
-def cancel_task(all, task_id):
+@click.option('--label', metavar='PATTERN',
+              help=('With --all, only cancel tasks whose label matches '
+                    'PATTERN, ignoring case, with "*" as a wildcard'))
+@click.option('--endpoint', metavar='ENDPOINT_ID', type=click.UUID,
+              help=('With --all, only cancel tasks with ENDPOINT_ID as their '
+                    'source or destination'))
+@click.option('--older-than', type=DurationType(),
+              help=('With --all, only cancel tasks submitted longer ago than '
+                    'DURATION, e.g. "30m", "12h", or "7d"'))
+def cancel_task(all, task_id, label, endpoint, older_than):
     """
     Executor for `globus task cancel`
     """
@@ -21,47 +95,53 @@ def cancel_task(all, task_id):
         raise click.UsageError('You must pass EITHER the special --all flag '
                                'to cancel all in-progress tasks OR a single '
                                'task ID to cancel.')
+    filtered = (label is not None or endpoint is not None or
+                older_than is not None)
+    if filtered and not all:
+        raise click.UsageError('--label, --endpoint, and --older-than can '
+                               'only be used with --all')
 
     client = get_client()
 
     if all:
-        from sys import maxsize
-        task_ids = [
-            task_row['task_id']
-            for task_row in client.task_list(
-                filter='type:TRANSFER,DELETE/status:ACTIVE,INACTIVE',
-                fields='task_id',
-                num_results=maxsize,  # FIXME want to ask for "unlimited" set
-            )
-        ]
-
+        task_ids = _list_cancellable_tasks(
+            client, label, None if endpoint is None else str(endpoint),
+            older_than)
         task_count = len(task_ids)
 
         if not task_ids:
-            raise click.ClickException('You have no in-progress tasks.')
+            raise click.ClickException(
+                'You have no in-progress tasks matching those filters.'
+                if filtered else 'You have no in-progress tasks.')
+
+        failures = []
 
         def cancellation_iterator():
-            for i in task_ids:
-                yield (i, client.cancel_task(i).data)
-
-        def json_converter(res):
-            return {
-                'results': [x for i, x in cancellation_iterator()],
-                'task_ids': task_ids
-            }
-
-        def _custom_text(res):
-            for (i, (task_id, data)) in enumerate(cancellation_iterator(),
-                                                  start=1):
-                safeprint(u'{} ({} of {}): {}'
-                          .format(task_id, i, task_count, data['message']))
-
-        # FIXME: this is kind of an abuse of formatted_print because the
-        # text format and json converter are doing their own thing, not really
-        # interacting with the "response data" (None). Is there a better way of
-        # handling this?
-        formatted_print(None, text_format=_custom_text,
-                        json_converter=json_converter)
+            for result in cancel_tasks(task_ids, client_factory=get_client):
+                if result['error']:
+                    failures.append(result['task_id'])
+                yield result
+
+        if outformat_is_text():
+            with OutputBuffer() as output:
+                for (i, result) in enumerate(cancellation_iterator(),
+                                             start=1):
+                    output.echo(u'{} ({} of {}): {}{}'.format(
+                        result['task_id'], i, task_count,
+                        'Error: ' if result['error'] else '',
+                        result['message']))
+        elif outformat_is_json() and get_jmespath_expression() is None:
+            _stream_json(task_ids, cancellation_iterator())
+        else:
+            # JMESPath expressions and UNIX output need the whole document
+            formatted_print(None, json_converter=lambda res: {
+                'results': list(cancellation_iterator()),
+                'task_ids': task_ids})
+
+        if failures:
+            safeprint(u'{} of {} cancellations failed'.format(
+                len(failures), task_count), write_to_stderr=True)
+            click.get_current_context().exit(1)
 
     else:
         res = client.cancel_task(task_id)
@@ -1,22 +1,193 @@
 import click
-import json
+import six
+import time
 
-from globus_cli.parsing import common_options, task_id_arg
-from globus_cli.safeio import formatted_print
+from globus_cli.parsing import (
+    common_options, task_id_arg, ResultLimitType, num_results)
+from globus_cli.safeio import (
+    formatted_print, iterable_response_to_dict, OutputBuffer)
+from globus_cli.safeio.json_backend import (
+    dumps, loads, json_list_item, json_list_end)
+from globus_cli.helpers import (
+    outformat_is_json, outformat_is_text, get_jmespath_expression,
+    is_json_compact)
 
-from globus_cli.services.transfer import iterable_response_to_dict, get_client
+from globus_cli.services.transfer import get_client, TaskPollingSchedule
+from globus_cli.services.paging import prefetching
 
 
-@click.command('event-list', help='List Events for a given task')
+EVENT_FIELDS = (('Time', 'time'), ('Code', 'code'), ('Is Error', 'is_error'))
+# widths of the first columns of streamed text output, which can't be sized to
+# fit their contents -- enough for a timestamp, a typical code, and a bool
+STREAMED_COLUMN_WIDTHS = (25, 20, 8)
+
+# the number of events fetched by the first poll for new ones in follow mode,
+# doubled for as long as a poll finds nothing but new events
+FOLLOW_PAGE_SIZE = 25
+
+
+def squashed_json_details(x):
+    is_json = False
+    try:
+        loaded = loads(x['details'])
+        is_json = True
+    except ValueError:
+        loaded = x['details']
+
+    if is_json:
+        return dumps(loaded, indent=None, sort_keys=True)
+    else:
+        return loaded.replace('\n', '\\n')
+
+
+def _event_identity(event):
+    # events have no IDs of their own
+    return (event['time'], event['code'], event['is_error'], event['details'])
+
+
+class _EventStreamPrinter(object):
+    """
+    Prints events one at a time, as they arrive, without holding them all in
+    memory.
+
+    Text output is a table with fixed-width columns. JSON output is either
+    a single document (for a complete listing) or, when following, one JSON
+    object per line. Other output formats also get one JSON object per line.
+
+    Output is written through an `OutputBuffer`, and written out when it
+    fills, or is flushed.
+    """
+    def __init__(self, json_lines=False):
+        self.json_lines = json_lines
+        self.jmespath_expr = get_jmespath_expression()
+        self.compact = is_json_compact()
+        self.count = 0
+        self.output = OutputBuffer()
+        self.format_str = u' | '.join(
+            [u'{:' + str(w) + u'}' for w in STREAMED_COLUMN_WIDTHS] + [u'{}'])
+
+    def start(self):
+        if outformat_is_text():
+            headers = [name for name, _ in EVENT_FIELDS] + ['Details']
+            self.output.echo(self.format_str.format(*headers))
+            self.output.echo(self.format_str.format(
+                *['-' * w for w in STREAMED_COLUMN_WIDTHS + (7,)]))
+        elif outformat_is_json() and not self.json_lines:
+            self.output.echo(
+                u'{"DATA":[' if self.compact else u'{\n  "DATA": [',
+                newline=False)
+
+    def print_event(self, event):
+        data = getattr(event, 'data', event)
+        if outformat_is_text():
+            self.output.echo(self.format_str.format(
+                *[six.text_type(data[key]) for _, key in EVENT_FIELDS] +
+                [squashed_json_details(data)]))
+        elif outformat_is_json() and not self.json_lines:
+            self.output.echo(json_list_item(data, self.count, depth=1,
+                                            compact=self.compact),
+                             newline=False)
+        else:
+            if self.jmespath_expr is not None:
+                data = self.jmespath_expr.search(data)
+            self.output.echo(dumps(data, indent=None))
+        self.count += 1
+
+    def finish(self):
+        if outformat_is_json() and not self.json_lines:
+            self.output.echo(json_list_end(self.count, depth=1,
+                                           compact=self.compact) +
+                             (u'}' if self.compact else u'\n}'))
+
+    def flush(self):
+        self.output.flush()
+
+
+def _follow_events(client, task_id, filter_string, limit):
+    """
+    Print the last `limit` events, and then new events as they occur, oldest
+    first, until interrupted.
+    """
+    printer = _EventStreamPrinter(json_lines=True)
+    schedule = TaskPollingSchedule()
+
+    # the newest event seen so far, and every event seen with that timestamp
+    # (there may be several)
+    last_time = None
+    seen_at_last_time = set()
+
+    def new_events(num_results):
+        """
+        Get the events newer than those seen, newest first, or None if there
+        may be more than `num_results` of them.
+        """
+        events = []
+        for event in client.task_event_list(
+                task_id, num_results=num_results, filter=filter_string):
+            if last_time is not None and (
+                    event['time'] < last_time or
+                    (event['time'] == last_time and
+                     _event_identity(event) in seen_at_last_time)):
+                return events
+            events.append(event)
+        if len(events) < num_results:
+            return events
+        return None
+
+    printer.start()
+    try:
+        # the first page is all that is shown of the history
+        events = list(client.task_event_list(
+            task_id, num_results=limit, filter=filter_string))
+        while True:
+            if events:
+                for event in reversed(events):
+                    printer.print_event(event)
+                newest = events[0]['time']
+                if newest != last_time:
+                    last_time = newest
+                    seen_at_last_time = set()
+                seen_at_last_time.update(_event_identity(event)
+                                         for event in events
+                                         if event['time'] == last_time)
+                schedule.reset()
+
+            # write out each batch of events before waiting for more
+            printer.flush()
+            time.sleep(schedule.next_interval())
+
+            page_size = FOLLOW_PAGE_SIZE
+            events = new_events(page_size)
+            while events is None:
+                page_size *= 2
+                events = new_events(page_size)
+    except KeyboardInterrupt:
+        return
+    finally:
+        printer.flush()
+
+
+@click.command('event-list', help=("""\
+    List Events for a given task, most recent first.
+
+    With `--follow`, the most recent events are shown oldest first, followed
+    by new events as they occur, until interrupted. Polling for new events
+    starts out frequent, and backs off while there are none. When following,
+    JSON output has one event per line.
+    """))
 @common_options
 @task_id_arg
 @click.option(
-    "--limit", default=10, show_default=True, help="Limit number of results.")
+    "--limit", default=10, show_default=True, type=ResultLimitType(),
+    help="Limit number of results, or 'unlimited' to list every event.")
 @click.option(
     "--filter-errors", is_flag=True, help="Filter results to errors")
 @click.option(
     "--filter-non-errors", is_flag=True, help="Filter results to non errors")
-def task_event_list(task_id, limit, filter_errors, filter_non_errors):
+@click.option(
+    "--follow", "-f", is_flag=True,
+    help="After listing events, keep printing new events as they occur")
+def task_event_list(task_id, limit, filter_errors, filter_non_errors, follow):
     """
     Executor for `globus task-event-list`
     """
@@ -35,24 +206,33 @@ def task_event_list(task_id, limit, filter_errors, filter_non_errors):
     else:
         filter_string = ""
 
-    event_iterator = client.task_event_list(
-        task_id, num_results=limit, filter=filter_string)
+    limit = num_results(limit)
+    if follow:
+        if limit is None:
+            raise click.UsageError(
+                "--follow cannot be used with --limit unlimited")
+        _follow_events(client, task_id, filter_string, limit)
+        return
 
-    def squashed_json_details(x):
-        is_json = False
-        try:
-            loaded = json.loads(x['details'])
-            is_json = True
-        except ValueError:
-            loaded = x['details']
+    event_iterator = prefetching(client.task_event_list(
+        task_id, num_results=limit, filter=filter_string),
+        client_factory=get_client)
 
-        if is_json:
-            return json.dumps(loaded, separators=(',', ':'), sort_keys=True)
-        else:
-            return loaded.replace('\n', '\\n')
+    # stream unlimited listings -- formatted_print streams those processed
+    # with a JMESPath expression, if it can
+    if limit is None and (outformat_is_text() or (
+            outformat_is_json() and get_jmespath_expression() is None)):
+        printer = _EventStreamPrinter()
+        printer.start()
+        try:
+            for event in event_iterator:
+                printer.print_event(event)
+            printer.finish()
+        finally:
+            printer.flush()
+        return
 
     formatted_print(event_iterator,
-                    fields=(('Time', 'time'), ('Code', 'code'),
-                            ('Is Error', 'is_error'),
-                            ('Details', squashed_json_details)),
+                    fields=(EVENT_FIELDS +
+                            (('Details', squashed_json_details),)),
                     json_converter=iterable_response_to_dict)
@@ -1,16 +1,30 @@
 import click
 import six
 
-from globus_cli.parsing import common_options, ISOTimeType
-from globus_cli.safeio import formatted_print
+from globus_cli.parsing import (
+    common_options, ISOTimeType, ResultLimitType, num_results,
+    all_fields_option)
+from globus_cli.safeio import formatted_print, iterable_response_to_dict
+from globus_cli.helpers import projected_fields
 
-from globus_cli.services.transfer import iterable_response_to_dict, get_client
+from globus_cli.services.transfer import get_client
+from globus_cli.services.task_history import open_task_history
+from globus_cli.services.paging import prefetching
 
 
-@click.command('list', help='List tasks for the current user')
+@click.command('list', help=("""\
+    List tasks for the current user.
+
+    With `--local`, tasks are listed from the local task history, which is
+    kept up to date by `globus task sync`, with no calls to the service.
+    """))
 @common_options
 @click.option(
-    "--limit", default=10, show_default=True, help="Limit number of results.")
+    "--limit", default=10, show_default=True, type=ResultLimitType(),
+    help="Limit number of results, or 'unlimited' to list every task.")
+@click.option(
+    "--local", is_flag=True,
+    help="List tasks from the local task history instead of the service.")
 @click.option(
     "--filter-task-id", multiple=True, type=click.UUID,
     help="task UUID to filter by. This option can be used multiple times.")
@@ -46,13 +60,45 @@ from globus_cli.services.transfer import iterable_response_to_dict, get_client
 @click.option(
     "--filter-completed-before", type=ISOTimeType(),
     help="Filter results to tasks that were completed before given time.")
-def task_list(limit, filter_task_id, filter_status, filter_type,
+@click.option(
+    "--filter-endpoint", multiple=True, type=click.UUID,
+    help=("With --local, filter results to tasks with this endpoint as their "
+          "source or destination. This option can be used multiple times."))
+@all_fields_option
+def task_list(limit, local, filter_task_id, filter_status, filter_type,
               filter_label, filter_not_label, inexact,
               filter_requested_after, filter_requested_before,
-              filter_completed_after, filter_completed_before):
+              filter_completed_after, filter_completed_before,
+              filter_endpoint, all_fields):
     """
     Executor for `globus task-list`
     """
+    fields = [('Task ID', 'task_id'), ('Status', 'status'), ('Type', 'type'),
+              ('Source Display Name', 'source_endpoint_display_name'),
+              ('Dest Display Name', 'destination_endpoint_display_name'),
+              ('Label', 'label')]
+
+    if local:
+        history = open_task_history()
+        try:
+            tasks = history.query(
+                task_ids=filter_task_id, statuses=filter_status,
+                task_type=filter_type, labels=filter_label,
+                not_labels=filter_not_label, exact=not inexact,
+                endpoint_ids=filter_endpoint,
+                requested_after=filter_requested_after,
+                requested_before=filter_requested_before,
+                completed_after=filter_completed_after,
+                completed_before=filter_completed_before,
+                limit=num_results(limit))
+        finally:
+            history.close()
+        formatted_print({'DATA': tasks}, fields=fields, response_key='DATA')
+        return
+
+    if filter_endpoint:
+        raise click.UsageError('--filter-endpoint can only be used with '
+                               '--local')
 
     def _process_filterval(prefix, value, default=None):
         if value:
@@ -85,14 +131,17 @@ def task_list(limit, filter_task_id, filter_status, filter_type,
         "completion_time", [(filter_completed_after or ""),
                             (filter_completed_before or "")])
 
+    # only ask for the fields which will be output
+    params = {}
+    projection = None if all_fields else projected_fields(fields)
+    if projection is not None:
+        params['fields'] = projection
+
     client = get_client()
-    task_iterator = client.task_list(
-        num_results=limit,
-        filter=filter_string[:-1])  # ignore trailing /
+    task_iterator = prefetching(client.task_list(
+        num_results=num_results(limit),
+        filter=filter_string[:-1],  # ignore trailing /
+        **params), client_factory=get_client)
 
-    fields = [('Task ID', 'task_id'), ('Status', 'status'), ('Type', 'type'),
-              ('Source Display Name', 'source_endpoint_display_name'),
-              ('Dest Display Name', 'destination_endpoint_display_name'),
-              ('Label', 'label')]
     formatted_print(task_iterator, fields=fields,
                     json_converter=iterable_response_to_dict)
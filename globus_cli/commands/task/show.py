@@ -1,9 +1,14 @@
 import click
 
-from globus_cli.parsing import common_options, task_id_arg
-from globus_cli.safeio import formatted_print, FORMAT_TEXT_RECORD
+from globus_cli.parsing import (
+    common_options, task_id_arg, CaseInsensitiveChoice)
+from globus_cli.safeio import (
+    formatted_print, iterable_response_to_dict, FORMAT_TEXT_RECORD)
 
-from globus_cli.services.transfer import get_client, iterable_response_to_dict
+from globus_cli.services.transfer import get_client
+from globus_cli.services.task_history import open_task_history
+from globus_cli.services.successful_transfers import (
+    export_successful_transfers)
 
 
 COMMON_FIELDS = [
@@ -60,26 +65,69 @@ def print_successful_transfers(client, task_id):
                     json_converter=iterable_response_to_dict)
 
 
-def print_task_detail(client, task_id):
-    res = client.get_task(task_id)
+def get_task_document(task_id):
+    """
+    Get a task from the local task history if it has finished, since it can't
+    have changed since, and otherwise from the service. The history is only
+    read, if it exists: it is filled by `task sync`.
+    """
+    history = open_task_history(required=False, read_only=True)
+    res = None
+    if history is not None:
+        try:
+            res = history.get_finished_task(task_id)
+        finally:
+            history.close()
+    return res if res is not None else get_client().get_task(task_id)
+
+
+def print_task_detail(task_id):
+    res = get_task_document(task_id)
     formatted_print(res, text_format=FORMAT_TEXT_RECORD, fields=(
         COMMON_FIELDS +
         (COMPLETED_FIELDS if res['completion_time'] else ACTIVE_FIELDS) +
         (DELETE_FIELDS if res['type'] == 'DELETE' else TRANSFER_FIELDS)))
 
 
-@click.command('show', help='Show detailed information about a specific task')
+@click.command('show', help=("""\
+    Show detailed information about a specific task.
+
+    With `--successful-transfers` and `--export-format`, the files transferred
+    are streamed out a page at a time, as NDJSON or TSV, which keeps memory use
+    low however many there are. If such an export is interrupted, the marker
+    to resume it from with `--resume-from-marker` is printed.
+    """))
 @common_options
 @task_id_arg
 @click.option('--successful-transfers', '-t', is_flag=True, default=False,
               help='Show files that were transferred as result of this task.')
-def show_task(successful_transfers, task_id):
+@click.option('--export-format', type=CaseInsensitiveChoice(('ndjson', 'tsv')),
+              help=('With --successful-transfers, stream the files as NDJSON '
+                    'or TSV'))
+@click.option('--output-file', type=click.Path(dir_okay=False),
+              help=('With --export-format, write to this file instead of '
+                    'stdout'))
+@click.option('--resume-from-marker', metavar='MARKER',
+              help=('With --export-format, resume an interrupted export, '
+                    'appending to its --output-file'))
+def show_task(successful_transfers, task_id, export_format, output_file,
+              resume_from_marker):
     """
     Executor for `globus task show`
     """
-    client = get_client()
-
-    if successful_transfers:
-        print_successful_transfers(client, task_id)
+    if export_format is None and (output_file is not None or
+                                  resume_from_marker is not None):
+        raise click.UsageError('--output-file and --resume-from-marker can '
+                               'only be used with --export-format')
+    if export_format is not None and not successful_transfers:
+        raise click.UsageError('--export-format can only be used with '
+                               '--successful-transfers')
+
+    if export_format is not None:
+        export_successful_transfers(
+            get_client(), task_id, export_format,
+            output_file=output_file, marker=resume_from_marker)
+    elif successful_transfers:
+        print_successful_transfers(get_client(), task_id)
     else:
-        print_task_detail(client, task_id)
+        print_task_detail(task_id)
@@ -0,0 +1,38 @@
+import click
+
+from globus_cli.parsing import common_options
+from globus_cli.safeio import formatted_print, FORMAT_TEXT_RECORD
+
+from globus_cli.services.transfer import get_client
+from globus_cli.services.task_history import open_task_history
+
+
+@click.command('sync', short_help='Update the local task history',
+               help=("""\
+    Update the local history of your tasks, which is used by
+    `globus task list --local` and `globus task show`.
+
+    The first sync fetches every task. Later syncs only fetch tasks requested
+    since the last one, and refresh tasks which were still in progress.
+    """))
+@common_options
+@click.option('--full', is_flag=True,
+              help='Discard the local history and fetch every task again')
+def task_sync(full):
+    """
+    Executor for `globus task sync`
+    """
+    client = get_client()
+    history = open_task_history()
+    try:
+        if full:
+            history.clear()
+        fetched = history.sync(client)
+        total = history.count()
+    finally:
+        history.close()
+
+    formatted_print({'fetched': fetched, 'total': total},
+                    text_format=FORMAT_TEXT_RECORD,
+                    fields=(('Tasks Fetched', 'fetched'),
+                            ('Tasks In History', 'total')))
@@ -1,17 +1,59 @@
+import sys
+
 import click
 
-from globus_cli.parsing import (
-    common_options, task_id_arg, synchronous_task_wait_options)
+from globus_cli.parsing import common_options, synchronous_task_wait_options
+from globus_cli.safeio import safeprint
+
+from globus_cli.services.transfer import (
+    task_wait_with_io, task_wait_multiple_with_io)
 
-from globus_cli.services.transfer import task_wait_with_io
 
+@click.command('wait', help=("""\
+    Wait for a task to complete.
 
-@click.command('wait', help='Wait for a task to complete')
+    Several tasks can be waited on at once, by giving several TASK_IDs or with
+    `--stdin`. All of them are polled together. With `--all` (the default),
+    the command waits for every task to complete, and exits with status 0 only
+    if they all succeeded. With `--any`, it waits for the first to complete,
+    and exits with status 0 if one succeeded. The status of every task is
+    printed at the end.
+    """))
 @common_options
-@task_id_arg
+@click.argument('task_ids', metavar='TASK_ID...', nargs=-1, type=click.UUID)
+@click.option('--stdin', 'read_stdin', is_flag=True,
+              help=('Read whitespace-separated task IDs from stdin, in '
+                    'addition to any given on the commandline'))
+@click.option('--all', 'wait_for', flag_value='all', default=True,
+              help='Wait for all of the tasks to complete (the default)')
+@click.option('--any', 'wait_for', flag_value='any',
+              help='Wait for any one of the tasks to complete')
 @synchronous_task_wait_options
-def task_wait(meow, heartbeat, polling_interval, timeout, task_id):
+def task_wait(meow, heartbeat, polling_interval, timeout, task_ids,
+              read_stdin, wait_for):
     """
     Executor for `globus task wait`
     """
-    task_wait_with_io(meow, heartbeat, polling_interval, timeout, task_id)
+    task_ids = [str(task_id) for task_id in task_ids]
+    if read_stdin:
+        # if input is interactive, print help to stderr
+        if sys.stdin.isatty():
+            safeprint('Enter task IDs, separated by whitespace.\n'
+                      'Terminate input with Ctrl+D or <EOF>',
+                      write_to_stderr=True)
+        for task_id in sys.stdin.read().split():
+            try:
+                task_ids.append(str(click.UUID.convert(task_id, None, None)))
+            except click.BadParameter:
+                raise click.UsageError(
+                    '{} from stdin is not a valid task ID'.format(task_id))
+
+    if not task_ids:
+        raise click.UsageError('task wait requires a TASK_ID or --stdin')
+
+    if len(task_ids) == 1:
+        task_wait_with_io(meow, heartbeat, polling_interval, timeout,
+                          task_ids[0])
+    else:
+        task_wait_multiple_with_io(meow, heartbeat, polling_interval, timeout,
+                                   task_ids, wait_for_all=(wait_for == 'all'))
@@ -0,0 +1,119 @@
+import sys
+import time
+from collections import OrderedDict
+
+import click
+
+from globus_cli.parsing import common_options
+from globus_cli.safeio import safeprint, out_is_terminal
+from globus_cli.safeio.json_backend import dumps
+from globus_cli.helpers import outformat_is_text
+
+from globus_cli.services.transfer import (
+    get_client, get_tasks_by_id, task_is_done)
+from globus_cli.services.task_watch import (
+    TaskThroughputTracker, format_bytes, format_duration)
+
+
+WATCH_COLUMNS = (('Task ID', 36), ('Status', 9), ('Transferred', 12),
+                 ('Rate', 12), ('Avg Rate', 12), ('Progress', 13),
+                 ('ETA', 9))
+
+
+def _progress(sample):
+    if sample['files'] and sample['files_transferred'] is not None:
+        return '{}/{} files'.format(sample['files_transferred'],
+                                    sample['files'])
+    if sample['subtasks_total']:
+        return '{}/{} subtasks'.format(
+            sample['subtasks_total'] - (sample['subtasks_pending'] or 0),
+            sample['subtasks_total'])
+    return '-'
+
+
+def _format_row(values):
+    return ' | '.join(str(value).ljust(width)
+                      for value, (_, width) in zip(values, WATCH_COLUMNS))
+
+
+def _render(samples):
+    lines = [_format_row([name for name, _ in WATCH_COLUMNS]),
+             '-+-'.join('-' * width for _, width in WATCH_COLUMNS)]
+    for sample in samples:
+        lines.append(_format_row([
+            sample['task_id'], sample['status'],
+            format_bytes(sample['bytes_transferred']),
+            format_bytes(sample['instant_bytes_per_second']) + '/s',
+            format_bytes(sample['ewma_bytes_per_second']) + '/s',
+            _progress(sample), format_duration(sample['eta_seconds'])]))
+    return lines
+
+
+@click.command('watch', short_help='Monitor the throughput of tasks',
+               help=("""\
+    Show a live view of the progress and throughput of one or more tasks,
+    refreshed every `--interval` seconds until they all complete.
+
+    All of the tasks are fetched together on each refresh. Throughput is
+    computed from the change in bytes transferred since the previous refresh,
+    and smoothed with an exponentially weighted moving average, from which the
+    ETA is estimated.
+
+    If stdout is not a terminal, or output is not text, samples are written as
+    a stream of JSON objects, one per line, for each unfinished task on each
+    refresh.
+    """))
+@common_options
+@click.argument('task_ids', metavar='TASK_ID...', nargs=-1, required=True,
+                type=click.UUID)
+@click.option('--interval', default=5, show_default=True, metavar='N',
+              type=click.IntRange(min=1),
+              help='Number of seconds between refreshes')
+@click.option('--count', metavar='N', type=click.IntRange(min=1),
+              help='Stop after N refreshes')
+def task_watch(task_ids, interval, count):
+    """
+    Executor for `globus task watch`
+    """
+    client = get_client()
+    tracker = TaskThroughputTracker()
+
+    # drop duplicates, but keep the order given
+    task_ids = list(OrderedDict((str(task_id), None) for task_id in task_ids))
+    live = out_is_terminal() and outformat_is_text()
+
+    samples = {}
+    pending = task_ids
+    frame_lines = 0
+    refreshes = 0
+    try:
+        while True:
+            # finished tasks are no longer fetched, but stay in the view with
+            # their last sample
+            tasks = get_tasks_by_id(client, pending)
+            now = time.time()
+            for task_id in pending:
+                samples[task_id] = tracker.update(tasks[task_id], now)
+
+            if live:
+                # move back up over the last frame, and clear it
+                if frame_lines:
+                    safeprint('\x1b[{}A\x1b[J'.format(frame_lines),
+                              newline=False)
+                lines = _render([samples[task_id] for task_id in task_ids])
+                safeprint('\n'.join(lines))
+                frame_lines = len(lines)
+            else:
+                for task_id in pending:
+                    safeprint(dumps(samples[task_id], indent=None))
+                sys.stdout.flush()
+
+            pending = [task_id for task_id in pending
+                       if not task_is_done(tasks[task_id])]
+
+            refreshes += 1
+            if not pending or (count is not None and refreshes >= count):
+                return
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        return
@@ -3,11 +3,22 @@ import click
 from globus_sdk import TransferData
 from globus_cli.parsing import (
     CaseInsensitiveChoice, common_options, task_submission_options,
-    TaskPath, ENDPOINT_PLUS_OPTPATH, shlex_process_stdin,
-    HiddenOption)
-from globus_cli.safeio import formatted_print, FORMAT_TEXT_RECORD
+    TaskPath, ENDPOINT_PLUS_OPTPATH, process_batch_input,
+    batch_input_options, task_chunking_options, HiddenOption,
+    BATCH_FORMAT_SHLEX)
+from globus_cli.safeio import formatted_print, safeprint, FORMAT_TEXT_RECORD
 
-from globus_cli.services.transfer import get_client, autoactivate
+from globus_cli.services.transfer import (
+    get_client, BackgroundAutoactivation, call_with_background_autoactivation)
+from globus_cli.services.chunked_submission import (
+    ChunkedTaskSubmitter, finish_chunked_submission,
+    abort_chunked_submission, read_submission_ids)
+from globus_cli.services.batch_coalesce import coalesce_transfer_items
+
+
+TRANSFER_ITEM_FIELDS = (('Source Path', 'source_path'),
+                        ('Dest Path', 'destination_path'),
+                        ('Recursive', 'recursive'))
 
 
 @click.command('transfer', short_help='Submit a transfer task (asynchronous)',
@@ -34,6 +45,19 @@ from globus_cli.services.transfer import get_client, autoactivate
 
     Skips empty lines and allows comments beginning with "#".
 
+    \b
+    Other formats may be used with `--batch-format`:
+    null: NUL-delimited records, SOURCE_PATH then DEST_PATH for each item
+    ndjson: objects with "source_path", "dest_path", and "recursive" keys
+    csv: rows of SOURCE_PATH,DEST_PATH[,RECURSIVE], or with a header row of
+    source_path, dest_path, and recursive
+
+    Use `--batch-file` to read batch input from a file instead of stdin.
+
+    With `--coalesce`, duplicate lines of batch input are dropped, and any
+    source directory whose entries are all listed individually, into the same
+    destination directory, is replaced with one recursive item.
+
     \b
     If you use `--batch` and a commandline SOURCE_PATH and/or DEST_PATH, these
     paths will be used as dir prefixes to any paths on stdin.
@@ -88,6 +112,12 @@ from globus_cli.services.transfer import get_client, autoactivate
                     'Uses SOURCE_ENDPOINT_ID and DEST_ENDPOINT_ID as passed '
                     'on the commandline. Commandline paths are still allowed '
                     'and are used as prefixes to the batchmode inputs.'))
+@batch_input_options
+@click.option('--coalesce', is_flag=True, default=False,
+              help=('Remove duplicate batch items, and replace source '
+                    'directories which are transferred in full, one item per '
+                    'entry, with recursive items. Lists the source endpoint.'))
+@task_chunking_options
 @click.argument('source', metavar='SOURCE_ENDPOINT_ID[:SOURCE_PATH]',
                 type=ENDPOINT_PLUS_OPTPATH)
 @click.argument('destination', metavar='DEST_ENDPOINT_ID[:DEST_PATH]',
@@ -96,16 +126,26 @@ from globus_cli.services.transfer import get_client, autoactivate
 @click.option('--perf-p', type=int, cls=HiddenOption)
 @click.option('--perf-pp', type=int, cls=HiddenOption)
 @click.option('--perf-udt', is_flag=True, default=None, cls=HiddenOption)
-def transfer_command(batch, sync_level, recursive, destination, source, label,
-                     preserve_mtime, verify_checksum, encrypt, submission_id,
-                     dry_run, delete, deadline, skip_activation_check, notify,
-                     perf_cc, perf_p, perf_pp, perf_udt):
+def transfer_command(batch, batch_format, batch_file, coalesce, sync_level,
+                     recursive, destination, source, label, preserve_mtime,
+                     verify_checksum, encrypt, submission_id, dry_run, delete,
+                     deadline, skip_activation_check, notify,
+                     max_items_per_task, max_payload_bytes,
+                     submission_ids_file, perf_cc, perf_p, perf_pp, perf_udt):
     """
     Executor for `globus transfer`
     """
     source_endpoint, cmd_source_path = source
     dest_endpoint, cmd_dest_path = destination
 
+    batch = batch or batch_file is not None
+    if batch_format != BATCH_FORMAT_SHLEX and not batch:
+        raise click.UsageError(
+            '--batch-format can only be used with --batch or --batch-file')
+    if coalesce and not batch:
+        raise click.UsageError(
+            '--coalesce can only be used with --batch or --batch-file')
+
     if recursive and batch:
         raise click.UsageError(
             ('You cannot use --recursive in addition to --batch. '
@@ -117,6 +157,12 @@ def transfer_command(batch, sync_level, recursive, destination, source, label,
             ('transfer requires either SOURCE_PATH and DEST_PATH or '
              '--batch'))
 
+    chunked = max_items_per_task is not None or max_payload_bytes is not None
+    submission_ids = read_submission_ids(submission_ids_file, submission_id,
+                                         chunked)
+    if submission_ids:
+        submission_id = submission_ids[0]
+
     # because python can't handle multiple **kwargs expansions in a single
     # call, we need to get a little bit clever
     # both the performance options (of which there are a few), and the
@@ -142,7 +188,40 @@ def transfer_command(batch, sync_level, recursive, destination, source, label,
         deadline=deadline, skip_activation_check=skip_activation_check,
         **kwargs)
 
+    # start autoactivation now, so that it runs while batch input is being
+    # read, and wait for it just before the endpoints are used
+    # skip this if skip-activation-check is given
+    # a dry-run needs only the source endpoint, and only to coalesce items
+    activation = None
+    if not skip_activation_check:
+        if not dry_run:
+            activation = BackgroundAutoactivation(
+                (source_endpoint, dest_endpoint), if_expires_in=60)
+        elif coalesce:
+            activation = BackgroundAutoactivation(
+                (source_endpoint,), if_expires_in=60)
+
+    if chunked:
+        # chunks are submitted while input is still being read, so the
+        # endpoints must be activated before the first one goes out
+        submitter = ChunkedTaskSubmitter(
+            transfer_data, max_items=max_items_per_task,
+            max_payload_bytes=max_payload_bytes, dry_run=dry_run,
+            before_submit=activation and activation.wait,
+            submission_ids=submission_ids)
+        add_item = submitter.add_item
+    else:
+        add_item = transfer_data.add_item
+
     if batch:
+        # when coalescing, hold on to every item until all input is read
+        batch_items = []
+        if coalesce:
+            def add_batch_item(source_path, dest_path, recursive):
+                batch_items.append((source_path, dest_path, recursive))
+        else:
+            add_batch_item = add_item
+
         @click.command()
         @click.option('--recursive', '-r', is_flag=True)
         @click.argument('source_path', type=TaskPath(base_dir=cmd_source_path))
@@ -152,32 +231,51 @@ def transfer_command(batch, sync_level, recursive, destination, source, label,
             Parse a line of batch input and turn it into a transfer submission
             item.
             """
-            transfer_data.add_item(str(source_path), str(dest_path),
-                                   recursive=recursive)
+            add_batch_item(str(source_path), str(dest_path),
+                           recursive=recursive)
 
-        shlex_process_stdin(
-            process_batch_line,
-            ('Enter transfers, line by line, as\n\n'
-             '    [--recursive] SOURCE_PATH DEST_PATH\n'))
+        try:
+            process_batch_input(
+                process_batch_line,
+                ('Enter transfers, line by line, as\n\n'
+                 '    [--recursive] SOURCE_PATH DEST_PATH\n'),
+                batch_format=batch_format, batch_file=batch_file)
+        except BaseException:
+            # bad lines exit, like any click command, but chunks may have been
+            # submitted already, and must be reported
+            if chunked:
+                abort_chunked_submission(submitter)
+            raise
+
+        if coalesce:
+            # the source endpoint is listed, so it must be activated
+            if activation is not None:
+                activation.wait()
+            coalesced = coalesce_transfer_items(
+                client, source_endpoint, batch_items)
+            safeprint('Coalesced {} batch items into {} ({} saved)'.format(
+                len(batch_items), len(coalesced),
+                len(batch_items) - len(coalesced)), write_to_stderr=True)
+            for (source_path, dest_path, item_recursive) in coalesced:
+                add_item(source_path, dest_path, recursive=item_recursive)
     else:
-        transfer_data.add_item(cmd_source_path, cmd_dest_path,
-                               recursive=recursive)
+        add_item(cmd_source_path, cmd_dest_path, recursive=recursive)
+
+    if chunked:
+        finish_chunked_submission(submitter, TRANSFER_ITEM_FIELDS)
+        return
 
     if dry_run:
         formatted_print(
-            transfer_data, response_key='DATA',
-            fields=(('Source Path', 'source_path'),
-                    ('Dest Path', 'destination_path'),
-                    ('Recursive', 'recursive')))
+            transfer_data, response_key='DATA', fields=TRANSFER_ITEM_FIELDS)
         # exit safely
         return
 
-    # autoactivate after parsing all args and putting things together
-    # skip this if skip-activation-check is given
-    if not skip_activation_check:
-        autoactivate(client, source_endpoint, if_expires_in=60)
-        autoactivate(client, dest_endpoint, if_expires_in=60)
+    if activation is not None:
+        activation.wait()
 
-    res = client.submit_transfer(transfer_data)
+    # resubmission is safe, as the submission ID is unchanged
+    res = call_with_background_autoactivation(
+        activation, client.submit_transfer, transfer_data)
     formatted_print(res, text_format=FORMAT_TEXT_RECORD,
                     fields=(('Message', 'message'), ('Task ID', 'task_id')))
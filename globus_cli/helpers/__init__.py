@@ -1,7 +1,10 @@
 from globus_cli.helpers.options import (
     outformat_is_json, outformat_is_text, outformat_is_unix,
+    outformat_is_csv, outformat_is_tsv,
     verbosity, is_verbose,
-    get_jmespath_expression)
+    get_jmespath_expression, is_json_compact, get_columns)
+from globus_cli.helpers.field_projection import (
+    projected_fields, jmespath_item_keys, select_fields)
 from globus_cli.helpers.version import print_version
 from globus_cli.helpers.local_server import (
     start_local_server, is_remote_session, LocalServerError)
@@ -13,7 +16,9 @@ __all__ = [
     'print_version',
 
     'outformat_is_json', 'outformat_is_text', 'outformat_is_unix',
-    'get_jmespath_expression',
+    'outformat_is_csv', 'outformat_is_tsv',
+    'get_jmespath_expression', 'is_json_compact', 'get_columns',
+    'projected_fields', 'jmespath_item_keys', 'select_fields',
 
     "verbosity", "is_verbose",
 
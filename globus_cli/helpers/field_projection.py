@@ -0,0 +1,133 @@
+import click
+import six
+
+from globus_cli.helpers.options import (
+    outformat_is_text, outformat_is_csv, outformat_is_tsv, get_columns,
+    get_jmespath_expression)
+
+# nodes whose value depends only on their first child, evaluated against the
+# current node -- the rest of their children are evaluated against its result
+_LEFT_ONLY_NODES = ('subexpression', 'index_expression', 'pipe', 'projection',
+                    'filter_projection', 'flatten', 'value_projection')
+# nodes whose children are all evaluated against the current node
+_UNION_NODES = ('multi_select_list', 'multi_select_dict', 'key_val_pair',
+                'comparator', 'and_expression', 'or_expression',
+                'not_expression', 'function_expression')
+# nodes which don't look at the current node at all
+_CONSTANT_NODES = ('literal', 'raw_string', 'index', 'slice', 'expref')
+
+
+def _node_keys(node):
+    """
+    Get the top-level keys of the current node which a JMESPath AST node
+    looks at, or None if it may look at the whole of it.
+    """
+    node_type = node['type']
+    if node_type == 'field':
+        return set([node['value']])
+    if node_type in _LEFT_ONLY_NODES:
+        return _node_keys(node['children'][0])
+    if node_type in _UNION_NODES:
+        keys = set()
+        for child in node['children']:
+            child_keys = _node_keys(child)
+            if child_keys is None:
+                return None
+            keys |= child_keys
+        return keys
+    if node_type in _CONSTANT_NODES:
+        # the keys an `&expression` looks at belong to the elements of one
+        # of the other function arguments, not the current node
+        return set()
+    # 'identity', 'current', and anything unknown
+    return None
+
+
+def _is_list_reference(node, list_key):
+    if node['type'] == 'flatten':
+        node = node['children'][0]
+    return node['type'] == 'field' and node['value'] == list_key
+
+
+def jmespath_item_keys(expr, list_key='DATA'):
+    """
+    Get the top-level keys of the items of a listing, as in `{'DATA': [...]}`,
+    which a compiled JMESPath expression looks at, or None if it isn't a
+    simple projection or filter of the items (e.g. `DATA[].task_id` or
+    `DATA[?status=='ACTIVE'].[task_id, label]`) or may look at whole items.
+    """
+    node = expr.parsed
+    # whatever follows a pipe only sees the results of what precedes it
+    while node['type'] == 'pipe':
+        node = node['children'][0]
+
+    if (node['type'] not in ('projection', 'filter_projection') or
+            not _is_list_reference(node['children'][0], list_key)):
+        return None
+
+    # the projected expression, and any filter condition
+    keys = set()
+    for child in node['children'][1:]:
+        child_keys = _node_keys(child)
+        if child_keys is None:
+            return None
+        keys |= child_keys
+    return keys
+
+
+def select_fields(fields, columns):
+    """
+    Get the (name, key) fields named by ``columns``, in that order, or all of
+    them if ``columns`` is None. A column may be named by its field's name or
+    (string) key, ignoring case.
+
+    Raises a UsageError for any column which names no field.
+    """
+    if columns is None:
+        return list(fields)
+
+    by_name = {}
+    for name, key in fields:
+        by_name.setdefault(name.lower(), (name, key))
+        if isinstance(key, six.string_types):
+            by_name.setdefault(key.lower(), (name, key))
+
+    selected = []
+    for column in columns:
+        if column.lower() not in by_name:
+            raise click.UsageError(
+                'No column named "{}". Columns are: {}'.format(
+                    column, ', '.join(name for name, _ in fields)))
+        selected.append(by_name[column.lower()])
+    return selected
+
+
+def projected_fields(fields, extra_keys=()):
+    """
+    Get a `fields` parameter for a Transfer listing which asks only for the
+    keys of its items needed for output, or None if whole items are needed.
+
+    ``fields`` are the (name, key) fields used for text output by
+    `formatted_print`. Any keys given as functions must have the keys they
+    look at listed in ``extra_keys``. CSV and TSV output need only the keys of
+    the columns selected. JSON and UNIX output need whole items, unless they
+    are processed with a JMESPath expression which is a simple projection or
+    filter of the items.
+
+    Only safe to call within a click context.
+    """
+    if outformat_is_csv() or outformat_is_tsv():
+        fields = select_fields(fields, get_columns())
+    if outformat_is_text() or outformat_is_csv() or outformat_is_tsv():
+        keys = set(extra_keys)
+        keys.update(key for _, key in fields
+                    if isinstance(key, six.string_types))
+    else:
+        expr = get_jmespath_expression()
+        if expr is None:
+            return None
+        keys = jmespath_item_keys(expr)
+
+    if not keys:
+        return None
+    return ','.join(sorted(keys))
@@ -30,6 +30,33 @@ def outformat_is_text():
     return state.outformat_is_text()
 
 
+def outformat_is_csv():
+    """
+    Only safe to call within a click context.
+    """
+    ctx = click.get_current_context()
+    state = ctx.ensure_object(CommandState)
+    return state.outformat_is_csv()
+
+
+def outformat_is_tsv():
+    """
+    Only safe to call within a click context.
+    """
+    ctx = click.get_current_context()
+    state = ctx.ensure_object(CommandState)
+    return state.outformat_is_tsv()
+
+
+def get_columns():
+    """
+    Only safe to call within a click context.
+    """
+    ctx = click.get_current_context()
+    state = ctx.ensure_object(CommandState)
+    return state.columns
+
+
 def get_jmespath_expression():
     """
     Only safe to call within a click context.
@@ -39,6 +66,15 @@ def get_jmespath_expression():
     return state.jmespath_expr
 
 
+def is_json_compact():
+    """
+    Only safe to call within a click context.
+    """
+    ctx = click.get_current_context()
+    state = ctx.ensure_object(CommandState)
+    return state.json_compact
+
+
 def verbosity():
     """
     Only safe to call within a click context.
@@ -8,18 +8,23 @@ from globus_cli.parsing.endpoint_plus_path import (
 
 from globus_cli.parsing.hidden_option import HiddenOption
 from globus_cli.parsing.iso_time import ISOTimeType
+from globus_cli.parsing.duration import DurationType
+from globus_cli.parsing.comparison import ComparisonType, SIZE_UNITS
+from globus_cli.parsing.result_limit import ResultLimitType, num_results
 
 from globus_cli.parsing.explicit_null import EXPLICIT_NULL
 
 from globus_cli.parsing.shared_options import (
     common_options, endpoint_id_arg, task_id_arg, task_submission_options,
-    delete_and_rm_options, synchronous_task_wait_options,
+    delete_and_rm_options, batch_input_options, task_chunking_options,
+    all_fields_option, synchronous_task_wait_options,
     endpoint_create_and_update_params,
     validate_endpoint_create_and_update_params,
     role_id_arg, server_id_arg, server_add_and_update_opts,
     security_principal_opts)
 
-from globus_cli.parsing.process_stdin import shlex_process_stdin
+from globus_cli.parsing.process_stdin import (
+    shlex_process_stdin, process_batch_input, BATCH_FORMAT_SHLEX)
 
 from globus_cli.parsing.one_use_option import one_use_option
 
@@ -36,17 +41,21 @@ __all__ = [
 
     'HiddenOption',
     'ISOTimeType',
+    'DurationType',
+    'ComparisonType', 'SIZE_UNITS',
+    'ResultLimitType', 'num_results',
 
     'EXPLICIT_NULL',
 
     'common_options',
     # Transfer options
     'endpoint_id_arg', 'task_id_arg', 'task_submission_options',
-    'delete_and_rm_options', 'synchronous_task_wait_options',
+    'delete_and_rm_options', 'batch_input_options', 'task_chunking_options',
+    'all_fields_option', 'synchronous_task_wait_options',
     'endpoint_create_and_update_params',
     'validate_endpoint_create_and_update_params',
     'role_id_arg', 'server_id_arg', 'server_add_and_update_opts',
     'security_principal_opts',
 
-    'shlex_process_stdin',
+    'shlex_process_stdin', 'process_batch_input', 'BATCH_FORMAT_SHLEX',
 ]
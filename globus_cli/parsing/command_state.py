@@ -12,6 +12,8 @@ from globus_cli.parsing.hidden_option import HiddenOption
 JSON_FORMAT = 'json'
 TEXT_FORMAT = 'text'
 UNIX_FORMAT = 'unix'
+CSV_FORMAT = 'csv'
+TSV_FORMAT = 'tsv'
 
 
 class CommandState(object):
@@ -20,6 +22,10 @@ class CommandState(object):
         self.output_format = config.get_output_format() or TEXT_FORMAT
         # a jmespath expression to process on the json output
         self.jmespath_expr = None
+        # json output on one line, unsorted, rather than indented
+        self.json_compact = False
+        # names of the columns of csv and tsv output, or None for all
+        self.columns = None
         # default is always False
         self.debug = False
         # default is 0
@@ -36,6 +42,12 @@ class CommandState(object):
     def outformat_is_unix(self):
         return self.output_format == UNIX_FORMAT
 
+    def outformat_is_csv(self):
+        return self.output_format == CSV_FORMAT
+
+    def outformat_is_tsv(self):
+        return self.output_format == TSV_FORMAT
+
     def is_verbose(self):
         return self.verbosity > 0
 
@@ -63,9 +75,25 @@ def format_option(f):
         if state.output_format == TEXT_FORMAT:
             state.output_format = JSON_FORMAT
 
+    def json_compact_callback(ctx, param, value):
+        if not value:
+            return
+
+        state = ctx.ensure_object(CommandState)
+        state.json_compact = True
+
+    def columns_callback(ctx, param, value):
+        if value is None:
+            return
+
+        state = ctx.ensure_object(CommandState)
+        state.columns = [name.strip() for name in value.split(',')
+                         if name.strip()]
+
     f = click.option(
         '-F', '--format',
-        type=CaseInsensitiveChoice([UNIX_FORMAT, JSON_FORMAT, TEXT_FORMAT]),
+        type=CaseInsensitiveChoice([UNIX_FORMAT, JSON_FORMAT, TEXT_FORMAT,
+                                    CSV_FORMAT, TSV_FORMAT]),
         help='Output format for stdout. Defaults to text',
         expose_value=False, callback=callback)(f)
     f = click.option(
@@ -74,6 +102,16 @@ def format_option(f):
               "Takes precedence over any specified '--format' and forces "
               "the format to be json processed by this expression"),
         expose_value=False, callback=jmespath_callback)(f)
+    f = click.option(
+        "--json-compact", is_flag=True,
+        help=("Print json output on one line, with keys in no particular "
+              "order, for consumption by other programs"),
+        expose_value=False, callback=json_compact_callback)(f)
+    f = click.option(
+        "--columns", metavar="NAME,NAME,...",
+        help=("The columns of csv and tsv output, by name or field, "
+              "e.g. 'Task ID,status'. Defaults to all columns"),
+        expose_value=False, callback=columns_callback)(f)
     return f
 
 
@@ -0,0 +1,41 @@
+import click
+import re
+
+# bytes in each of the units a size may be given in
+SIZE_UNITS = {'c': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3,
+              't': 1024 ** 4}
+
+
+class ComparisonType(click.ParamType):
+    """
+    A number to compare against, given as in find(1): "+N" for more than N,
+    "-N" for less than N, or "N" for exactly N, with an optional unit suffix
+    from ``units``. Converted to an (operator, number, unit) tuple, where the
+    operator is ">", "<", or "=", and the unit is what the suffix stands for
+    in ``units``, or 1 without one.
+
+    As in find(1), what is compared should be counted in the unit, rounded
+    up, so that "-1k" means "rounds up to less than 1k": empty.
+    """
+
+    name = "COMPARISON"
+
+    def __init__(self, units=None):
+        self.units = units or {}
+
+    def get_metavar(self, param):
+        return "[+|-]N" + ("[UNIT]" if self.units else "")
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, tuple):
+            return value
+        match = re.match(r'^\s*([+-]?)(\d+)([a-z]?)\s*$', value.lower())
+        if not match or (match.group(3) and match.group(3) not in self.units):
+            self.fail(
+                ("{} is not a number, with an optional leading + or -{}"
+                 .format(value, ", and unit suffix of {}".format(
+                     ", ".join(sorted(self.units, key=self.units.get)))
+                     if self.units else "")))
+        sign, number, unit = match.groups()
+        return ({'+': '>', '-': '<', '': '='}[sign], int(number),
+                self.units.get(unit, 1))
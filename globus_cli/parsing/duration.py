@@ -0,0 +1,29 @@
+import click
+import re
+
+# seconds in each of the units a duration may be given in
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60,
+                  'w': 7 * 24 * 60 * 60}
+
+
+class DurationType(click.ParamType):
+    """
+    A length of time, given as a number with an optional unit suffix of s, m,
+    h, d, or w (seconds is the default), and converted to a number of seconds
+    """
+
+    name = "DURATION"
+
+    def get_metavar(self, param):
+        return "DURATION"
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, int):
+            return value
+        match = re.match(r'^\s*(\d+)\s*([smhdw]?)\s*$', value.lower())
+        if not match:
+            self.fail(
+                ("{} is not a duration, like '90s', '30m', '12h', '7d', or "
+                 "'2w'".format(value)))
+        number, unit = match.groups()
+        return int(number) * DURATION_UNITS[unit or 's']
@@ -16,6 +16,7 @@ from globus_sdk import exc
 
 from globus_cli.parsing.command_state import CommandState
 from globus_cli.safeio import safeprint, write_error_info, PrintableErrorField
+from globus_cli.services.activation_cache import invalidate_activation
 
 
 def exit_with_mapped_status(http_status):
@@ -126,6 +127,11 @@ def custom_except_hook(exc_info):
         # handle the Globus-raised errors with our special hooks
         # these will present the output (on stderr) as JSON
         elif isinstance(exception, exc.TransferAPIError):
+            # some endpoint was not activated after all, but we don't know
+            # which one, so drop every cached activation
+            if exception.code == "ClientError.ActivationRequired":
+                invalidate_activation()
+
             if exception.code == "ClientError.AuthenticationFailed":
                 authentication_hook(exception)
             else:
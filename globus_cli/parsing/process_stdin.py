@@ -1,9 +1,316 @@
+import csv
+import json
+import mmap
+import os
+import re
 import sys
 import shlex
+from functools import partial
+
+import click
+import six
 
 from globus_cli.safeio import safeprint
 
 
+# formats accepted for batch input
+BATCH_FORMAT_SHLEX = 'shlex'
+BATCH_FORMAT_NULL = 'null'
+BATCH_FORMAT_NDJSON = 'ndjson'
+BATCH_FORMAT_CSV = 'csv'
+BATCH_FORMATS = (BATCH_FORMAT_SHLEX, BATCH_FORMAT_NULL, BATCH_FORMAT_NDJSON,
+                 BATCH_FORMAT_CSV)
+
+# size of reads used to split NUL-delimited input from a stream
+_STREAM_CHUNK_SIZE = 1024 * 1024
+
+# any of these characters give a line some meaning under the shlex POSIX rules
+# beyond "words separated by whitespace" -- quoting, escaping, and comments
+_SHLEX_SPECIAL_CHARS = re.compile(r'[\'"\\#]')
+# the shlex whitespace set, which is narrower than the one used by str.split()
+_SHLEX_WHITESPACE = re.compile(r'[ \t\r\n]+')
+
+# values accepted for flags given as CSV cells
+_CSV_TRUE_VALUES = ('1', 'true', 't', 'yes', 'y')
+_CSV_FALSE_VALUES = ('', '0', 'false', 'f', 'no', 'n')
+
+
+def _simple_split(line):
+    """
+    Split a line of batch input without shlex, when that is safe to do.
+
+    Returns the argument vector if it is identical to what shlex would
+    produce, or None if the line uses quotes, escapes, or mid-line comments
+    and must be handed to shlex.
+    """
+    stripped = line.lstrip(' \t\r\n')
+    # blank lines and whole-line comments produce no arguments at all
+    if not stripped or stripped.startswith('#'):
+        return []
+    if _SHLEX_SPECIAL_CHARS.search(stripped):
+        return None
+    return [x for x in _SHLEX_WHITESPACE.split(stripped) if x]
+
+
+class _BatchLineCommand(object):
+    """
+    A view of the Click command used to process single lines of batch input,
+    which handles well-formed inputs for that command without building a Click
+    context and parser for each line.
+
+    Only commands made up of single-valued arguments and plain boolean flags
+    (e.g. `[--recursive] SOURCE_PATH DEST_PATH`) are supported -- check
+    `supported` before use.
+    """
+    def __init__(self, process_command):
+        self.process_command = process_command
+        self.arguments = []
+        self.flags = []
+        self.flag_opts = {}
+        self.supported = True
+
+        for param in process_command.params:
+            if param.callback is not None or not param.expose_value:
+                self.supported = False
+            elif isinstance(param, click.Argument) and param.nargs == 1:
+                self.arguments.append(param)
+            elif (isinstance(param, click.Option) and param.is_flag and
+                  param.is_bool_flag and not param.secondary_opts and
+                  not param.multiple):
+                self.flags.append(param)
+                for opt in param.opts:
+                    self.flag_opts[opt] = param
+            else:
+                self.supported = False
+
+        self.field_names = ([p.name for p in self.arguments] +
+                            [p.name for p in self.flags])
+
+    def _defaults(self):
+        return dict((p.name, p.default) for p in self.flags)
+
+    def invoke_argv(self, argv):
+        """
+        Process an argument vector, returning True if it was handled, or False
+        if it was not well-formed. In that case, the caller must fall back to
+        `process_command.main()` so that errors are reported exactly as Click
+        would report them.
+        """
+        values = self._defaults()
+        positionals = []
+        for arg in argv:
+            if arg in self.flag_opts:
+                param = self.flag_opts[arg]
+                values[param.name] = param.flag_value
+            elif arg.startswith('-'):
+                # other options, combined short flags, `--`, and so forth
+                return False
+            else:
+                positionals.append(arg)
+
+        if len(positionals) != len(self.arguments):
+            return False
+
+        try:
+            for param, value in zip(self.arguments, positionals):
+                values[param.name] = param.type.convert(value, param, None)
+        except click.BadParameter:
+            return False
+
+        self.process_command.callback(**values)
+        return True
+
+    def invoke_fields(self, fields, location):
+        """
+        Process a dict of field values from structured batch input, keyed by
+        argument and flag names. Any problem with the input is raised as a
+        UsageError which names the `location` of the record in the input.
+        """
+        def fail(message):
+            raise click.UsageError(
+                'Invalid batch input on {}: {}'.format(location, message))
+
+        unknown = sorted(set(fields) - set(self.field_names))
+        if unknown:
+            fail('unknown field(s) {}'.format(', '.join(unknown)))
+
+        values = self._defaults()
+        for param in self.flags:
+            value = fields.get(param.name, param.default)
+            if not isinstance(value, bool):
+                fail('"{}" must be true or false'.format(param.name))
+            values[param.name] = value
+
+        for param in self.arguments:
+            value = fields.get(param.name)
+            if not isinstance(value, six.string_types) or not value:
+                fail('"{}" must be a non-empty string'.format(param.name))
+            try:
+                values[param.name] = param.type.convert(value, param, None)
+            except click.BadParameter as err:
+                fail(err.format_message())
+
+        self.process_command.callback(**values)
+
+
+def _iter_records(batch_file, delimiter):
+    """
+    Iterate over the delimited records of batch input as bytes, without the
+    delimiters. Reads from stdin if `batch_file` is None. Files are
+    memory-mapped rather than read into memory.
+    """
+    if batch_file is None:
+        stream = click.get_binary_stream('stdin')
+        if delimiter == b'\n':
+            for line in iter(stream.readline, b''):
+                yield line[:-1] if line.endswith(b'\n') else line
+        else:
+            pending = b''
+            for chunk in iter(partial(stream.read, _STREAM_CHUNK_SIZE), b''):
+                records = (pending + chunk).split(delimiter)
+                pending = records.pop()
+                for record in records:
+                    yield record
+            if pending:
+                yield pending
+        return
+
+    with open(batch_file, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        # empty files cannot be mapped, but have no records anyway
+        if not size:
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            start = 0
+            while start < size:
+                end = mapped.find(delimiter, start)
+                if end == -1:
+                    end = size
+                yield mapped[start:end]
+                start = end + 1
+        finally:
+            mapped.close()
+
+
+def _decode_record(record, location):
+    """
+    Decode a record of batch input to a native string.
+    """
+    if six.PY2:
+        return record
+    try:
+        return record.decode('utf-8')
+    except UnicodeDecodeError:
+        raise click.UsageError(
+            'Invalid batch input on {}: not valid UTF-8'.format(location))
+
+
+def _process_shlex_lines(process_command, lines):
+    fast_path = _BatchLineCommand(process_command)
+
+    for line in lines:
+        # get the argument vector:
+        # do a shlex split to handle quoted paths with spaces in them
+        # also lets us have comments with #
+        # when the line has none of those features, split it directly
+        argv = _simple_split(line)
+        if argv is None:
+            argv = shlex.split(line, comments=True)
+        elif fast_path.supported and argv and fast_path.invoke_argv(argv):
+            continue
+
+        if argv:
+            try:
+                process_command.main(args=argv)
+            except SystemExit as e:
+                if e.code != 0:
+                    raise
+
+
+def _process_null_records(command, batch_file):
+    """
+    NUL-delimited records hold one field each, and are consumed in groups of
+    one record per argument of the batch line command -- as produced by
+    `find -print0`, for example.
+    """
+    names = [p.name for p in command.arguments]
+    group = []
+    for recnum, record in enumerate(_iter_records(batch_file, b'\0'), 1):
+        location = 'record {}'.format(recnum)
+        group.append(_decode_record(record, location))
+        if len(group) == len(names):
+            command.invoke_fields(dict(zip(names, group)), location)
+            group = []
+    if group:
+        raise click.UsageError(
+            'Invalid batch input: incomplete final group of records, '
+            'expected {} record(s) per item ({})'
+            .format(len(names), ', '.join(names)))
+
+
+def _process_ndjson_records(command, batch_file):
+    """
+    Each line holds one JSON object, keyed by argument and flag names.
+    """
+    for lineno, record in enumerate(_iter_records(batch_file, b'\n'), 1):
+        location = 'line {}'.format(lineno)
+        line = _decode_record(record, location)
+        if not line.strip():
+            continue
+        try:
+            fields = json.loads(line)
+        except ValueError:
+            raise click.UsageError(
+                'Invalid batch input on {}: not valid JSON'.format(location))
+        if not isinstance(fields, dict):
+            raise click.UsageError(
+                'Invalid batch input on {}: not a JSON object'
+                .format(location))
+        command.invoke_fields(fields, location)
+
+
+def _process_csv_records(command, batch_file):
+    """
+    Each row holds the arguments in order, optionally followed by flag
+    values. If the first row is made up of field names, it's a header which
+    gives the columns instead.
+    """
+    def lines():
+        for lineno, record in enumerate(_iter_records(batch_file, b'\n'), 1):
+            yield _decode_record(record, 'line {}'.format(lineno)) + '\n'
+
+    reader = csv.reader(lines())
+    columns = command.field_names
+    first = True
+    for row in reader:
+        location = 'line {}'.format(reader.line_num)
+        if not any(cell.strip() for cell in row):
+            continue
+        if first:
+            first = False
+            header = [cell.strip().lower() for cell in row]
+            if (set(command.field_names[:len(command.arguments)]) <=
+                    set(header) <= set(columns) and
+                    len(set(header)) == len(row)):
+                columns = header
+                continue
+        if not len(command.arguments) <= len(row) <= len(columns):
+            raise click.UsageError(
+                'Invalid batch input on {}: expected {} column(s) ({})'
+                .format(location, len(columns), ', '.join(columns)))
+
+        fields = dict(zip(columns, row))
+        for param in command.flags:
+            if param.name in fields:
+                value = fields[param.name].strip().lower()
+                if value in _CSV_TRUE_VALUES:
+                    fields[param.name] = True
+                elif value in _CSV_FALSE_VALUES:
+                    fields[param.name] = False
+        command.invoke_fields(fields, location)
+
+
 def shlex_process_stdin(process_command, helptext):
     """
     Use shlex to process stdin line-by-line.
@@ -12,6 +319,12 @@ def shlex_process_stdin(process_command, helptext):
     Requires that @process_command be a Click command object, used for
     processing single lines of input. helptext is prepended to the standard
     message printed to interactive sessions.
+
+    Lines which are plain whitespace-separated words, and which are well-formed
+    for @process_command, skip both shlex and Click parsing and are handed
+    directly to the command's callback. Anything else -- quoting, escapes,
+    unknown options, the wrong number of arguments -- is processed exactly as
+    it would be without this fast path.
     """
     # if input is interactive, print help to stderr
     if sys.stdin.isatty():
@@ -21,17 +334,46 @@ def shlex_process_stdin(process_command, helptext):
              'https://docs.python.org/library/shlex.html#parsing-rules\n'
              'Terminate input with Ctrl+D or <EOF>\n'), write_to_stderr=True)
 
-    # use readlines() rather than implicit file read line looping to force
+    # use readline() rather than implicit file read line looping to force
     # python to properly capture EOF (otherwise, EOF acts as a flush and
-    # things get weird)
-    for line in sys.stdin.readlines():
-        # get the argument vector:
-        # do a shlex split to handle quoted paths with spaces in them
-        # also lets us have comments with #
-        argv = shlex.split(line, comments=True)
-        if argv:
-            try:
-                process_command.main(args=argv)
-            except SystemExit as e:
-                if e.code != 0:
-                    raise
+    # things get weird), but without reading all of stdin into memory up front
+    _process_shlex_lines(process_command, iter(sys.stdin.readline, ''))
+
+
+def process_batch_input(process_command, helptext,
+                        batch_format=BATCH_FORMAT_SHLEX, batch_file=None):
+    """
+    Process batch input from stdin or from `batch_file` in any of the
+    BATCH_FORMATS, handing each item to @process_command.
+
+    "shlex" input is processed as by `shlex_process_stdin`. The other formats
+    are parsed without shlex or Click, and map fields onto the arguments and
+    flags of @process_command by name. Any invalid record is a UsageError
+    which gives its line or record number.
+    """
+    if batch_format == BATCH_FORMAT_SHLEX:
+        if batch_file is None:
+            shlex_process_stdin(process_command, helptext)
+        else:
+            _process_shlex_lines(
+                process_command,
+                (_decode_record(record, 'line {}'.format(lineno))
+                 for lineno, record in enumerate(
+                     _iter_records(batch_file, b'\n'), 1)))
+        return
+
+    command = _BatchLineCommand(process_command)
+    if not command.supported:
+        raise ValueError(
+            'Internal Error! {} batch input is not supported for this command'
+            .format(batch_format))
+
+    if batch_format == BATCH_FORMAT_NULL:
+        _process_null_records(command, batch_file)
+    elif batch_format == BATCH_FORMAT_NDJSON:
+        _process_ndjson_records(command, batch_file)
+    elif batch_format == BATCH_FORMAT_CSV:
+        _process_csv_records(command, batch_file)
+    else:
+        raise ValueError('Internal Error! Unknown batch format: {}'
+                         .format(batch_format))
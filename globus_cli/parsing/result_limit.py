@@ -0,0 +1,39 @@
+import click
+
+
+class ResultLimitType(click.ParamType):
+    """
+    A positive integer limit on a number of results, or "unlimited" for no
+    limit at all.
+
+    "unlimited" is kept as a string (Click would replace None with the
+    option's default), so use `num_results()` to get the limit to pass to the
+    SDK.
+    """
+
+    name = "LIMIT"
+
+    def get_metavar(self, param):
+        return "[INTEGER|unlimited]"
+
+    def convert(self, value, param, ctx):
+        if value is None or isinstance(value, int):
+            return value
+        if value.lower() == "unlimited":
+            return "unlimited"
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            self.fail(
+                "{} is not a positive integer or 'unlimited'".format(value))
+        return limit
+
+
+def num_results(limit):
+    """
+    Convert a value from ResultLimitType to a `num_results` for paginated SDK
+    calls, where None means no limit.
+    """
+    return None if limit == "unlimited" else limit
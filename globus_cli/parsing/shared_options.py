@@ -9,6 +9,7 @@ from globus_cli.parsing.detect_and_decorate import detect_and_decorate
 from globus_cli.parsing.location import LocationType
 from globus_cli.parsing.iso_time import ISOTimeType
 from globus_cli.parsing.explicit_null import EXPLICIT_NULL
+from globus_cli.parsing.process_stdin import BATCH_FORMATS, BATCH_FORMAT_SHLEX
 
 
 def common_options(*args, **kwargs):
@@ -456,6 +457,57 @@ def delete_and_rm_options(*args, **kwargs):
     return detect_and_decorate(inner_decorator, args, kwargs)
 
 
+def batch_input_options(f):
+    """
+    Options controlling how `--batch` input is read, shared by transfer and
+    delete task submission
+    """
+    f = click.option(
+        '--batch-format', default=BATCH_FORMAT_SHLEX, show_default=True,
+        type=CaseInsensitiveChoice(BATCH_FORMATS),
+        help=('Format of batch input. "shlex" lines are split like shell '
+              'commands, "null" takes NUL-delimited paths (as from '
+              '`find -print0`), "ndjson" takes one JSON object per line, and '
+              '"csv" takes one row per item'))(f)
+    f = click.option(
+        '--batch-file', type=click.Path(exists=True, dir_okay=False),
+        help=('Read batch input from this file instead of stdin. '
+              'Implies --batch'))(f)
+    return f
+
+
+def task_chunking_options(f):
+    """
+    Options for splitting a transfer or delete submission across several tasks
+    """
+    f = click.option(
+        '--max-items-per-task', type=click.IntRange(min=1), metavar='N',
+        help=('Split the submission into several tasks of at most N items '
+              'each. A manifest of every submitted task is printed'))(f)
+    f = click.option(
+        '--max-payload-bytes', type=click.IntRange(min=1), metavar='N',
+        help=('Split the submission into several tasks whose documents are '
+              'at most (approximately) N bytes each. A manifest of every '
+              'submitted task is printed'))(f)
+    f = click.option(
+        '--submission-ids-file', type=click.File('r'), metavar='FILE',
+        help=('Read the submission IDs of the tasks, one per line, from FILE '
+              '-- the Submission IDs of the manifest of an earlier submission '
+              'of the same input, to resubmit it safely'))(f)
+    return f
+
+
+def all_fields_option(f):
+    """
+    Opt-out of asking the service for only the fields of a listing which are
+    needed for output
+    """
+    return click.option(
+        '--all-fields', is_flag=True,
+        help=('Fetch whole documents, rather than only the fields needed '
+              'for output'))(f)
+
+
 def synchronous_task_wait_options(f):
     def polling_interval_callback(ctx, param, value):
         if not value:
@@ -473,9 +525,11 @@ def synchronous_task_wait_options(f):
                            'then, or terminates with an unsuccessful status, '
                            'exit with status 1'))(f)
     f = click.option(
-        '--polling-interval', default=1, type=int, show_default=True,
+        '--polling-interval', default=None, type=int,
         callback=polling_interval_callback,
-        help='Number of seconds between Task status checks.')(f)
+        help=('Number of seconds between Task status checks. By default, '
+              'checks start 1 second apart, and back off to once a '
+              'minute.'))(f)
     f = click.option(
         '--heartbeat', '-H', is_flag=True,
         help=('Every polling interval, print "." to stdout to '
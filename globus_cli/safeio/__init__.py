@@ -1,7 +1,7 @@
-from globus_cli.safeio.write import safeprint
+from globus_cli.safeio.write import safeprint, OutputBuffer
 from globus_cli.safeio.errors import PrintableErrorField, write_error_info
 from globus_cli.safeio.output_formatter import (
-    formatted_print,
+    formatted_print, iterable_response_to_dict,
 
     FORMAT_SILENT, FORMAT_JSON,
     FORMAT_TEXT_TABLE, FORMAT_TEXT_RECORD, FORMAT_TEXT_RAW)
@@ -10,11 +10,13 @@ from globus_cli.safeio.check_pty import (
 
 __all__ = [
     'safeprint',
+    'OutputBuffer',
 
     'PrintableErrorField',
     'write_error_info',
 
     'formatted_print',
+    'iterable_response_to_dict',
     'FORMAT_SILENT',
     'FORMAT_JSON',
     'FORMAT_TEXT_TABLE',
@@ -14,7 +14,7 @@
 # language governing permissions and limitations under the License.
 
 # START Globus changes
-import errno
+import itertools
 import json
 import sys
 
@@ -22,6 +22,8 @@ import sys
 # we're going to use the stock/standard one and it should have all of the
 # same/correct behaviors
 import six
+
+from globus_cli.safeio.write import OutputBuffer
 # END Globus changes
 
 
@@ -130,15 +132,79 @@ def _partition_dict(item_dict, scalar_keys):
 
 
 # START Globus changes
+# the number of items of a listing looked at for the scalar keys of its rows
+# before any of it is written
+UNIX_LOOKAHEAD = 100
+
+
+def _format_dict_rows(items, identifier, scalar_keys, stream):
+    # as _format_text does for each item of a list, with the order of the
+    # scalar keys worked out once rather than for every row
+    scalar_key_set = frozenset(scalar_keys)
+    prefix = [identifier.upper()] if identifier is not None else []
+    for item in items:
+        if not isinstance(item, dict):
+            _format_text(item, stream=stream, identifier=identifier,
+                         scalar_keys=scalar_keys)
+            continue
+        if scalar_keys:
+            stream.write('\t'.join(
+                prefix + [six.text_type(item.get(key, ''))
+                          for key in scalar_keys]) + '\n')
+        for key in sorted(key for key in item if key not in scalar_key_set):
+            _format_text(item=item[key], stream=stream, identifier=key)
+
+
+def format_text_stream(items, stream, identifier=None, scalar_keys=None,
+                       lookahead=UNIX_LOOKAHEAD):
+    """
+    Format an iterable of items as format_text does a list of them under
+    ``identifier``, writing each item as it comes rather than once all of them
+    have been seen.
+
+    The scalar keys which make up the rows of dicts are ``scalar_keys``, if
+    given, or those found among the first ``lookahead`` items. When every item
+    is among those, the output is exactly that of format_text. A key which is
+    only seen as a scalar further on is written as non-scalars are, after the
+    row of its item.
+    """
+    items = iter(items)
+    window = list(itertools.islice(items, lookahead))
+    if scalar_keys is None and any(isinstance(el, dict) for el in window):
+        scalar_keys = _all_scalar_keys(window)
+
+    if scalar_keys is not None:
+        _format_dict_rows(itertools.chain(window, items), identifier,
+                          scalar_keys, stream)
+    elif any(isinstance(el, list) for el in window):
+        # scalars are written before any lists, so all items are needed
+        _format_list(window + list(items), identifier, stream)
+    elif identifier is not None:
+        for element in itertools.chain(window, items):
+            stream.write('%s\t%s\n' % (identifier.upper(), element))
+    else:
+        # a bare list is written on one line
+        separator = ''
+        for element in itertools.chain(window, items):
+            stream.write(separator + six.text_type(element))
+            separator = '\t'
+        if separator:
+            stream.write('\n')
+
+
 def unix_formatted_print(data):
-    format_text(data, sys.stdout)
-    try:
-        sys.stdout.flush()
-    except IOError as err:
-        if err.errno is errno.EPIPE:
-            pass
-        else:
-            raise
+    with OutputBuffer() as stream:
+        format_text(data, stream)
+
+
+def unix_formatted_print_stream(items, identifier=None, scalar_keys=None):
+    """
+    Print an iterable of items, such as a paginated listing, in UNIX format
+    as they come. See format_text_stream.
+    """
+    with OutputBuffer() as stream:
+        format_text_stream(items, stream, identifier=identifier,
+                           scalar_keys=scalar_keys)
 
 
 if __name__ == '__main__':
@@ -1,8 +1,7 @@
-import json
-
 from globus_sdk.base import safe_stringify
-from globus_cli.helpers import outformat_is_json
+from globus_cli.helpers import outformat_is_json, is_json_compact
 from globus_cli.safeio.write import safeprint
+from globus_cli.safeio.json_backend import json_text
 
 
 class PrintableErrorField(object):
@@ -42,11 +41,11 @@ def write_error_info(error_name, fields, message=None):
 
     if outformat_is_json():
         # dictify joined tuple lists and dump to json string
-        message = json.dumps(
+        message = json_text(
             dict(
                 [('error_name', error_name)] +
                 [(f.name, f.raw_value) for f in fields]),
-            indent=2, separators=(',', ': '), sort_keys=True)
+            compact=is_json_compact())
     if not message:
         message = u'A{0} {1} Occurred.\n{2}'.format(
             "n" if error_name[0] in "aeiouAEIOU" else "",
@@ -0,0 +1,96 @@
+"""
+Evaluation of JMESPath expressions over listings a few items at a time, so
+that output can start before the whole listing has been fetched, and without
+holding it all in memory.
+
+Expressions which project or filter the items of the listing, like
+`DATA[].task_id` or `DATA[?status=='ACTIVE'].[task_id, label]`, give the same
+results when applied to the items a chunk at a time as when applied to the
+whole list, and the results can be written out as they come.
+"""
+from jmespath.parser import ParsedResult
+
+from globus_cli.safeio.write import OutputBuffer
+from globus_cli.safeio.json_backend import json_list_item, json_list_end
+
+# the number of items an expression is applied to at once
+STREAM_CHUNK_SIZE = 100
+# the most streaming forms of expressions kept, by expression
+STREAM_PLAN_CACHE_SIZE = 32
+
+_IDENTITY = {'type': 'identity', 'children': []}
+_plan_cache = {}
+
+
+def _make_plan(expr, list_key):
+    node = expr.parsed
+    if node['type'] not in ('projection', 'filter_projection'):
+        return None
+
+    # the projection must be of the listing's items, which are replaced by the
+    # current node -- the chunk the expression is applied to
+    left = node['children'][0]
+    if left['type'] == 'flatten':
+        items = left['children'][0]
+        left = dict(left, children=[_IDENTITY])
+    else:
+        items = left
+        left = _IDENTITY
+    if items['type'] != 'field' or items['value'] != list_key:
+        return None
+
+    return ParsedResult(expr.expression,
+                        dict(node, children=[left] + node['children'][1:]))
+
+
+def streaming_plan(expr, list_key='DATA'):
+    """
+    Get an expression which, applied to a list of items of a listing, gives
+    the results of a compiled expression applied to the whole listing,
+    `{list_key: [...]}`, for those items. None if there's no such expression.
+
+    Plans are cached, by expression.
+    """
+    cache_key = (expr.expression, list_key)
+    if cache_key not in _plan_cache:
+        if len(_plan_cache) >= STREAM_PLAN_CACHE_SIZE:
+            _plan_cache.clear()
+        _plan_cache[cache_key] = _make_plan(expr, list_key)
+    return _plan_cache[cache_key]
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(getattr(item, 'data', item))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def streamed_results(plan, items, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Apply a streaming plan to an iterable of items, a chunk at a time, and
+    iterate over the results.
+    """
+    for chunk in _chunks(items, chunk_size):
+        for result in plan.search(chunk):
+            yield result
+
+
+def print_streamed_json(plan, items, chunk_size=STREAM_CHUNK_SIZE,
+                        compact=False):
+    """
+    Apply a streaming plan to an iterable of items, a chunk at a time, and
+    print the list of results as JSON, formatted just as the whole list would
+    have been.
+    """
+    count = 0
+    with OutputBuffer() as output:
+        output.write(u'[')
+        for result in streamed_results(plan, items, chunk_size):
+            output.write(json_list_item(result, count, compact=compact))
+            count += 1
+        output.write(json_list_end(count, compact=compact) + u'\n')
@@ -0,0 +1,119 @@
+"""
+Encoding and decoding of JSON, with an accelerated library where one is
+installed (currently `orjson`), and the standard library `json` otherwise.
+
+Output is the same with either: data which the accelerated library would
+encode differently -- non-ASCII text, which `json` escapes, floats, which it
+writes in other forms (`1e16` for `1e+16`, null for NaN), or values it
+doesn't support -- is encoded by `json` instead.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# the name of the library in use, for debugging
+BACKEND = 'json' if orjson is None else 'orjson'
+
+
+def _std_dumps(data, indent, sort_keys):
+    return json.dumps(data, indent=indent, sort_keys=sort_keys,
+                      separators=(',', ': ') if indent else (',', ':'))
+
+
+def _has_floats(data):
+    """
+    Check whether data contains any floats, in any of its lists or dicts.
+    """
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            return True
+        if isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def _fast_dumps(data, indent, sort_keys):
+    # orjson writes floats in its own forms, which json does not
+    if _has_floats(data):
+        return None
+    option = 0
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        encoded = orjson.dumps(data, option=option)
+    except TypeError:
+        # e.g. non-string keys, or integers too large for orjson
+        return None
+    # json escapes non-ASCII characters and DEL, which orjson does not
+    if not encoded.isascii() or b'\x7f' in encoded:
+        return None
+    return encoded.decode('ascii')
+
+
+def dumps(data, indent=2, sort_keys=True):
+    """
+    Encode data as JSON text, as `json.dumps` does with ``indent`` and
+    ``sort_keys``, and the separators used for output: `(',', ': ')` when
+    indented, and `(',', ':')` when not.
+    """
+    if orjson is not None and indent in (None, 2):
+        encoded = _fast_dumps(data, indent, sort_keys)
+        if encoded is not None:
+            return encoded
+    return _std_dumps(data, indent, sort_keys)
+
+
+def loads(text):
+    """
+    Decode JSON text, as `json.loads` does. Raises ValueError if the text is
+    not valid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except ValueError:
+            # json also accepts NaN and Infinity, and integers of any size
+            pass
+    return json.loads(text)
+
+
+def json_list_item(data, index, depth=0, compact=False):
+    """
+    Get the text of an item of a JSON list, nested `depth` levels deep in a
+    document, as it follows the `index` items before it. Lets lists be
+    printed an item at a time, formatted as the whole document would be.
+    """
+    separator = u',' if index else u''
+    if compact:
+        return separator + dumps(data, indent=None, sort_keys=False)
+    padding = u'\n' + u'  ' * (depth + 1)
+    return separator + padding + dumps(data).replace(u'\n', padding)
+
+
+def json_list_end(count, depth=0, compact=False):
+    """
+    Get the text which closes a JSON list of `count` items, printed with
+    `json_list_item`.
+    """
+    if compact or not count:
+        return u']'
+    return u'\n' + u'  ' * depth + u']'
+
+
+def json_text(data, compact=False):
+    """
+    Get the text of a JSON output document: indented, with keys sorted, or
+    with ``compact``, on one line, with keys in their original order.
+    """
+    if compact:
+        return dumps(data, indent=None, sort_keys=False)
+    return dumps(data)
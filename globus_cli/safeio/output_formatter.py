@@ -1,20 +1,26 @@
 from __future__ import unicode_literals
 
-import json
 import six
 import click
 
 from globus_sdk import GlobusResponse
 
-from globus_cli.safeio import safeprint
-from globus_cli.safeio.awscli_text import unix_formatted_print
+from globus_cli.safeio.write import safeprint, OutputBuffer
+from globus_cli.safeio.json_backend import (
+    json_text, json_list_item, json_list_end)
+from globus_cli.safeio.awscli_text import (
+    unix_formatted_print, unix_formatted_print_stream)
+from globus_cli.safeio.jmespath_stream import (
+    streaming_plan, streamed_results, print_streamed_json)
 from globus_cli.helpers import (
-    outformat_is_json, outformat_is_unix, get_jmespath_expression)
+    outformat_is_json, outformat_is_unix, outformat_is_csv, outformat_is_tsv,
+    get_jmespath_expression, is_json_compact, get_columns, select_fields)
 
 # make sure this is a tuple
 # if it's a list, pylint will freak out
 __all__ = (
     'formatted_print',
+    'iterable_response_to_dict',
 
     'FORMAT_SILENT',
     'FORMAT_JSON',
@@ -54,6 +60,26 @@ def _key_to_keyfunc(k):
     return k
 
 
+def iterable_response_to_dict(iterator):
+    """
+    A `json_converter` for listings, which collects an iterable of items (such
+    as a paginated response) into a `{'DATA': [...]}` document.
+
+    `formatted_print` recognizes it, and prints the items of the listing as
+    they are iterated, instead of collecting them first, where the output
+    format and any JMESPath expression allow it.
+    """
+    return {'DATA': list(_iter_data(iterator))}
+
+
+def _iter_data(iterator):
+    for item in iterator:
+        try:
+            yield item.data
+        except AttributeError:
+            yield item
+
+
 def _jmespath_preprocess(res):
     jmespath_expr = get_jmespath_expression()
 
@@ -69,14 +95,28 @@ def _jmespath_preprocess(res):
 
 def print_json_response(res):
     res = _jmespath_preprocess(res)
-    res = json.dumps(res, indent=2, separators=(',', ': '), sort_keys=True)
-    safeprint(res)
+    safeprint(json_text(res, compact=is_json_compact()))
 
 
-def print_unix_response(res):
-    res = _jmespath_preprocess(res)
+def print_streamed_listing_json(iterator, compact=False):
+    """
+    Print a listing as the JSON document `iterable_response_to_dict` would
+    collect it into, an item at a time.
+    """
+    count = 0
+    with OutputBuffer() as output:
+        output.write(u'{"DATA":[' if compact else u'{\n  "DATA": [')
+        for item in _iter_data(iterator):
+            output.write(json_list_item(item, count, depth=1,
+                                        compact=compact))
+            count += 1
+        output.write(json_list_end(count, depth=1, compact=compact) +
+                     (u'}\n' if compact else u'\n}\n'))
+
+
+def _unix_print_or_exit(printer, *args, **kwargs):
     try:
-        unix_formatted_print(res)
+        printer(*args, **kwargs)
     # Attr errors indicate that we got data which cannot be unix formatted
     # likely a scalar + non-scalar in an array, though there may be other cases
     # print good error and exit(2) (Count this as UsageError!)
@@ -93,12 +133,37 @@ def print_unix_response(res):
         click.get_current_context().exit(2)
 
 
+def print_unix_response(res):
+    res = _jmespath_preprocess(res)
+    _unix_print_or_exit(unix_formatted_print, res)
+
+
+def print_streamed_unix(iterator):
+    """
+    Print a listing, as `iterable_response_to_dict` would collect it, in UNIX
+    format as its items are iterated. A JMESPath expression is applied to the
+    items as they come when it can be, and otherwise to the whole listing.
+    """
+    jmespath_expr = get_jmespath_expression()
+    if jmespath_expr is None:
+        _unix_print_or_exit(unix_formatted_print_stream,
+                            _iter_data(iterator), identifier='DATA')
+        return
+    plan = streaming_plan(jmespath_expr)
+    if plan is None:
+        print_unix_response(iterable_response_to_dict(iterator))
+    else:
+        _unix_print_or_exit(unix_formatted_print_stream,
+                            streamed_results(plan, iterator))
+
+
 def colon_formatted_print(data, named_fields):
     maxlen = max(len(n) for n, f in named_fields) + 1
-    for name, field in named_fields:
-        field_keyfunc = _key_to_keyfunc(field)
-        safeprint(u'{} {}'.format((name + u':').ljust(maxlen),
-                                  field_keyfunc(data)))
+    with OutputBuffer() as output:
+        for name, field in named_fields:
+            field_keyfunc = _key_to_keyfunc(field)
+            output.echo(u'{} {}'.format((name + u':').ljust(maxlen),
+                                        field_keyfunc(data)))
 
 
 def print_table(iterable, headers_and_keys, print_headers=True):
@@ -141,13 +206,41 @@ def print_table(iterable, headers_and_keys, print_headers=True):
             return 'NULL'
         return val
 
-    # print headers
-    if print_headers:
-        safeprint(format_str.format(*[h for h in headers]))
-        safeprint(format_str.format(*['-'*w for w in widths]))
-    # print the rows of data
-    for i in iterable:
-        safeprint(format_str.format(*[none_to_null(kf(i)) for kf in keyfuncs]))
+    with OutputBuffer() as output:
+        # print headers
+        if print_headers:
+            output.echo(format_str.format(*[h for h in headers]))
+            output.echo(format_str.format(*['-'*w for w in widths]))
+        # print the rows of data
+        for i in iterable:
+            output.echo(format_str.format(
+                *[none_to_null(kf(i)) for kf in keyfuncs]))
+
+
+def _delimited_cell(value, delimiter):
+    if value is None:
+        return u''
+    value = six.text_type(value)
+    # quote as the csv module does, doubling any quote characters
+    if (delimiter in value or u'"' in value or u'\n' in value or
+            u'\r' in value):
+        return u'"' + value.replace(u'"', u'""') + u'"'
+    return value
+
+
+def print_delimited(iterable, headers_and_keys, delimiter=u','):
+    """
+    Print an iterable as CSV (or TSV, with a tab delimiter), with a header row
+    of column names, a row at a time. Values containing the delimiter, quotes,
+    or line breaks are quoted, and None is printed as an empty value.
+    """
+    keyfuncs = [_key_to_keyfunc(key) for _, key in headers_and_keys]
+    with OutputBuffer() as output:
+        output.echo(delimiter.join(_delimited_cell(header, delimiter)
+                                   for header, _ in headers_and_keys))
+        for item in iterable:
+            output.echo(delimiter.join(_delimited_cell(kf(item), delimiter)
+                                       for kf in keyfuncs))
 
 
 def formatted_print(response_data,
@@ -179,13 +272,15 @@ def formatted_print(response_data,
     (json/unix output only)
 
     ``fields`` is an iterable of (fieldname, keyfunc) tuples. When keyfunc is
-    a string, it is implicitly converted to `lambda x: x[keyfunc]` (text output
-    only)
+    a string, it is implicitly converted to `lambda x: x[keyfunc]` (text, csv,
+    and tsv output only). CSV and TSV output are of these fields -- a row for
+    each item, or a single row when ``text_format`` is FORMAT_TEXT_RECORD. With
+    no fields, they fall back to JSON output
 
     ``response_key`` is a key into the data to print. When used with table
     printing, it must get an iterable out, and when used with raw printing, it
-    gets a string. Necessary for certain formats like text table (text output
-    only)
+    gets a string. Necessary for certain formats like text table (text, csv,
+    and tsv output only)
     """
     def _assert_fields():
         if fields is None:
@@ -194,13 +289,39 @@ def formatted_print(response_data,
                 'You can workaround this error by using `--format JSON`')
 
     def _print_as_json():
+        # print listings as they are iterated, through JMESPath expressions
+        # where possible
+        if json_converter is iterable_response_to_dict:
+            jmespath_expr = get_jmespath_expression()
+            if jmespath_expr is None:
+                print_streamed_listing_json(response_data,
+                                            compact=is_json_compact())
+                return
+            plan = streaming_plan(jmespath_expr)
+            if plan is not None:
+                print_streamed_json(plan, response_data,
+                                    compact=is_json_compact())
+                return
         print_json_response(json_converter(response_data)
                             if json_converter else response_data)
 
     def _print_as_unix():
+        # print listings as they are iterated
+        if json_converter is iterable_response_to_dict:
+            print_streamed_unix(response_data)
+            return
         print_unix_response(json_converter(response_data)
                             if json_converter else response_data)
 
+    def _print_as_delimited(delimiter):
+        data = (response_data
+                if response_key is None else
+                response_data[response_key])
+        if text_format == FORMAT_TEXT_RECORD:
+            data = [data]
+        print_delimited(data, select_fields(fields, get_columns()),
+                        delimiter=delimiter)
+
     def _print_as_text():
         # if we're given simple text, print that and exit
         if simple_text is not None:
@@ -239,8 +360,12 @@ def formatted_print(response_data,
         _custom_text_formatter = text_format
         text_format = FORMAT_TEXT_CUSTOM
 
-    if outformat_is_json():
+    # csv and tsv need fields, and other output is given as json
+    delimited = outformat_is_csv() or outformat_is_tsv()
+    if outformat_is_json() or (delimited and fields is None):
         _print_as_json()
+    elif delimited:
+        _print_as_delimited(u',' if outformat_is_csv() else u'\t')
     elif outformat_is_unix():
         _print_as_unix()
     else:
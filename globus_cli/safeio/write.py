@@ -1,5 +1,11 @@
 import errno
 import click
+import six
+
+from globus_cli.safeio.check_pty import out_is_terminal, err_is_terminal
+
+# the most text an OutputBuffer holds before writing it out
+OUTPUT_BUFFER_SIZE = 64 * 1024
 
 
 def safeprint(message, write_to_stderr=False, newline=True):
@@ -15,3 +21,84 @@ def safeprint(message, write_to_stderr=False, newline=True):
             pass
         else:
             raise
+
+
+class OutputBuffer(object):
+    """
+    A sink for output of many lines, which collects them and writes them out
+    with one call to `safeprint` per batch, rather than one per line. Encoding
+    and a closed pipe are handled just as `safeprint` handles them.
+
+    Text is written out once ``buffer_size`` characters are held, and when the
+    buffer is flushed or closed. On a terminal, each line is instead written
+    out as soon as it is complete, so that it is seen as it is produced, but
+    never part of one.
+
+    Use it as a context manager, to write out whatever is held at the end:
+
+    >>> with OutputBuffer() as output:
+    >>>     for line in lines:
+    >>>         output.echo(line)
+    """
+    def __init__(self, write_to_stderr=False, buffer_size=OUTPUT_BUFFER_SIZE):
+        self.write_to_stderr = write_to_stderr
+        self.buffer_size = buffer_size
+        self.line_buffered = (err_is_terminal() if write_to_stderr else
+                              out_is_terminal())
+        self.parts = []
+        self.size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, text):
+        """
+        Write text, as a file would.
+        """
+        self.parts.append(text)
+        self.size += len(text)
+        if self.line_buffered:
+            if u'\n' in text:
+                self.flush(whole_lines=True)
+        elif self.size >= self.buffer_size:
+            self.flush()
+
+    def echo(self, message, newline=True):
+        """
+        Write a message, as `safeprint` would.
+        """
+        if isinstance(message, six.binary_type):
+            # bytes are written out as they are, unbuffered
+            self.flush()
+            safeprint(message, write_to_stderr=self.write_to_stderr,
+                      newline=newline)
+            return
+        if message is None:
+            message = u''
+        elif not isinstance(message, six.text_type):
+            message = six.text_type(message)
+        self.write(message + u'\n' if newline else message)
+
+    def flush(self, whole_lines=False):
+        """
+        Write out the text held, or with ``whole_lines``, all of it up to the
+        end of the last complete line.
+        """
+        text = u''.join(self.parts)
+        del self.parts[:]
+        self.size = 0
+        if whole_lines:
+            end = text.rfind(u'\n') + 1
+            text, rest = text[:end], text[end:]
+            if rest:
+                self.parts.append(rest)
+                self.size = len(rest)
+        if text:
+            safeprint(text, write_to_stderr=self.write_to_stderr,
+                      newline=False)
+
+    def close(self):
+        self.flush()
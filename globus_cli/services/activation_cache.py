@@ -0,0 +1,139 @@
+"""
+A cache of endpoint activation state, kept on disk so that a series of CLI
+commands against the same endpoints doesn't autoactivate on every invocation.
+
+Entries are keyed by endpoint and by identity -- a hash of the Transfer refresh
+token, so that they don't carry over between logins or environments -- and
+hold the time at which the activation expires.
+"""
+import errno
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from globus_cli.config import TRANSFER_RT_OPTNAME, lookup_option
+
+logger = logging.getLogger(__name__)
+
+# autoactivation is skipped while a cached activation has at least this many
+# seconds left
+CACHE_MARGIN = 600
+# no entry is trusted for longer than this, however long the activation lasts,
+# in case the endpoint is deactivated out from under us
+CACHE_MAX_AGE = 3600
+
+
+def _cache_path():
+    return os.path.expanduser('~/.globus/cli/activation_cache.json')
+
+
+def _entry_prefix():
+    token = lookup_option(TRANSFER_RT_OPTNAME)
+    if not token:
+        return None
+    return hashlib.sha256(token.encode('utf-8')).hexdigest() + ':'
+
+
+def _load():
+    try:
+        with open(_cache_path()) as f:
+            cache = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _store(cache):
+    """
+    Atomically replace the cache file. Failures are logged and ignored -- the
+    cache is only an optimization.
+
+    The cache is read, updated and stored without any lock, so when commands
+    update it at once, the last to store it wins, and the others' entries are
+    lost. That only costs them an autoactivation the next time.
+    """
+    path = _cache_path()
+    dirname = os.path.dirname(path)
+    # unique to this thread, so that concurrent writers don't share it
+    tmp_path = '{}.{}-{}.tmp'.format(path, os.getpid(),
+                                     threading.current_thread().ident)
+    try:
+        try:
+            os.makedirs(dirname, 0o700)
+        except OSError as err:
+            if err.errno != errno.EEXIST:
+                raise
+        # deny rwx to Group and World, as with the config file, without
+        # changing the umask of the whole process
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cache, f)
+        # rename() can't replace an existing file on Windows
+        if os.name == 'nt' and os.path.exists(path):
+            os.remove(path)
+        os.rename(tmp_path, path)
+    except (IOError, OSError) as err:
+        logger.debug('could not write activation cache: {}'.format(err))
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def activation_is_cached(endpoint_id):
+    """
+    True if the endpoint is known to be activated, comfortably beyond any
+    `if_expires_in` threshold used by the CLI.
+    """
+    prefix = _entry_prefix()
+    if prefix is None:
+        return False
+    expires_at = _load().get(prefix + str(endpoint_id))
+    if not isinstance(expires_at, (int, float)):
+        return False
+    return expires_at - time.time() > CACHE_MARGIN
+
+
+def cache_activation(endpoint_id, res):
+    """
+    Record the result of a successful autoactivation.
+    """
+    prefix = _entry_prefix()
+    expires_in = res.get('expires_in')
+    if (prefix is None or res['code'] == 'AutoActivationFailed' or
+            expires_in is None):
+        return
+
+    # an expires_in of -1 means the activation never expires
+    if expires_in < 0 or expires_in > CACHE_MAX_AGE:
+        expires_in = CACHE_MAX_AGE
+
+    now = time.time()
+    cache = dict((key, value) for key, value in _load().items()
+                 if isinstance(value, (int, float)) and value > now)
+    cache[prefix + str(endpoint_id)] = now + expires_in
+    _store(cache)
+
+
+def invalidate_activation(endpoint_id=None):
+    """
+    Drop the cached activation of an endpoint, or of every endpoint if none
+    is given.
+    """
+    prefix = _entry_prefix()
+    if prefix is None:
+        return
+
+    cache = _load()
+    if endpoint_id is None:
+        remaining = dict((key, value) for key, value in cache.items()
+                         if not key.startswith(prefix))
+    else:
+        remaining = dict(cache)
+        remaining.pop(prefix + str(endpoint_id), None)
+
+    if remaining != cache:
+        _store(remaining)
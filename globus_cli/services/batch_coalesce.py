@@ -0,0 +1,135 @@
+import logging
+import posixpath
+from collections import OrderedDict
+
+from globus_sdk import TransferAPIError
+
+logger = logging.getLogger(__name__)
+
+
+class _PathNode(object):
+    """
+    A node in a trie of source paths. ``items`` are the batch items whose
+    source path is exactly this node's path.
+    """
+    __slots__ = ('children', 'items')
+
+    def __init__(self):
+        self.children = OrderedDict()
+        self.items = []
+
+
+def _build_trie(items):
+    root = _PathNode()
+    for item in items:
+        node = root
+        path = item[0].rstrip('/')
+        for name in (path.split('/') if path else ['']):
+            node = node.children.setdefault(name, _PathNode())
+        node.items.append(item)
+    return root
+
+
+def _covered_dest_dir(name, node, entry_type):
+    """
+    If ``node`` has exactly one batch item which transfers the whole of
+    the listing entry ``name`` (of type ``entry_type``), return the
+    destination directory it places it in. Otherwise, return None.
+    """
+    if node.children or len(node.items) != 1:
+        return None
+    source_path, dest_path, recursive = node.items[0]
+    if entry_type == 'dir' and not recursive:
+        return None
+    if entry_type == 'file' and recursive:
+        return None
+    if entry_type not in ('dir', 'file'):
+        return None
+    dest_dir, dest_name = posixpath.split(dest_path.rstrip('/'))
+    if dest_name != name:
+        return None
+    return dest_dir
+
+
+class _Coalescer(object):
+
+    def __init__(self, client, endpoint_id):
+        self.client = client
+        self.endpoint_id = endpoint_id
+        self.listings = {}
+
+    def list_dir(self, path):
+        """
+        Fetch the names and types of all entries in a source directory, or
+        None if it can't be listed. Listings are cached for the run.
+        """
+        if path not in self.listings:
+            try:
+                res = self.client.operation_ls(
+                    self.endpoint_id, path=path, show_hidden=1)
+                self.listings[path] = dict(
+                    (entry['name'], entry['type']) for entry in res)
+            except TransferAPIError as err:
+                logger.debug('coalesce: cannot list {}: {}'
+                             .format(path, err.code))
+                self.listings[path] = None
+        return self.listings[path]
+
+    def visit(self, path, node):
+        """
+        Coalesce the subtree at ``node`` bottom-up. A directory is replaced
+        with a single recursive item when every one of its entries is
+        transferred, whole, into the same destination directory.
+        """
+        for name, child in node.children.items():
+            self.visit(posixpath.join(path, name) if path else name or '/',
+                       child)
+
+        # only directories with several items are worth a listing call
+        if node.items or len(node.children) < 2 or not path:
+            return
+
+        if any(child.children or len(child.items) != 1
+               for child in node.children.values()):
+            return
+
+        listing = self.list_dir(path)
+        if listing is None or set(listing) != set(node.children):
+            return
+
+        dest_dirs = set(
+            _covered_dest_dir(name, child, listing[name])
+            for name, child in node.children.items())
+        if len(dest_dirs) != 1 or None in dest_dirs:
+            return
+
+        logger.debug('coalesce: {} is fully covered'.format(path))
+        node.items.append((path, dest_dirs.pop(), True))
+        node.children = OrderedDict()
+
+
+def _walk_items(node):
+    for item in node.items:
+        yield item
+    for child in node.children.values():
+        for item in _walk_items(child):
+            yield item
+
+
+def coalesce_transfer_items(client, endpoint_id, items):
+    """
+    Given a list of (source_path, dest_path, recursive) transfer items, remove
+    exact duplicates and replace every source directory which the batch
+    transfers in its entirety -- each entry listed individually, into the same
+    destination directory -- with a single recursive item.
+
+    Directories are checked against listings of ``endpoint_id``, the source
+    endpoint. Returns the new list of items.
+    """
+    # drop duplicates, keeping the first occurrence of each item
+    unique = list(OrderedDict((item, None) for item in items))
+
+    root = _build_trie(unique)
+    # an absolute path splits into a leading '' component, which is the root
+    _Coalescer(client, endpoint_id).visit('', root)
+    return list(_walk_items(root))
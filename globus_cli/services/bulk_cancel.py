@@ -0,0 +1,123 @@
+import logging
+import sys
+import threading
+import time
+
+from six import reraise
+from six.moves import queue
+
+from globus_sdk.exc import GlobusAPIError, NetworkError
+
+from globus_cli.services.transfer import get_client
+
+logger = logging.getLogger(__name__)
+
+# number of threads cancelling tasks concurrently
+CANCEL_WORKERS = 8
+# the most cancellation requests started per second, across all workers
+CANCEL_MAX_RATE = 20
+# sentinel which tells a worker thread to stop
+_STOP = object()
+
+
+class RateLimiter(object):
+    """
+    Spaces out calls to `wait` so that, across all threads, no more than
+    `max_rate` of them return per second.
+    """
+    def __init__(self, max_rate):
+        self.interval = 1.0 / max_rate
+        self.next_time = 0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.time()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _cancel_one(client, task_id):
+    """
+    Cancel a task, returning the result as a dict with its task_id. API and
+    network errors are returned as results too, with an `error` key, so that
+    one failed cancellation doesn't stop the rest.
+    """
+    try:
+        result = dict(client.cancel_task(task_id).data)
+    except GlobusAPIError as err:
+        logger.debug('cancellation of {} failed'.format(task_id))
+        return {'task_id': task_id, 'error': True, 'code': err.code,
+                'message': err.message, 'http_status': err.http_status}
+    except NetworkError as err:
+        logger.debug('cancellation of {} failed'.format(task_id))
+        return {'task_id': task_id, 'error': True,
+                'code': err.__class__.__name__, 'message': str(err)}
+    result['task_id'] = task_id
+    result['error'] = False
+    return result
+
+
+def cancel_tasks(task_ids, client_factory=get_client,
+                 workers=CANCEL_WORKERS, max_rate=CANCEL_MAX_RATE):
+    """
+    Cancel many tasks concurrently, with a bounded pool of worker threads,
+    each with a client of its own, and a limit on the rate of requests.
+
+    Returns a list of result dicts (see ``_cancel_one``), in the order of
+    ``task_ids``, once every cancellation has completed. Any unexpected error
+    in a worker is raised instead.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return []
+
+    todo = queue.Queue()
+    for index, task_id in enumerate(task_ids):
+        todo.put((index, task_id))
+    done = queue.Queue()
+    limiter = RateLimiter(max_rate)
+    failed = threading.Event()
+
+    def worker():
+        try:
+            client = client_factory()
+            while not failed.is_set():
+                try:
+                    index, task_id = todo.get_nowait()
+                except queue.Empty:
+                    return
+                limiter.wait()
+                done.put((index, _cancel_one(client, task_id)))
+        except Exception:
+            failed.set()
+            done.put((None, sys.exc_info()))
+        finally:
+            done.put(_STOP)
+
+    num_workers = min(workers, len(task_ids))
+    for _ in range(num_workers):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+
+    # results complete in no particular order, so they're collected, and
+    # sorted back into the order of the tasks given
+    results = []
+    errors = []
+    running = num_workers
+    while running:
+        result = done.get()
+        if result is _STOP:
+            running -= 1
+        elif result[0] is None:
+            errors.append(result[1])
+        else:
+            results.append(result)
+
+    if errors:
+        reraise(*errors[0])
+    results.sort(key=lambda x: x[0])
+    return [result for _, result in results]
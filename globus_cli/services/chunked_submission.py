@@ -0,0 +1,292 @@
+import copy
+import json
+import logging
+import sys
+import threading
+
+import click
+from six import reraise
+from six.moves import queue
+
+from globus_cli.safeio import formatted_print
+from globus_cli.services.transfer import get_client
+
+logger = logging.getLogger(__name__)
+
+# number of threads submitting chunks concurrently
+SUBMISSION_WORKERS = 4
+# sentinel which tells a worker thread to stop
+_STOP = object()
+
+
+class ChunkedTaskSubmitter(object):
+    """
+    Splits the items of a TransferData or DeleteData document across several
+    tasks, each no larger than the given item count and (approximate) payload
+    size, and submits them.
+
+    Items are added with `add_item`, which takes the same arguments as the
+    `add_item` method of the underlying document. As each chunk fills up, it
+    is handed off to a pool of worker threads for submission, so chunks are
+    submitted concurrently with one another and while later items are still
+    being added.
+
+    The first chunk uses the submission ID of the given document. Every other
+    chunk gets its own submission ID, fetched as it is handed off, unless
+    ``submission_ids`` are given -- the IDs of the chunks of an earlier
+    submission of the same input, so that resubmitting it is safe.
+    """
+    def __init__(self, document, max_items=None, max_payload_bytes=None,
+                 dry_run=False, client_factory=get_client,
+                 workers=SUBMISSION_WORKERS, before_submit=None,
+                 submission_ids=None):
+        """
+        **Parameters**
+          ``document``
+            A ``TransferData`` or ``DeleteData`` with no items. It is used as
+            the template for every chunk.
+          ``max_items``
+            The maximum number of items per task, or None for no limit
+          ``max_payload_bytes``
+            The maximum size of the JSON document for each task, or None for
+            no limit
+          ``dry_run``
+            If True, build the chunks but don't submit them
+          ``client_factory``
+            Callable which returns a ``TransferClient``. Each worker thread
+            gets a client of its own.
+          ``before_submit``
+            Callable run once, in the calling thread, before the first chunk
+            is submitted -- e.g. to wait for endpoint activation
+          ``submission_ids``
+            Submission IDs for the chunks, in order. Chunks beyond them get
+            new IDs.
+        """
+        self.template = document
+        self.max_items = max_items
+        self.max_payload_bytes = max_payload_bytes
+        self.dry_run = dry_run
+        self.client_factory = client_factory
+        self.num_workers = workers
+        self.before_submit = before_submit
+        self.submission_ids = list(submission_ids or ())
+        self.client = None
+
+        if document['DATA_TYPE'] == 'transfer':
+            self.submit_method = 'submit_transfer'
+        else:
+            self.submit_method = 'submit_delete'
+
+        # the size of a chunk's document, not counting its items
+        self.base_bytes = len(json.dumps(document))
+
+        # chunks which have been built (dry-run only), every chunk handed off
+        # for submission, and the results of those which were submitted
+        self.chunks = []
+        self.manifest = []
+        self.results = []
+        self.errors = []
+
+        self.chunk_count = 0
+        self.current = None
+        self.current_bytes = 0
+        self._new_chunk()
+
+        self.queue = queue.Queue(maxsize=2 * workers)
+        self.lock = threading.Lock()
+        self.threads = []
+
+    def _new_chunk(self):
+        if self.chunk_count == 0:
+            self.current = self.template
+        else:
+            self.current = copy.copy(self.template)
+            self.current['DATA'] = []
+            # set when the chunk is handed off
+            self.current['submission_id'] = None
+        self.current_bytes = self.base_bytes
+        self.chunk_count += 1
+
+    def _is_full(self, item_bytes):
+        num_items = len(self.current['DATA'])
+        if self.max_items is not None and num_items > self.max_items:
+            return True
+        # a single item larger than the limit still goes out, alone
+        if (self.max_payload_bytes is not None and num_items > 1 and
+                self.current_bytes + item_bytes > self.max_payload_bytes):
+            return True
+        return False
+
+    def add_item(self, *args, **kwargs):
+        self.current.add_item(*args, **kwargs)
+
+        item_bytes = 0
+        if self.max_payload_bytes is not None:
+            # allow for the separator between items
+            item_bytes = len(json.dumps(self.current['DATA'][-1])) + 2
+
+        if self._is_full(item_bytes):
+            item = self.current['DATA'].pop()
+            self._flush()
+            self.current['DATA'].append(item)
+
+        self.current_bytes += item_bytes
+
+    def _flush(self):
+        chunk = (self.chunk_count, self.current)
+        self._new_chunk()
+
+        if self.dry_run:
+            self.chunks.append(chunk)
+            return
+
+        # every chunk gets its ID before it is handed off, so that the IDs of
+        # all chunks which may have been submitted are known if any fail
+        index, document = chunk
+        if index <= len(self.submission_ids):
+            document['submission_id'] = self.submission_ids[index - 1]
+        elif document['submission_id'] is None:
+            if self.client is None:
+                self.client = self.client_factory()
+            document['submission_id'] = (
+                self.client.get_submission_id()['value'])
+        self.manifest.append({
+            'chunk': index,
+            'task_id': None,
+            'submission_id': document['submission_id'],
+            'item_count': len(document['DATA']),
+        })
+
+        if not self.threads:
+            if self.before_submit is not None:
+                self.before_submit()
+            for _ in range(self.num_workers):
+                thread = threading.Thread(target=self._worker)
+                thread.daemon = True
+                thread.start()
+                self.threads.append(thread)
+        self.queue.put(chunk)
+
+    def _worker(self):
+        client = self.client_factory()
+        while True:
+            chunk = self.queue.get()
+            if chunk is _STOP:
+                return
+            index, document = chunk
+
+            # once any chunk fails, don't submit any more
+            if self.errors:
+                continue
+
+            try:
+                res = getattr(client, self.submit_method)(document)
+            except Exception:
+                logger.debug('submission of chunk {} failed'.format(index))
+                with self.lock:
+                    self.errors.append(sys.exc_info())
+                continue
+
+            with self.lock:
+                result = self.manifest[index - 1]
+                result.update(task_id=res['task_id'], message=res['message'])
+                self.results.append(result)
+
+    def finish(self, complete=True):
+        """
+        Submit the final chunk and wait for all submissions to complete.
+
+        Returns the results of every submission, in chunk order. If any
+        submission failed, the first error is raised instead -- results are
+        still available on ``self.results``, and every chunk handed off for
+        submission, submitted or not, on ``self.manifest``.
+
+        Without ``complete``, the final chunk is dropped rather than
+        submitted, for when the input can't be read to the end.
+        """
+        # always send the last chunk, even if it is empty and the only one, so
+        # that the service rejects an empty submission as it normally would
+        if complete and (self.current['DATA'] or self.chunk_count == 1):
+            self._flush()
+
+        for _ in self.threads:
+            self.queue.put(_STOP)
+        for thread in self.threads:
+            thread.join()
+
+        self.chunks.sort(key=lambda x: x[0])
+        self.results.sort(key=lambda x: x['chunk'])
+        if self.errors:
+            reraise(*self.errors[0])
+        return self.results
+
+
+def read_submission_ids(submission_ids_file, submission_id, chunked):
+    """
+    Read the submission IDs given with `--submission-ids-file`, one per line,
+    checking that it was given with the options it needs, and not with those
+    it conflicts with. Returns None if it wasn't given.
+    """
+    if submission_ids_file is None:
+        return None
+    if not chunked:
+        raise click.UsageError(
+            '--submission-ids-file can only be used with '
+            '--max-items-per-task or --max-payload-bytes')
+    if submission_id is not None:
+        raise click.UsageError(
+            '--submission-id and --submission-ids-file are mutually '
+            'exclusive')
+    return [line.strip() for line in submission_ids_file if line.strip()]
+
+
+# fields of the manifest of submitted tasks
+MANIFEST_FIELDS = (('Task ID', 'task_id'), ('Submission ID', 'submission_id'),
+                   ('Items', 'item_count'))
+
+
+def finish_chunked_submission(submitter, item_fields):
+    """
+    Finish a chunked submission and print the results: a manifest of every
+    submitted task or, for a dry-run, the items of every chunk.
+
+    ``item_fields`` are the fields used to print items in a dry-run. If any
+    submission fails, the manifest of those which succeeded is printed before
+    the error is raised, with the submission IDs of those which failed.
+    """
+    if submitter.dry_run:
+        submitter.finish()
+        formatted_print(
+            {'DATA': [dict(item, task=index)
+                      for index, document in submitter.chunks
+                      for item in document['DATA']]},
+            response_key='DATA', fields=(('Task', 'task'),) + item_fields,
+            json_converter=lambda res: {
+                'DATA': [document for _, document in submitter.chunks]})
+        return
+
+    try:
+        submitter.finish()
+    except Exception:
+        formatted_print({'DATA': submitter.manifest},
+                        response_key='DATA', fields=MANIFEST_FIELDS)
+        raise
+
+    formatted_print({'DATA': submitter.results},
+                    response_key='DATA', fields=MANIFEST_FIELDS)
+
+
+def abort_chunked_submission(submitter):
+    """
+    Stop a chunked submission whose input couldn't be read to the end: wait
+    for the chunks already handed off to be submitted, and print the manifest
+    of them, without submitting the rest. The caller raises its own error.
+    """
+    try:
+        submitter.finish(complete=False)
+    except Exception:
+        # the chunks which failed are in the manifest, without task IDs
+        logger.debug('submission of chunks failed', exc_info=True)
+    if submitter.manifest:
+        formatted_print({'DATA': submitter.manifest},
+                        response_key='DATA', fields=MANIFEST_FIELDS)
@@ -0,0 +1,134 @@
+"""
+Selection of directory listing entries, on the client and, where it can be
+expressed as an operation_ls "filter", by the service.
+"""
+import fnmatch
+import re
+from datetime import datetime, timedelta
+
+# characters of glob patterns which filter patterns don't support, or which
+# separate clauses and values in filters
+_UNFILTERABLE_GLOB_CHARS = frozenset('?[]/,')
+# the format of "last_modified" times, less the UTC offset (always +00:00)
+_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def glob_matcher(globs):
+    """
+    Get a function which checks whether a name matches any of the given glob
+    patterns, as `fnmatch.fnmatchcase` would, or None if there are none.
+    """
+    if not globs:
+        return None
+    return re.compile(u'|'.join(u'(?:{})'.format(fnmatch.translate(glob))
+                                for glob in globs)).match
+
+
+def glob_filter(globs):
+    """
+    Get an operation_ls "filter" clause which selects just the names matching
+    the given glob patterns, or None if there is no such clause. Filter
+    patterns only support the `*` wildcard, and only one is given here.
+    """
+    if len(globs) != 1 or _UNFILTERABLE_GLOB_CHARS.intersection(globs[0]):
+        return None
+    return u'name:~' + globs[0]
+
+
+class EntryFilter(object):
+    """
+    A selection of listing entries matching all of: a glob pattern of names;
+    a type, "file", "dir", or "link" for symlinks; and comparisons of sizes,
+    and of ages in days, as (operator, number, unit) tuples with operators
+    ">", "<", or "=", and units in bytes or days. Any of these may be None, to
+    match everything.
+
+    Both are compared as find(1) compares them: sizes in the unit, rounded
+    up, and ages in whole days, rounded down, from ``now``.
+
+    ``clauses`` are operation_ls "filter" clauses which select the entries
+    as nearly as filters can. Entries selected by them must still be checked
+    with ``matches``. They are ``selective`` if they compare sizes or times,
+    which usually leaves out most entries, unlike names and types.
+    """
+    def __init__(self, name=None, entry_type=None, size=None, age=None,
+                 now=None):
+        self.match_name = glob_matcher((name,)) if name else None
+        self.entry_type = entry_type
+
+        # sizes are converted to the sizes in bytes that entries are larger
+        # than, and at most: N units, rounded up, is more than N - 1 units,
+        # and at most N
+        self.size_above = self.size_at_most = None
+        if size is not None:
+            op, count, unit = size
+            if op in '>=':
+                self.size_above = (count - (op == '=')) * unit
+            if op in '<=':
+                self.size_at_most = (count - (op == '<')) * unit
+
+        # ages are converted to the times that entries were last modified
+        # after, and at or before, as text, which compares just like the
+        # times themselves
+        self.modified_after = self.modified_before = None
+        if age is not None:
+            op, days, unit = age
+            days *= unit
+            now = now or datetime.utcnow()
+
+            def days_ago(days):
+                return (now - timedelta(days=days)).strftime(_TIME_FORMAT)
+            if op in '<=':
+                self.modified_after = days_ago(days + (op == '='))
+            if op in '>=':
+                self.modified_before = days_ago(days + (op == '>'))
+
+        self.clauses = []
+        if name:
+            name_filter = glob_filter((name,))
+            if name_filter:
+                self.clauses.append(name_filter)
+        if entry_type in ('file', 'dir'):
+            self.clauses.append(u'type:' + entry_type)
+        # only one bound on sizes and times is given, as only one clause can
+        # be given for each field, and no bound which no size can meet
+        if (self.size_above is not None and
+                self.size_at_most == self.size_above + 1):
+            self.clauses.append(u'size:={}'.format(self.size_at_most))
+        elif self.size_above is not None and self.size_above >= 0:
+            self.clauses.append(u'size:>{}'.format(self.size_above))
+        elif self.size_at_most is not None and self.size_at_most >= 0:
+            self.clauses.append(u'size:<={}'.format(self.size_at_most))
+        if self.modified_after:
+            self.clauses.append(u'last_modified:>' + self.modified_after)
+        elif self.modified_before:
+            self.clauses.append(u'last_modified:<=' + self.modified_before)
+        self.selective = any(clause.startswith((u'size:', u'last_modified:'))
+                             for clause in self.clauses)
+
+    def matches(self, item):
+        """
+        Check whether an entry, with its name relative to its directory, is
+        selected.
+        """
+        if self.match_name and not self.match_name(item["name"]):
+            return False
+        if self.entry_type == "link":
+            if (item.get("link_target") is None and
+                    item["type"] != "invalid_symlink"):
+                return False
+        elif self.entry_type and item["type"] != self.entry_type:
+            return False
+        if self.size_above is not None and item["size"] <= self.size_above:
+            return False
+        if (self.size_at_most is not None and
+                item["size"] > self.size_at_most):
+            return False
+        if self.modified_after or self.modified_before:
+            # less its UTC offset
+            modified = item["last_modified"][:19]
+            if self.modified_after and modified <= self.modified_after:
+                return False
+            if self.modified_before and modified > self.modified_before:
+                return False
+        return True
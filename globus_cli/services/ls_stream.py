@@ -0,0 +1,250 @@
+"""
+Streaming decoding of operation_ls responses.
+
+A page of a large directory listing, decoded all at once, is a dict of
+thousands of dicts, held until the last of them has been printed. Instead,
+entries are decoded one at a time as the HTTP response body is read, and kept
+as compact `LsEntry` records rather than dicts.
+"""
+import codecs
+import json
+import re
+
+import requests
+import six
+from globus_sdk import exc
+
+# the most bytes of a response body read at once
+LS_READ_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_ITEM_END = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+# layouts, by the keys of the entries which share them
+_layouts = {}
+
+
+class _Layout(object):
+    """
+    The keys of an entry, and their positions, shared by every entry with the
+    same keys in the same order.
+    """
+    __slots__ = ('keys', 'index')
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.index = dict((key, i) for i, key in enumerate(keys))
+
+
+def _get_layout(keys):
+    layout = _layouts.get(keys)
+    if layout is None:
+        layout = _layouts[keys] = _Layout(keys)
+    return layout
+
+
+class LsEntry(object):
+    """
+    An entry of a directory listing: its values, and a layout of its keys
+    shared with other entries. Looked up like a dict, and like a
+    `GlobusResponse`, with the (new) dict of its keys and values as ``data``.
+    """
+    __slots__ = ('_layout', '_values')
+
+    def __init__(self, data):
+        self._layout = _get_layout(tuple(data))
+        self._values = tuple(data.values())
+
+    @property
+    def data(self):
+        return dict(zip(self._layout.keys, self._values))
+
+    def __getitem__(self, key):
+        return self._values[self._layout.index[key]]
+
+    def __setitem__(self, key, value):
+        index = self._layout.index.get(key)
+        if index is None:
+            data = self.data
+            data[key] = value
+            self.__init__(data)
+        else:
+            self._values = (self._values[:index] + (value,) +
+                            self._values[index + 1:])
+
+    def __contains__(self, key):
+        return key in self._layout.index
+
+    def get(self, key, default=None):
+        index = self._layout.index.get(key)
+        return default if index is None else self._values[index]
+
+    def __repr__(self):
+        return 'LsEntry({!r})'.format(self.data)
+
+
+class _JSONStreamReader(object):
+    """
+    Reads JSON values from an iterable of chunks of text, a value at a time.
+    """
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.text = u''
+        self.pos = 0
+        self.done = False
+
+    def _read(self):
+        """
+        Drop the text which has been read, and add another chunk. Returns
+        False once there are no more.
+        """
+        if self.done:
+            return False
+        for chunk in self.chunks:
+            self.text = self.text[self.pos:] + chunk
+            self.pos = 0
+            return True
+        self.done = True
+        return False
+
+    def peek(self):
+        """
+        Get the next character other than whitespace, without consuming it,
+        or '' at the end of the text.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self._read():
+                return u''
+
+    def expect(self, chars):
+        """
+        Consume the next character other than whitespace, which must be one
+        of ``chars``, and return it.
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError('Expected one of "{}" in JSON, found "{}"'
+                             .format(chars, char))
+        self.pos += 1
+        return char
+
+    def value(self):
+        """
+        Decode and consume the next value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except ValueError:
+                # the value may not have been read completely
+                if self._read():
+                    continue
+                raise
+            # a value at the end of the text read so far, such as a number,
+            # may continue in the next chunk
+            if end == len(self.text) and self._read():
+                continue
+            self.pos = end
+            return value
+
+    def items(self):
+        """
+        Decode and consume the items of a list, after its opening "[", as
+        `value` and `expect` would, but a good deal faster.
+        """
+        if self.peek() == u']':
+            self.pos += 1
+            return
+        scan_once = _decoder.scan_once
+        while True:
+            text, pos = self.text, self.pos
+            try:
+                value, end = scan_once(text, pos)
+                match = _ITEM_END.match(text, end)
+            except (ValueError, StopIteration):
+                match = None
+            # the item, or what follows it, may not have been read completely
+            if match is None or match.end() == len(text):
+                if self._read():
+                    continue
+                if match is None:
+                    # an incomplete document, or one which isn't valid JSON
+                    self.value()
+                    self.expect(u',]')
+            self.pos = match.end()
+            yield value
+            if match.group(1) == u']':
+                return
+
+
+def iter_ls_document(chunks, fields):
+    """
+    Decode an operation_ls response from an iterable of chunks of text,
+    yielding the items of its DATA as they are decoded, and storing its other
+    fields in the ``fields`` dict.
+    """
+    reader = _JSONStreamReader(chunks)
+    reader.expect(u'{')
+    if reader.peek() == u'}':
+        reader.expect(u'}')
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, six.string_types):
+                raise ValueError('Expected a key in JSON, found {!r}'
+                                 .format(key))
+            reader.expect(u':')
+            if key == 'DATA' and reader.peek() == u'[':
+                reader.expect(u'[')
+                for item in reader.items():
+                    yield item
+            else:
+                fields[key] = reader.value()
+            if reader.expect(u',}') == u'}':
+                break
+    if reader.peek():
+        raise ValueError('Extra data after JSON')
+
+
+class StreamingLsResponse(object):
+    """
+    An operation_ls response whose body has not been read yet. Iterating over
+    it reads the body, and yields its entries as `LsEntry` records as they
+    are decoded. Only iterate over it once.
+
+    The other fields of the response, like "path" and "total", can be looked
+    up once they have been read -- which they all have, after iteration.
+    ``count`` is the number of entries read.
+    """
+    def __init__(self, http_response, client=None):
+        self._response = http_response
+        self.client = client
+        self.fields = {}
+        self.count = 0
+
+    def __getitem__(self, key):
+        return self.fields[key]
+
+    def get(self, key, default=None):
+        return self.fields.get(key, default)
+
+    def _chunks(self):
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for chunk in self._response.iter_content(LS_READ_SIZE):
+                yield decoder.decode(chunk)
+        except requests.RequestException as err:
+            raise exc.convert_request_exception(err)
+        yield decoder.decode(b'', final=True)
+
+    def __iter__(self):
+        try:
+            for item in iter_ls_document(self._chunks(), self.fields):
+                self.count += 1
+                yield LsEntry(item)
+        finally:
+            self._response.close()
@@ -0,0 +1,280 @@
+"""
+Prefetching of paginated results, so that the next page of a listing is
+fetched while the current one is being printed.
+"""
+import copy
+import sys
+import threading
+
+from globus_sdk import GlobusResponse
+from globus_sdk.transfer.paging import PaginatedResource
+from six import reraise
+from six.moves import queue
+
+# the most pages fetched ahead of the one being consumed
+PAGE_WINDOW = 4
+# number of threads fetching pages concurrently, when the total is known
+PAGE_WORKERS = 4
+# sentinels which mark the end of the results, and a failure to fetch them
+_DONE = object()
+_ERROR = object()
+
+
+def _pipelined(iterable, window_items, client_factory=None):
+    """
+    Iterate over `iterable` in a background thread, keeping at most
+    `window_items` results ahead of the consumer.
+
+    If `iterable` is a paginated resource and `client_factory` is given, its
+    pages are fetched with a client of the thread's own, as the caller may
+    still be using the one it was made with.
+    """
+    results = queue.Queue(maxsize=window_items)
+    stop = threading.Event()
+
+    def put(item):
+        # the consumer may stop iterating at any point, and take nothing more
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def fetch():
+        if client_factory is not None and isinstance(iterable,
+                                                     PaginatedResource):
+            iterable.client_method = getattr(
+                client_factory(), iterable.client_method.__name__)
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    return
+                put(item)
+        except Exception:
+            put((_ERROR, sys.exc_info()))
+            return
+        put(_DONE)
+
+    thread = threading.Thread(target=fetch)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                return
+            if isinstance(item, tuple) and item and item[0] is _ERROR:
+                reraise(*item[1])
+            yield item
+    finally:
+        # the fetcher gives up on any result it's handing over once stopped
+        stop.set()
+
+
+class _OrderedPageFetcher(object):
+    """
+    Fetches pages, given by their (offset, limit), with a pool of threads,
+    each with a client of its own. Pages are handed back in order, and no more
+    than `window` of them are fetched ahead of the consumer.
+    """
+    def __init__(self, paginated, client_factory, window, workers):
+        self.paginated = paginated
+        self.client_factory = client_factory
+        self.window = window
+        self.workers = workers
+
+    def fetch(self, client, offset, limit):
+        kwargs = copy.copy(self.paginated.client_kwargs)
+        kwargs['params'] = dict(kwargs.get('params') or {},
+                                offset=offset, limit=limit)
+        method = getattr(client, self.paginated.client_method.__name__)
+        return method(self.paginated.client_path, **kwargs)
+
+    def pages(self, ranges):
+        """
+        Start fetching the pages for the given (offset, limit) ranges, and
+        return an iterator over their responses.
+        """
+        todo = queue.Queue()
+        slots = []
+        threads = []
+        stop = threading.Event()
+        ranges = iter(ranges)
+
+        def worker():
+            client = self.client_factory()
+            while True:
+                slot = todo.get()
+                if slot is _DONE or stop.is_set():
+                    return
+                try:
+                    slot['result'] = self.fetch(client, *slot['range'])
+                except Exception:
+                    slot['error'] = sys.exc_info()
+                slot['done'].set()
+
+        def submit_next():
+            """
+            Queue the next page, if any. Once there are none, the workers are
+            told to stop when they have fetched those queued.
+            """
+            for page_range in ranges:
+                slot = {'range': page_range, 'done': threading.Event()}
+                slots.append(slot)
+                todo.put(slot)
+                return True
+            for _ in threads:
+                todo.put(_DONE)
+            del threads[:]
+            return False
+
+        while len(slots) < self.window:
+            if not submit_next():
+                break
+        for _ in range(min(self.workers, len(slots))):
+            thread = threading.Thread(target=worker)
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        if len(slots) < self.window:
+            # every page is queued already
+            submit_next()
+
+        def results():
+            try:
+                while slots:
+                    slot = slots.pop(0)
+                    # keep the window full
+                    if threads:
+                        submit_next()
+                    slot['done'].wait()
+                    if 'error' in slot:
+                        reraise(*slot['error'])
+                    yield slot['result']
+            finally:
+                stop.set()
+                for _ in threads:
+                    todo.put(_DONE)
+
+        return results()
+
+
+def _parallel_total_paged(paginated, client_factory, window, workers):
+    """
+    Results of a TOTAL paged resource: the first page as fetched by the SDK,
+    then the second, which gives the total, and the rest concurrently.
+    """
+    first_limit = paginated.limit
+    base_offset = paginated.offset
+    page_size = paginated.max_results_per_call
+    client = paginated.client_object
+    num_results = paginated.num_results
+
+    def wrap(res):
+        for item in res:
+            yield GlobusResponse(item, client=client)
+
+    def limit_for(offset):
+        if num_results is None:
+            return page_size
+        return min(page_size, base_offset + num_results - offset)
+
+    fetcher = _OrderedPageFetcher(paginated, client_factory, window, workers)
+    offset = base_offset + page_size
+
+    # fetch the second page in the background, unless the first is the last
+    if num_results is not None and num_results <= first_limit:
+        second = None
+    else:
+        second = fetcher.pages([(offset, limit_for(offset))])
+
+    # the first page has already been fetched -- take exactly its results,
+    # so that the SDK doesn't fetch the next one
+    count = 0
+    for item in paginated:
+        yield item
+        count += 1
+        if count >= first_limit:
+            break
+    if second is None or count < first_limit:
+        return
+
+    second = next(second)
+    for item in wrap(second):
+        yield item
+
+    end = second['total']
+    if num_results is not None:
+        end = min(end, base_offset + num_results)
+    ranges = [(start, limit_for(start))
+              for start in range(offset + page_size, end, page_size)]
+    for res in fetcher.pages(ranges):
+        for item in wrap(res):
+            yield item
+
+
+def prefetching(results, client_factory=None, window=PAGE_WINDOW,
+                workers=PAGE_WORKERS):
+    """
+    Wrap the results of a paginated SDK call so that pages are fetched ahead
+    of the consumer, at most `window` pages ahead.
+
+    Resources paged by offset with a known total (e.g. `task_list` and
+    `task_event_list`) are fetched by `workers` threads at once, each with a
+    client from `client_factory`, with the order of the results kept. Other
+    paginated resources have their next page fetched in the background while
+    the current one is consumed, by a client from `client_factory` if one is
+    given, as do TOTAL paged ones if none is. Anything else, such as a
+    response which is not paginated, is returned as it is.
+    """
+    if not isinstance(results, PaginatedResource):
+        return results
+    if results.generator is None:
+        return iter(())
+
+    if (client_factory is not None and
+            results.paging_style == PaginatedResource.PAGING_STYLE_TOTAL):
+        return _parallel_total_paged(results, client_factory, window,
+                                     workers)
+    return _pipelined(results, window * results.max_results_per_call,
+                      client_factory)
+
+
+def map_concurrently(func, keys, client_factory, workers=PAGE_WORKERS):
+    """
+    Call `func(client, key)` once for each distinct key, with a pool of
+    threads, each with a client from `client_factory` -- e.g. to look up the
+    endpoints referred to by a listing before it is printed.
+
+    Returns a dict of the results by key. The first error is raised.
+    """
+    todo = queue.Queue()
+    for key in set(keys):
+        todo.put(key)
+    results = {}
+    errors = []
+
+    def worker():
+        client = client_factory()
+        while not errors:
+            try:
+                key = todo.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results[key] = func(client, key)
+            except Exception:
+                errors.append(sys.exc_info())
+
+    threads = [threading.Thread(target=worker)
+               for _ in range(min(workers, todo.qsize()))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        reraise(*errors[0])
+    return results
@@ -2,16 +2,113 @@
 
 import logging
 import time
-from collections import deque
+from array import array
 
-from globus_sdk.response import GlobusResponse
 from globus_sdk.transfer.paging import PaginatedResource
 
+from globus_cli.services.ls_filters import glob_matcher, glob_filter
+
 logger = logging.getLogger(__name__)
 
 # constants for controlling rate limiting
 SLEEP_FREQUENCY = 25
 SLEEP_LEN = 1
+# the most entries requested in one operation_ls call
+LS_PAGE_SIZE = 10000
+
+
+def operation_ls_pages(client, endpoint_id, page_size=LS_PAGE_SIZE,
+                       **params):
+    """
+    List a directory with operation_ls calls of at most `page_size` entries
+    each, by offset, and iterate over the responses, as `StreamingLsResponse`
+    objects. Each must be iterated over in full before the next is requested.
+    The last page is the first one short of `page_size` entries, or which
+    reaches the total.
+    """
+    offset = 0
+    while True:
+        res = client.streaming_operation_ls(endpoint_id, offset=offset,
+                                            limit=page_size, **params)
+        yield res
+        offset += res.count
+        total = res.get("total")
+        if res.count < page_size or (total is not None and offset >= total):
+            return
+
+
+class _PathTree(object):
+    """
+    The directories of a recursive listing yet to be listed, and the
+    directories above them, each referenced by an ID, as its parent's ID and
+    its name, with names shared between directories. The root is ID 0. Paths
+    are only built when they're needed.
+
+    Directories are released as they are listed, and dropped, with their IDs
+    reused, once everything under them has been listed too. So however many
+    directories are found, the tree only holds those still to be listed and
+    the paths to them.
+    """
+    def __init__(self):
+        self.parents = array('l', [-1])
+        self.names = [""]
+        # the number of subdirectories of each directory which are held
+        self.children = array('l', [0])
+        self.free = array('l')
+        # names, and the number of directories holding each
+        self._interned = {}
+        self._uses = {}
+
+    def __len__(self):
+        return len(self.names) - len(self.free)
+
+    def add(self, parent, name):
+        """
+        Add a directory, by its parent's ID and its name, and return its ID.
+        """
+        name = self._interned.setdefault(name, name)
+        self._uses[name] = self._uses.get(name, 0) + 1
+        self.children[parent] += 1
+        if self.free:
+            node = self.free.pop()
+            self.parents[node] = parent
+            self.names[node] = name
+            self.children[node] = 0
+        else:
+            node = len(self.names)
+            self.parents.append(parent)
+            self.names.append(name)
+            self.children.append(0)
+        return node
+
+    def release(self, node):
+        """
+        Note that a directory has been listed, and drop it, and the
+        directories above it, as long as nothing under them is held. The
+        root is never dropped.
+        """
+        while node > 0 and not self.children[node]:
+            name = self.names[node]
+            self._uses[name] -= 1
+            if not self._uses[name]:
+                del self._uses[name]
+                del self._interned[name]
+            self.names[node] = None
+            self.free.append(node)
+
+            node = self.parents[node]
+            self.children[node] -= 1
+
+    def path(self, node):
+        """
+        Get the path of a directory relative to the root, and its depth.
+        """
+        parts = []
+        while node > 0:
+            parts.append(self.names[node])
+            node = self.parents[node]
+        parts.reverse()
+        return "/".join(parts), len(parts)
 
 
 class RecursiveLsResponse(PaginatedResource):
@@ -20,11 +117,15 @@ class RecursiveLsResponse(PaginatedResource):
     Uses PaginatedResource logic for iterating over potentially very
     large file systems without keeping the whole filesystem in memory,
     but rather than using Globus paging uses an internal queue
-    for BFS of the filesystem.
+    for BFS of the filesystem. Each directory is listed a page at a time, and
+    entries are yielded as `LsEntry` records as each page is read, so only
+    the names of subdirectories are held however wide a directory is.
     Rate limits calls to prevent getting back connection errors.
     """
     def __init__(self, client, endpoint_id,
-                 max_depth, filter_after_first, ls_params):
+                 max_depth, filter_after_first, ls_params,
+                 page_size=LS_PAGE_SIZE, exclude_dirs=(), include=(),
+                 max_entries=None, entry_filter=None):
         """
         **Parameters**
           ``client``
@@ -40,6 +141,23 @@ class RecursiveLsResponse(PaginatedResource):
           ``ls_params``
             Query params sent to operation_ls, see operation_ls for more
             details.
+          ``page_size``
+            The most entries requested in one operation_ls call.
+          ``exclude_dirs``
+            Glob patterns of directory names. Directories matching any of
+            them are neither given nor listed.
+          ``include``
+            Glob patterns of names. If any are given, only entries matching
+            one of them are given, though all directories are still listed.
+          ``max_entries``
+            The most entries given, after which no more calls are made.
+          ``entry_filter``
+            An `EntryFilter`. If given, only entries it matches are given,
+            though all directories are still listed. Its filter clauses are
+            used for dirs at the depth limit, and where they are selective,
+            every other dir is listed twice: with the clauses, for the
+            entries given, and just for its subdirectories. Otherwise, the
+            second listing would cost more calls than it saves entries.
         """
         logger.info("Creating RecursiveLsResponse on path {} of endpoint {}"
                     .format(ls_params.get("path"), endpoint_id))
@@ -49,13 +167,23 @@ class RecursiveLsResponse(PaginatedResource):
         self.ls_params = ls_params
         self.max_depth = max_depth
         self.filter_after_first = filter_after_first
+        self.exclude_dirs = exclude_dirs
+        self.include = include
+        self.max_entries = max_entries
+        self.entry_filter = entry_filter
+        # with every entry listed given, none need be listed past the last
+        if max_entries and not (exclude_dirs or include or entry_filter):
+            page_size = min(page_size, max_entries)
+        self.page_size = page_size
         self.filtering = True
         self.ls_count = 0
 
-        # queue of (absolute_path, relative_path, depth) tuples.
-        self.queue = deque()
-        # initialized with the start path (if any) and a depth of 0
-        self.queue.append((self.ls_params.get("path"), "", 0))
+        # the directories to list and those above them, and the absolute path
+        # of the first, which the others' paths are relative to
+        self.tree = _PathTree()
+        self.root_path = None
+        # queue of IDs of directories in the tree, initialized with the root
+        self.queue = array('l', [0])
 
         # call the iterable_func method to convert it to a generator expression
         self.generator = self.iterable_func()
@@ -80,24 +208,25 @@ class RecursiveLsResponse(PaginatedResource):
         We rely on the implicit StopIteration built into this type of function
         to propagate through the final `next()` call.
         """
+        exclude_dir = glob_matcher(self.exclude_dirs)
+        include = glob_matcher(self.include)
+        include_filter = glob_filter(self.include)
+        entry_filter = self.entry_filter
+        count = 0
+
         # BFS is not done until the queue is empty
         while self.queue:
             logger.debug(("recursive_operation_ls BFS queue not empty, "
                           "getting next path now."))
 
-            # rate limit based on number of ls calls we have made
-            self.ls_count += 1
-            if self.ls_count % SLEEP_FREQUENCY == 0:
-                logger.debug(("recursive_operation_ls sleeping {} seconds to "
-                              "rate limit itself.".format(SLEEP_LEN)))
-                time.sleep(SLEEP_LEN)
+            # get the next dir from the queue, and its path and depth
+            node = self.queue.pop()
+            rel_path, depth = self.tree.path(node)
 
-            # get path and current depth from the queue
-            abs_path, rel_path, depth = self.queue.pop()
-
-            # set the target path to the popped absolute path if it exists
-            if abs_path:
-                self.ls_params["path"] = abs_path
+            # set the target path to the dir's absolute path, unless it is the
+            # start path (if any)
+            if node:
+                self.ls_params["path"] = self.root_path + rel_path
 
             # if filter_after_first is False, stop filtering after the first
             # ls call has been made
@@ -110,24 +239,81 @@ class RecursiveLsResponse(PaginatedResource):
                     except KeyError:
                         pass
 
-            # do the operation_ls with the updated params
-            res = self.client.operation_ls(self.endpoint_id, **self.ls_params)
-            res_data = res["DATA"]
-
-            # if we aren't at the depth limit, add dir entries to the queue.
-            # including the dir's name in the absolute and relative paths
-            # and increase the depth by one.
-            # data is reversed to maintain any "orderby" ordering
-            if depth < self.max_depth:
-                self.queue.extend(
-                    [(res["path"] + item["name"],
-                      (rel_path + "/" if rel_path else "") + item["name"],
-                      depth + 1)
-                     for item in reversed(res_data) if item["type"] == "dir"])
-
-            # for each item in the response data update the item's name with
-            # the relative path popped from the queue, and yield the item
-            for item in res_data:
-                item["name"] = (
-                    rel_path + "/" if rel_path else "") + item["name"]
-                yield GlobusResponse(item)
+            # the subdirectories found, to be added to the queue once the
+            # whole directory has been listed
+            subdirs = array('l')
+            prefix = rel_path + "/" if rel_path else ""
+            for params, give, descend in self._listings(depth,
+                                                        include_filter):
+                for res in operation_ls_pages(self.client, self.endpoint_id,
+                                              page_size=self.page_size,
+                                              **params):
+                    self._rate_limit()
+
+                    for item in res:
+                        name = item["name"]
+                        if item["type"] == "dir":
+                            # skip excluded dirs, and everything in them
+                            if exclude_dir and exclude_dir(name):
+                                continue
+                            # if we aren't at the depth limit, note dir
+                            # entries for the queue, with their depth one
+                            # more than this dir's
+                            if descend and depth < self.max_depth:
+                                subdirs.append(self.tree.add(node, name))
+                        if not give or (include and not include(name)) or (
+                                entry_filter and not entry_filter.matches(
+                                    item)):
+                            continue
+                        # update the item's name with the relative path
+                        # popped from the queue, and yield the item
+                        if prefix:
+                            item["name"] = prefix + name
+                        yield item
+
+                        count += 1
+                        if count == self.max_entries:
+                            return
+
+                    # the paths of other dirs are made from the start path,
+                    # as given by the service, and their relative paths
+                    if not node:
+                        self.root_path = res["path"]
+
+            # reversed to maintain any "orderby" ordering
+            self.queue.extend(reversed(subdirs))
+            self.tree.release(node)
+
+    def _listings(self, depth, include_filter):
+        """
+        Get the listings to make of a dir at the given depth, as the params
+        of their operation_ls calls, whether their entries may be given, and
+        whether their dirs may be descended into.
+        """
+        params = self.ls_params
+        if self.entry_filter:
+            clauses = self.entry_filter.clauses
+        else:
+            clauses = [include_filter] if include_filter else []
+        # the clauses can't be added to a filter already in the params, and
+        # can only select the entries of a listing which dirs are descended
+        # from if no dirs are left out of it; otherwise dirs are listed
+        # separately, for a selective entry_filter
+        if not clauses or "filter" in params:
+            return [(params, True, True)]
+        if depth >= self.max_depth:
+            return [(dict(params, filter="/".join(clauses)), True, True)]
+        if "type:dir" in clauses:
+            return [(dict(params, filter="type:dir"), True, True)]
+        if self.entry_filter and self.entry_filter.selective:
+            return [(dict(params, filter="type:dir"), False, True),
+                    (dict(params, filter="/".join(clauses)), True, False)]
+        return [(params, True, True)]
+
+    def _rate_limit(self):
+        # rate limit based on number of ls calls we have made
+        self.ls_count += 1
+        if self.ls_count % SLEEP_FREQUENCY == 0:
+            logger.debug(("recursive_operation_ls sleeping {} seconds to "
+                          "rate limit itself.".format(SLEEP_LEN)))
+            time.sleep(SLEEP_LEN)
@@ -0,0 +1,161 @@
+"""
+Streaming export of the successful transfers of a task, which may number in
+the millions, one page at a time and with bounded memory.
+"""
+import errno
+import io
+import sys
+import threading
+
+import click
+from six import reraise
+from six.moves import queue
+
+from globus_cli.safeio import safeprint
+from globus_cli.safeio.json_backend import dumps
+
+# the most records the service returns in one page
+SUCCESSFUL_TRANSFERS_PAGE_SIZE = 1000
+# columns of TSV output
+TSV_FIELDS = ('source_path', 'destination_path')
+# sentinels which mark the end of the pages, and a failure to fetch one
+_DONE = object()
+_ERROR = object()
+
+
+def successful_transfer_pages(client, task_id, marker=None,
+                              page_size=SUCCESSFUL_TRANSFERS_PAGE_SIZE):
+    """
+    Iterate over the pages of a task's successful transfers, starting from
+    the page fetched with `marker` (or the first page), as
+    (marker, records, next_marker) tuples: the marker with which the page was
+    fetched, and the one for the page after it (None after the last page).
+
+    The next page is fetched by a background thread while the caller handles
+    the current one, so no more than a couple of pages are held at once.
+    """
+    path = client.qjoin_path('task', task_id, 'successful_transfers')
+    pages = queue.Queue(maxsize=1)
+    stop = threading.Event()
+
+    def put(item):
+        # the caller may stop iterating at any point, and take nothing more
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def fetch():
+        next_marker = marker
+        try:
+            while not stop.is_set():
+                params = {'limit': page_size}
+                if next_marker:
+                    params['marker'] = next_marker
+                res = client.get(path, params=params)
+                # marker may be 0, null, or absent if there are no more pages
+                page_marker, next_marker = (
+                    next_marker, res.get('next_marker') or None)
+                put((page_marker, res['DATA'], next_marker))
+                if next_marker is None:
+                    break
+        except Exception:
+            put((_ERROR, sys.exc_info()))
+            return
+        put(_DONE)
+
+    thread = threading.Thread(target=fetch)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            page = pages.get()
+            if page is _DONE:
+                return
+            if page[0] is _ERROR:
+                reraise(*page[1])
+            yield page
+    finally:
+        # let the fetcher finish, waking it if it's handing over a page
+        stop.set()
+        try:
+            pages.get_nowait()
+        except queue.Empty:
+            pass
+
+
+def _tsv_escape(value):
+    return (u'' if value is None else value).replace(
+        u'\\', u'\\\\').replace(u'\t', u'\\t').replace(
+        u'\n', u'\\n').replace(u'\r', u'\\r')
+
+
+def format_ndjson(records):
+    return u''.join(dumps(record, indent=None) + u'\n'
+                    for record in records)
+
+
+def format_tsv(records):
+    return u''.join(u'\t'.join(_tsv_escape(record.get(field))
+                               for field in TSV_FIELDS) + u'\n'
+                    for record in records)
+
+
+def export_successful_transfers(client, task_id, export_format,
+                                output_file=None, marker=None):
+    """
+    Write the successful transfers of a task to a file, or to stdout, as
+    NDJSON or TSV, a page at a time.
+
+    When resuming from a marker, an output file is appended to, rather than
+    replaced. If the export is interrupted, the marker to resume it from is
+    printed to stderr. A partly written page is removed from an output file,
+    so resuming gives exactly one copy of each record; on stdout, the records
+    of that page are written again. A closed stdout, as when piped to `head`,
+    just ends the export.
+    """
+    formatter = format_tsv if export_format == 'tsv' else format_ndjson
+
+    if output_file is None:
+        stream = click.get_text_stream('stdout')
+    else:
+        stream = io.open(output_file, 'a' if marker else 'w',
+                         encoding='utf-8')
+
+    # the marker of the first page not completely written
+    resume_marker = marker
+    page_start = stream.tell() if output_file is not None else None
+    pages = successful_transfer_pages(client, task_id, marker=marker)
+    try:
+        if export_format == 'tsv' and not marker:
+            stream.write(u'\t'.join(TSV_FIELDS) + u'\n')
+            if output_file is not None:
+                page_start = stream.tell()
+        for _, records, next_marker in pages:
+            stream.write(formatter(records))
+            stream.flush()
+            resume_marker = next_marker
+            if output_file is not None:
+                page_start = stream.tell()
+    except BaseException as err:
+        # the reader of stdout may stop reading early, as `head` does, which
+        # is no failure, just as for safeprint
+        if (output_file is None and isinstance(err, IOError) and
+                err.errno == errno.EPIPE):
+            return
+        if output_file is not None:
+            stream.truncate(page_start)
+        if resume_marker:
+            safeprint(u'Export interrupted. To resume it, add '
+                      u'--resume-from-marker {}'.format(resume_marker),
+                      write_to_stderr=True)
+        else:
+            safeprint(u'Export interrupted. To resume it, run it again from '
+                      u'the start', write_to_stderr=True)
+        raise
+    finally:
+        pages.close()
+        if output_file is not None:
+            stream.close()
@@ -0,0 +1,321 @@
+"""
+A local history of task documents, kept in a SQLite database so that task
+listings can be searched without paging through the whole history from the
+service each time.
+
+The history is brought up to date by `sync`, which only fetches tasks
+requested since the last sync and refreshes those which were still in
+progress. Tasks which have succeeded or failed never change again, so any
+such task found in the history can be shown without an API call.
+
+The database belongs to one identity -- a hash of the Transfer refresh token,
+as with the activation cache -- and is emptied if used by another.
+"""
+import errno
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+
+import click
+
+from globus_cli.config import TRANSFER_RT_OPTNAME, lookup_option
+from globus_cli.services.transfer import get_tasks_by_id
+
+logger = logging.getLogger(__name__)
+
+# statuses after which a task never changes
+TERMINAL_STATUSES = ('SUCCEEDED', 'FAILED')
+# task types which are listed and synced
+TASK_TYPES = 'TRANSFER,DELETE'
+# task documents written per transaction while syncing
+SYNC_BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    status TEXT,
+    type TEXT,
+    label TEXT,
+    source_endpoint_id TEXT,
+    destination_endpoint_id TEXT,
+    request_time TEXT,
+    completion_time TEXT,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS tasks_source ON tasks (source_endpoint_id);
+CREATE INDEX IF NOT EXISTS tasks_destination
+    ON tasks (destination_endpoint_id);
+CREATE INDEX IF NOT EXISTS tasks_label ON tasks (label COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS tasks_request_time ON tasks (request_time);
+CREATE INDEX IF NOT EXISTS tasks_completion_time ON tasks (completion_time);
+"""
+
+
+def _history_path():
+    return os.path.expanduser('~/.globus/cli/task_history.sqlite')
+
+
+def _identity():
+    token = lookup_option(TRANSFER_RT_OPTNAME)
+    if not token:
+        return None
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _normalize_time(value):
+    """
+    Convert a time from a task document, like "2017-08-30T19:09:48+00:00",
+    to the "YYYY-MM-DD HH:MM:SS" form used in task_list filters, which also
+    compares properly with the ISO_TIME values given on the commandline.
+    """
+    if not value:
+        return None
+    return value[:19].replace('T', ' ')
+
+
+def _like_pattern(pattern):
+    """
+    Convert a label pattern using "*" as a wildcard to a LIKE pattern.
+    """
+    for char in ('\\', '%', '_'):
+        pattern = pattern.replace(char, '\\' + char)
+    return pattern.replace('*', '%')
+
+
+class TaskHistory(object):
+    """
+    The local task history of the current identity.
+
+    Opening the history raises ``sqlite3.Error`` or ``OSError`` if the database
+    can't be used, and ``ValueError`` if there is no identity (not logged in).
+
+    With ``read_only``, the database is only read: it must already exist, and
+    belong to the current identity (or ``ValueError`` is raised), and nothing
+    must be stored in it.
+    """
+    def __init__(self, path=None, read_only=False):
+        identity = _identity()
+        if identity is None:
+            raise ValueError('No Transfer login')
+
+        path = path or _history_path()
+        if read_only:
+            # connecting would create the database, so check for it first
+            if not os.path.exists(path):
+                raise OSError(errno.ENOENT, 'No task history', path)
+            self.conn = sqlite3.connect(path, timeout=30)
+            try:
+                if self._get_meta('identity') != identity:
+                    raise ValueError('Task history of another identity')
+            except Exception:
+                self.conn.close()
+                raise
+            return
+
+        # deny rwx to Group and World, as with the config file
+        os.umask(0o077)
+        try:
+            os.makedirs(os.path.dirname(path))
+        except OSError as err:
+            if err.errno != errno.EEXIST:
+                raise
+
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(_SCHEMA)
+        if self._get_meta('identity') != identity:
+            logger.debug('task history belongs to another identity, clearing')
+            self.clear()
+            self._set_meta('identity', identity)
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def _get_meta(self, key):
+        row = self.conn.execute(
+            'SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute('INSERT OR REPLACE INTO meta (key, value) '
+                          'VALUES (?, ?)', (key, value))
+
+    def clear(self):
+        """
+        Forget every task, and when the history was last synced.
+        """
+        with self.conn:
+            self.conn.execute('DELETE FROM tasks')
+            self.conn.execute("DELETE FROM meta WHERE key != 'identity'")
+
+    def store(self, tasks):
+        """
+        Add or replace task documents (dicts or GlobusResponses).
+        """
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO tasks (task_id, status, type, label, '
+                'source_endpoint_id, destination_endpoint_id, request_time, '
+                'completion_time, document) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(task['task_id'], task.get('status'), task.get('type'),
+                  task.get('label'), task.get('source_endpoint_id'),
+                  task.get('destination_endpoint_id'),
+                  _normalize_time(task.get('request_time')),
+                  _normalize_time(task.get('completion_time')),
+                  json.dumps(getattr(task, 'data', task)))
+                 for task in tasks])
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM tasks').fetchone()[0]
+
+    def get_finished_task(self, task_id):
+        """
+        Get the document of a task which has succeeded or failed, or None if
+        the task isn't in the history or may yet change.
+        """
+        row = self.conn.execute(
+            'SELECT document FROM tasks WHERE task_id = ? AND status IN '
+            '({})'.format(','.join('?' * len(TERMINAL_STATUSES))),
+            (str(task_id),) + TERMINAL_STATUSES).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def sync(self, client):
+        """
+        Fetch the tasks requested since the last sync, and refresh every task
+        which was unfinished. The first sync fetches the whole history.
+
+        Returns the number of task documents fetched.
+        """
+        synced_through = self._get_meta('synced_through')
+        filter_string = 'type:' + TASK_TYPES
+        if synced_through is not None:
+            # inclusive, so tasks requested in the same second as the last
+            # one seen are not missed
+            filter_string += '/request_time:{},'.format(synced_through)
+
+        fetched = 0
+        latest = synced_through
+        batch = []
+        for task in client.task_list(num_results=None, filter=filter_string):
+            batch.append(task)
+            request_time = _normalize_time(task.get('request_time'))
+            if request_time and (latest is None or request_time > latest):
+                latest = request_time
+            if len(batch) >= SYNC_BATCH_SIZE:
+                self.store(batch)
+                fetched += len(batch)
+                batch = []
+        self.store(batch)
+        fetched += len(batch)
+
+        # tasks fetched above are up to date, but older unfinished ones may
+        # have finished or changed status since
+        unfinished = [row[0] for row in self.conn.execute(
+            'SELECT task_id FROM tasks WHERE status NOT IN ({}) AND '
+            '(request_time IS NULL OR request_time < ?)'.format(
+                ','.join('?' * len(TERMINAL_STATUSES))),
+            TERMINAL_STATUSES + (synced_through or '',))]
+        if unfinished:
+            refreshed = get_tasks_by_id(client, unfinished)
+            self.store(refreshed.values())
+            fetched += len(refreshed)
+
+        if latest is not None:
+            with self.conn:
+                self._set_meta('synced_through', latest)
+        return fetched
+
+    def query(self, task_ids=(), statuses=(), task_type=None, labels=(),
+              not_labels=(), exact=False, endpoint_ids=(),
+              requested_after=None, requested_before=None,
+              completed_after=None, completed_before=None, limit=None):
+        """
+        Search the history, with filters which work like those of task_list.
+        Several values for one filter match any of them, and `endpoint_ids`
+        match either the source or the destination.
+
+        Returns task documents, most recently requested first.
+        """
+        clauses = []
+        params = []
+
+        def any_of(column, values):
+            values = [str(value) for value in values]
+            clauses.append('{} IN ({})'.format(
+                column, ','.join('?' * len(values))))
+            params.extend(values)
+
+        if task_ids:
+            any_of('task_id', task_ids)
+        if statuses:
+            any_of('status', statuses)
+        if task_type:
+            any_of('type', [task_type])
+        else:
+            any_of('type', TASK_TYPES.split(','))
+        if endpoint_ids:
+            endpoint_ids = [str(x) for x in endpoint_ids]
+            marks = ','.join('?' * len(endpoint_ids))
+            clauses.append(
+                '(source_endpoint_id IN ({0}) OR '
+                'destination_endpoint_id IN ({0}))'.format(marks))
+            params.extend(endpoint_ids * 2)
+
+        if exact:
+            label_match = 'label = ?'
+        else:
+            label_match = "label LIKE ? ESCAPE '\\'"
+            labels = [_like_pattern(x) for x in labels]
+            not_labels = [_like_pattern(x) for x in not_labels]
+        if labels:
+            clauses.append('(' + ' OR '.join([label_match] * len(labels)) +
+                           ')')
+            params.extend(labels)
+        for label in not_labels:
+            clauses.append('(label IS NULL OR NOT {})'.format(label_match))
+            params.append(label)
+
+        for column, op, value in (
+                ('request_time', '>=', requested_after),
+                ('request_time', '<=', requested_before),
+                ('completion_time', '>=', completed_after),
+                ('completion_time', '<=', completed_before)):
+            if value is not None:
+                clauses.append('{} {} ?'.format(column, op))
+                params.append(value)
+
+        sql = 'SELECT document FROM tasks'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY request_time DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [json.loads(row[0]) for row in self.conn.execute(sql, params)]
+
+
+def open_task_history(required=True, read_only=False):
+    """
+    Open the local task history. If it can't be used, raise a ClickException
+    when `required`, and otherwise log the problem and return None -- for
+    commands which only use the history as a cache.
+
+    With `read_only`, the history is opened only if it already exists, and
+    is neither created nor changed (see `TaskHistory`).
+    """
+    try:
+        return TaskHistory(read_only=read_only)
+    except (ValueError, sqlite3.Error, OSError) as err:
+        if required:
+            raise click.ClickException(
+                'Could not open the local task history: {}'.format(err))
+        logger.debug('could not open task history: {}'.format(err))
+        return None
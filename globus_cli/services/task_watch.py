@@ -0,0 +1,109 @@
+import time
+
+# weight given to the newest throughput measurement in the moving average
+EWMA_WEIGHT = 0.3
+
+# fields copied from task documents into every sample
+SAMPLE_TASK_FIELDS = ('task_id', 'status', 'label', 'bytes_transferred',
+                      'effective_bytes_per_second', 'files',
+                      'files_transferred', 'files_skipped', 'subtasks_total',
+                      'subtasks_pending', 'subtasks_retrying',
+                      'subtasks_succeeded', 'subtasks_failed')
+
+
+def _remaining_work(task):
+    """
+    Get (units done, units remaining) for a task, counted in files if the task
+    reports them, and in subtasks otherwise. None if neither is available.
+    """
+    files = task.get('files')
+    files_transferred = task.get('files_transferred')
+    if files and files_transferred is not None:
+        skipped = task.get('files_skipped') or 0
+        return files_transferred, max(files - files_transferred - skipped, 0)
+
+    if task.get('subtasks_total'):
+        pending = ((task.get('subtasks_pending') or 0) +
+                   (task.get('subtasks_retrying') or 0))
+        return task['subtasks_total'] - pending, pending
+
+    return None
+
+
+class TaskThroughputTracker(object):
+    """
+    Turns successive snapshots of tasks into throughput samples.
+
+    Each sample has the instantaneous throughput since the last snapshot of
+    the same task, an exponentially weighted moving average of it, and an ETA
+    based on the average and on the work remaining, as measured by
+    `files`/`files_transferred` or by `subtasks_pending`.
+    """
+    def __init__(self, weight=EWMA_WEIGHT):
+        self.weight = weight
+        # task_id -> (timestamp, bytes_transferred, ewma)
+        self.state = {}
+
+    def update(self, task, now=None):
+        """
+        Record a task document, returning a sample dict.
+        """
+        now = time.time() if now is None else now
+        task_id = task['task_id']
+        bytes_transferred = task.get('bytes_transferred') or 0
+
+        instant_rate = None
+        ewma = None
+        if task_id in self.state:
+            last_time, last_bytes, ewma = self.state[task_id]
+            if now > last_time:
+                instant_rate = (max(bytes_transferred - last_bytes, 0) /
+                                float(now - last_time))
+                if ewma is None:
+                    ewma = instant_rate
+                else:
+                    ewma = (self.weight * instant_rate +
+                            (1 - self.weight) * ewma)
+        self.state[task_id] = (now, bytes_transferred, ewma)
+
+        sample = dict((field, task.get(field))
+                      for field in SAMPLE_TASK_FIELDS)
+        sample.update(timestamp=now, instant_bytes_per_second=instant_rate,
+                      ewma_bytes_per_second=ewma,
+                      eta_seconds=self._eta(task, bytes_transferred, ewma))
+        return sample
+
+    def _eta(self, task, bytes_transferred, ewma):
+        if task['status'] != 'ACTIVE':
+            return 0
+        work = _remaining_work(task)
+        if work is None or not ewma:
+            return None
+        done, remaining = work
+        if not done:
+            return None
+        # assume the remaining work is the same size, per unit, as that done
+        return remaining * (float(bytes_transferred) / done) / ewma
+
+
+def format_bytes(num_bytes):
+    """
+    Render a byte count (or rate) with a binary unit suffix.
+    """
+    if num_bytes is None:
+        return '-'
+    num_bytes = float(num_bytes)
+    for unit in ('B', 'KiB', 'MiB', 'GiB', 'TiB'):
+        if abs(num_bytes) < 1024 or unit == 'TiB':
+            break
+        num_bytes /= 1024
+    return '{:.1f} {}'.format(num_bytes, unit)
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return '-'
+    seconds = int(seconds)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return '{}:{:02d}:{:02d}'.format(hours, minutes, seconds)
@@ -2,12 +2,15 @@ import uuid
 import random
 import time
 import sys
+import threading
 import click
 
+from collections import OrderedDict
+from six import reraise
 from textwrap import dedent
 
 from globus_sdk import TransferClient, RefreshTokenAuthorizer
-from globus_sdk.exc import NetworkError
+from globus_sdk.exc import NetworkError, TransferAPIError
 from globus_sdk.base import safe_stringify
 
 from globus_cli import version
@@ -15,7 +18,11 @@ from globus_cli.safeio import safeprint, formatted_print, FORMAT_SILENT
 from globus_cli.config import (
     get_transfer_tokens, internal_auth_client, set_transfer_access_token)
 from globus_cli.parsing import EXPLICIT_NULL
-from globus_cli.services.recursive_ls import RecursiveLsResponse
+from globus_cli.services.recursive_ls import (
+    RecursiveLsResponse, LS_PAGE_SIZE)
+from globus_cli.services.ls_stream import StreamingLsResponse
+from globus_cli.services.activation_cache import (
+    activation_is_cached, cache_activation, invalidate_activation)
 
 
 class RetryingTransferClient(TransferClient):
@@ -58,16 +65,60 @@ class RetryingTransferClient(TransferClient):
         return self.retry(super(
             RetryingTransferClient, self).submit_delete, *args, **kwargs)
 
+    def streaming_operation_ls(self, endpoint_id, **params):
+        """
+        Makes a ``GET /operation/endpoint/<endpoint_id>/ls`` call, like
+        ``operation_ls``, but leaves the response body to be read and decoded
+        as its entries are iterated over.
+        :rtype: :class:`StreamingLsResponse
+                <globus_cli.services.ls_stream.StreamingLsResponse>`
+        """
+        endpoint_id = safe_stringify(endpoint_id)
+        path = self.qjoin_path("operation/endpoint", endpoint_id, "ls")
+        # requests reads the body up front unless the session streams
+        self._session.stream = True
+        try:
+            return self.get(path, params=params,
+                            response_class=StreamingLsResponse)
+        finally:
+            self._session.stream = False
+
+    def paged_operation_ls(self, endpoint_id, page_size=LS_PAGE_SIZE,
+                           exclude_dirs=(), include=(), max_entries=None,
+                           **params):
+        """
+        Makes ``GET /operation/endpoint/<endpoint_id>/ls`` calls for one
+        directory, a page of ``page_size`` entries at a time, so that a
+        directory of any size can be listed without holding all of it.
+        :rtype: iterable of :class:`LsEntry
+                <globus_cli.services.ls_stream.LsEntry>`
+
+        This is a recursive listing of depth 0, so the first page is fetched
+        right away, and top level operation_ls fields are not available.
+        ``exclude_dirs``, ``include`` and ``max_entries`` are as for
+        ``recursive_operation_ls``.
+        """
+        endpoint_id = safe_stringify(endpoint_id)
+        self.logger.info("TransferClient.paged_operation_ls({}, {}, {})"
+                         .format(endpoint_id, page_size, params))
+        return RecursiveLsResponse(self, endpoint_id, 0, True, params,
+                                   page_size=page_size,
+                                   exclude_dirs=exclude_dirs, include=include,
+                                   max_entries=max_entries)
+
     # TDOD: Remove this function when endpoints natively support recursive ls
     def recursive_operation_ls(self, endpoint_id,
-                               depth=3, filter_after_first=True, **params):
+                               depth=3, filter_after_first=True,
+                               page_size=LS_PAGE_SIZE, exclude_dirs=(),
+                               include=(), max_entries=None,
+                               entry_filter=None, **params):
         """
         Makes recursive calls to ``GET /operation/endpoint/<endpoint_id>/ls``
         Does not preserve access to top level operation_ls fields, but
         adds a "path" field for every item that represents the full
         path to that item.
-        :rtype: iterable of :class:`GlobusResponse
-                <globus_sdk.response.GlobusResponse>`
+        :rtype: iterable of :class:`LsEntry
+                <globus_cli.services.ls_stream.LsEntry>`
         **Parameters**
             ``endpoint_id`` (*string*)
               The endpoint being recursively ls'ed. If no "path" is given in
@@ -77,6 +128,22 @@ class RetryingTransferClient(TransferClient):
             ``filter_after_first`` (*bool*)
               If False, any "filter" in params will only be applied to the
               first, top level ls, all results beyond that will be unfiltered.
+            ``page_size`` (*int*)
+              The most entries requested in one ls call. Directories with more
+              entries are listed a page at a time.
+            ``exclude_dirs`` (*iterable of string*)
+              Glob patterns of directory names. Matching directories are
+              neither listed nor descended into.
+            ``include`` (*iterable of string*)
+              Glob patterns of names. If any are given, only matching entries
+              are listed, though all directories are still descended into.
+            ``max_entries`` (*int*)
+              The most entries listed, after which no more calls are made.
+            ``entry_filter`` (:class:`EntryFilter
+            <globus_cli.services.ls_filters.EntryFilter>`)
+              Only entries it matches are listed, though all directories are
+              still descended into. Its filter clauses are sent with every
+              call they can be.
             ``params``
               Parameters that will be passed through as query params.
         **Examples**
@@ -95,7 +162,11 @@ class RetryingTransferClient(TransferClient):
         self.logger.info("TransferClient.recursive_operation_ls({}, {}, {})"
                          .format(endpoint_id, depth, params))
         return RecursiveLsResponse(self, endpoint_id,
-                                   depth, filter_after_first, params)
+                                   depth, filter_after_first, params,
+                                   page_size=page_size,
+                                   exclude_dirs=exclude_dirs, include=include,
+                                   max_entries=max_entries,
+                                   entry_filter=entry_filter)
 
 
 def _update_access_tokens(token_response):
@@ -123,18 +194,6 @@ def display_name_or_cname(ep_doc):
     return ep_doc['display_name'] or ep_doc['canonical_name']
 
 
-def iterable_response_to_dict(iterator):
-    output_dict = {'DATA': []}
-    for item in iterator:
-        dat = item
-        try:
-            dat = item.data
-        except AttributeError:
-            pass
-        output_dict['DATA'].append(dat)
-    return output_dict
-
-
 def assemble_generic_doc(datatype, **kwargs):
     doc = {'DATA_TYPE': datatype}
     for key, val in kwargs.items():
@@ -210,29 +269,166 @@ def activation_requirements_help_text(res, ep_id):
     return "".join(lines)
 
 
+def _check_autoactivation(res, endpoint_id):
+    """
+    Given an autoactivation response, tell the user how to activate the
+    endpoint and exit if auto-activation failed. Otherwise, cache the
+    activation and return the response.
+    """
+    if res["code"] == "AutoActivationFailed":
+
+        message = ("The endpoint could not be auto-activated and must be "
+                   "activated before it can be used.\n\n" +
+                   activation_requirements_help_text(res, endpoint_id))
+
+        safeprint(message, write_to_stderr=True)
+        click.get_current_context().exit(1)
+
+    else:
+        cache_activation(endpoint_id, res)
+        return res
+
+
 def autoactivate(client, endpoint_id, if_expires_in=None):
     """
     Attempts to auto-activate the given endpoint with the given client
     If auto-activation fails, parses the returned activation requirements
     to determine which methods of activation are supported, then tells
     the user to use 'globus endpoint activate' with the correct options(s)
+
+    Does nothing if the endpoint's activation is cached, and is not close to
+    expiring.
     """
+    if activation_is_cached(endpoint_id):
+        return None
+
     kwargs = {}
     if if_expires_in is not None:
         kwargs['if_expires_in'] = if_expires_in
 
     res = client.endpoint_autoactivate(endpoint_id, **kwargs)
-    if res["code"] == "AutoActivationFailed":
+    return _check_autoactivation(res, endpoint_id)
 
-        message = ("The endpoint could not be auto-activated and must be "
-                   "activated before it can be used.\n\n" +
-                   activation_requirements_help_text(res, endpoint_id))
 
-        safeprint(message, write_to_stderr=True)
-        click.get_current_context().exit(1)
+class BackgroundAutoactivation(object):
+    """
+    Auto-activates one or more endpoints in background threads, concurrently
+    with one another and with whatever the command does next (reading batch
+    input, for example).
+
+    Call `wait()` before relying on the endpoints being active. Failures are
+    handled there, in the calling thread, exactly as `autoactivate` handles
+    them.
+
+    Endpoints whose activation is cached are skipped, unless `invalidate()`
+    is called.
+
+    Each thread makes its own client with ``client_factory`` (by default,
+    `get_client`), as clients and their sessions aren't safe to share with
+    the calling thread.
+    """
+    def __init__(self, endpoint_ids, if_expires_in=None, client_factory=None):
+        # an endpoint given twice (e.g. as source and dest) is done once
+        self.endpoint_ids = []
+        for endpoint_id in endpoint_ids:
+            if endpoint_id not in self.endpoint_ids:
+                self.endpoint_ids.append(endpoint_id)
+
+        self.client_factory = client_factory or get_client
+        self.kwargs = {}
+        if if_expires_in is not None:
+            self.kwargs['if_expires_in'] = if_expires_in
+
+        self.outcomes = {}
+        self.checked = False
+        self.threads = []
+        for endpoint_id in self.endpoint_ids:
+            if not activation_is_cached(endpoint_id):
+                self._start(endpoint_id)
+
+    def _start(self, endpoint_id):
+        thread = threading.Thread(target=self._activate,
+                                  args=(endpoint_id, self.kwargs))
+        thread.daemon = True
+        thread.start()
+        self.threads.append(thread)
+
+    def _activate(self, endpoint_id, kwargs):
+        try:
+            client = self.client_factory()
+            res = client.endpoint_autoactivate(endpoint_id, **kwargs)
+            self.outcomes[endpoint_id] = (res, None)
+        except Exception:
+            self.outcomes[endpoint_id] = (None, sys.exc_info())
+
+    def wait(self, check=True):
+        """
+        Wait for every autoactivation to finish, and handle any failure.
+        Safe to call more than once.
+
+        With ``check=False``, failures are ignored, and only successful
+        activations are cached -- for when a call on the endpoints has
+        already succeeded, and a failure here must not undo it. A later
+        `wait()` still handles them.
+        """
+        for thread in self.threads:
+            thread.join()
+
+        if self.checked:
+            return
+        self.checked = check
+        for endpoint_id in self.endpoint_ids:
+            if endpoint_id not in self.outcomes:
+                continue
+            res, exc_info = self.outcomes[endpoint_id]
+            if check:
+                if exc_info is not None:
+                    reraise(*exc_info)
+                _check_autoactivation(res, endpoint_id)
+            elif exc_info is None and res["code"] != "AutoActivationFailed":
+                cache_activation(endpoint_id, res)
+
+    def invalidate(self):
+        """
+        Drop the cached activations of every endpoint, and autoactivate all
+        of them again. `wait()` must be called again.
+        """
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        self.outcomes = {}
+        self.checked = False
+        for endpoint_id in self.endpoint_ids:
+            invalidate_activation(endpoint_id)
+            self._start(endpoint_id)
 
-    else:
-        return res
+
+def call_with_background_autoactivation(activation, f, *args, **kwargs):
+    """
+    Call f(*args, **kwargs) without waiting for `activation` to complete.
+
+    If the call fails because the endpoint is not activated, invalidate any
+    cached activation, wait for activation, and try again. Either way,
+    `activation` has been waited on by the time the result is returned, but
+    only handles its failures if the call needed it: a call which succeeded
+    (creating a directory, say) is never reported as a failure.
+
+    `activation` may be None, in which case f is simply called.
+    """
+    if activation is None:
+        return f(*args, **kwargs)
+
+    try:
+        res = f(*args, **kwargs)
+    except TransferAPIError as err:
+        if err.code != 'ClientError.ActivationRequired':
+            raise
+        activation.invalidate()
+        activation.wait()
+        return f(*args, **kwargs)
+
+    activation.wait(check=False)
+    return res
 
 
 def get_endpoint_w_server_list(endpoint_id):
@@ -267,83 +463,242 @@ def get_endpoint_w_server_list(endpoint_id):
         return (endpoint, client.endpoint_server_list(endpoint_id))
 
 
+_SLEEPY_CAT = """\
+   |\      _,,,---,,_
+   /,`.-'`'    -.  ;-;;,_
+  |,4-  ) )-,_..;\ (  `'-'
+ '---''(_/--'  `-'\_)"""
+
+_AWAKE_CAT = """\
+                  _..
+  /}_{\           /.-'
+ ( a a )-.___...-'/
+ ==._.==         ;
+      \ i _..._ /,
+      {_;/   {_//"""
+
+# the most task IDs given in a single `task_id` filter on task_list
+TASK_LIST_FILTER_MAX = 50
+
+# without a fixed polling interval, tasks are polled after this many seconds,
+# then at doubling intervals up to the cap
+ADAPTIVE_POLLING_START = 1
+ADAPTIVE_POLLING_CAP = 60
+
+
+def get_tasks_by_id(client, task_ids):
+    """
+    Fetch several tasks with as few calls as possible: one `task_list` call
+    filtered by `task_id` per TASK_LIST_FILTER_MAX tasks.
+
+    Returns a dict mapping task IDs to task documents (as dicts).
+    """
+    tasks = {}
+    for start in range(0, len(task_ids), TASK_LIST_FILTER_MAX):
+        group = task_ids[start:start + TASK_LIST_FILTER_MAX]
+        for doc in client.task_list(
+                num_results=len(group),
+                filter='task_id:{}'.format(','.join(group))):
+            tasks[doc['task_id']] = doc.data
+
+        # task_list only shows tasks owned by the caller -- look up any others
+        # directly, which also fails properly for bad IDs
+        for task_id in group:
+            if task_id not in tasks:
+                tasks[task_id] = client.get_task(task_id).data
+    return tasks
+
+
+def task_is_done(task):
+    """
+    A task wait is over once the task is no longer ACTIVE -- succeeded,
+    failed, or INACTIVE (paused, e.g. for lack of activation).
+    """
+    return task['status'] != 'ACTIVE'
+
+
+class TaskPollingSchedule(object):
+    """
+    Decides how long to sleep between task status checks.
+
+    With a fixed ``polling_interval``, that's always the answer. Otherwise,
+    intervals start short and double up to ADAPTIVE_POLLING_CAP. When a task's
+    subtask counts show it making progress, the interval is also kept to half
+    of its estimated time remaining, so that completion is noticed promptly.
+    """
+    def __init__(self, polling_interval=None):
+        self.fixed_interval = polling_interval
+        self.interval = ADAPTIVE_POLLING_START
+        self.last_progress = None
+
+    def reset(self):
+        """
+        Go back to short intervals, e.g. because something changed.
+        """
+        self.interval = ADAPTIVE_POLLING_START
+
+    def _estimated_time_remaining(self, task, now):
+        total = task.get('subtasks_total')
+        if not total:
+            return None
+        pending = ((task.get('subtasks_pending') or 0) +
+                   (task.get('subtasks_retrying') or 0))
+        done = total - pending
+
+        last, self.last_progress = self.last_progress, (now, done)
+        if last is None or done <= last[1] or now <= last[0]:
+            return None
+        rate = float(done - last[1]) / (now - last[0])
+        return pending / rate
+
+    def next_interval(self, task=None):
+        """
+        Given the latest status of the task (if there is a single task), get
+        the number of seconds to wait before checking it again.
+        """
+        if self.fixed_interval:
+            return self.fixed_interval
+
+        interval = self.interval
+        self.interval = min(self.interval * 2, ADAPTIVE_POLLING_CAP)
+
+        if task is not None:
+            remaining = self._estimated_time_remaining(task, time.time())
+            if remaining is not None:
+                interval = max(ADAPTIVE_POLLING_START,
+                               min(interval, remaining / 2))
+        return interval
+
+
 def task_wait_with_io(meow, heartbeat, polling_interval, timeout, task_id,
                       client=None):
     """
     Options are the core "task wait" options, including the `--meow` easter
-    egg.
+    egg. A `polling_interval` of None polls on an adaptive schedule, as
+    defined by TaskPollingSchedule.
 
     This does the core "task wait" loop, including all of the IO.
     It *does exit* on behalf of the caller. (We can enhance with a
     `noabort=True` param or somesuch in the future if necessary.)
+
+    The result of the last status check is the one printed, so there is no
+    extra fetch of the task after it completes or the wait times out.
     """
     client = client or get_client()
+    schedule = TaskPollingSchedule(polling_interval)
 
-    def timed_out(waited_time):
-        if timeout is None:
-            return False
-        else:
-            return waited_time >= timeout
-
-    def check_completed():
-        completed = client.task_wait(task_id, timeout=polling_interval,
-                                     polling_interval=polling_interval)
-        if completed:
-            if heartbeat:
-                safeprint('', write_to_stderr=True)
-            # meowing tasks wake up!
-            if meow:
-                safeprint("""\
-                  _..
-  /}_{\           /.-'
- ( a a )-.___...-'/
- ==._.==         ;
-      \ i _..._ /,
-      {_;/   {_//""", write_to_stderr=True)
+    # Tasks start out sleepy
+    if meow:
+        safeprint(_SLEEPY_CAT, write_to_stderr=True)
+
+    waited_time = 0
+    task = client.get_task(task_id)
+    while (not task_is_done(task) and
+           (timeout is None or waited_time < timeout)):
+        interval = schedule.next_interval(task)
+        # never sleep past the timeout
+        if timeout is not None:
+            interval = min(interval, timeout - waited_time)
+        time.sleep(interval)
+        waited_time += interval
+
+        task = client.get_task(task_id)
+        if heartbeat and not task_is_done(task):
+            safeprint('.', write_to_stderr=True, newline=False)
+            sys.stderr.flush()
+
+    if heartbeat:
+        safeprint('', write_to_stderr=True)
 
-            # TODO: possibly update TransferClient.task_wait so that we don't
-            # need to do an extra fetch to get the task status after completion
-            res = client.get_task(task_id)
-            formatted_print(res, text_format=FORMAT_SILENT)
+    if task_is_done(task):
+        # meowing tasks wake up!
+        if meow:
+            safeprint(_AWAKE_CAT, write_to_stderr=True)
+    else:
+        safeprint('Task has yet to complete after {} seconds'.format(timeout),
+                  write_to_stderr=True)
+
+    # output json if requested, but nothing for text mode
+    formatted_print(task, text_format=FORMAT_SILENT)
 
-            status = res['status']
-            if status == 'SUCCEEDED':
-                click.get_current_context().exit(0)
-            else:
-                click.get_current_context().exit(1)
+    if task['status'] == 'SUCCEEDED':
+        click.get_current_context().exit(0)
+    else:
+        click.get_current_context().exit(1)
 
-        return completed
+
+def task_wait_multiple_with_io(meow, heartbeat, polling_interval, timeout,
+                               task_ids, wait_for_all=True, client=None):
+    """
+    The "task wait" loop, over several tasks at once.
+
+    All of the tasks are polled together, with one `task_list` call filtered
+    by `task_id` (per TASK_LIST_FILTER_MAX tasks), and tasks are dropped from
+    the poll as they finish. Stops once every task has finished, or with
+    `wait_for_all=False`, once any task has.
+
+    Prints the last known state of every task, and *does exit* on behalf of
+    the caller: with status 0 if every task succeeded (or any finished task
+    succeeded, for `wait_for_all=False`), and 1 otherwise.
+    """
+    client = client or get_client()
+    schedule = TaskPollingSchedule(polling_interval)
+
+    # drop duplicates, but keep the order given
+    task_ids = list(OrderedDict((task_id, None) for task_id in task_ids))
+    tasks = {}
+
+    def poll(pending):
+        tasks.update(get_tasks_by_id(client, pending))
+        return [task_id for task_id in pending
+                if not task_is_done(tasks[task_id])]
+
+    def is_done(pending):
+        if wait_for_all:
+            return not pending
+        return len(pending) < len(task_ids)
 
     # Tasks start out sleepy
     if meow:
-        safeprint("""\
-   |\      _,,,---,,_
-   /,`.-'`'    -.  ;-;;,_
-  |,4-  ) )-,_..;\ (  `'-'
- '---''(_/--'  `-'\_)""", write_to_stderr=True)
+        safeprint(_SLEEPY_CAT, write_to_stderr=True)
 
     waited_time = 0
-    while (not timed_out(waited_time) and
-           not check_completed()):
+    pending = poll(task_ids)
+    while not is_done(pending) and (timeout is None or waited_time < timeout):
         if heartbeat:
             safeprint('.', write_to_stderr=True, newline=False)
             sys.stderr.flush()
 
-        waited_time += polling_interval
+        interval = schedule.next_interval()
+        if timeout is not None:
+            interval = min(interval, timeout - waited_time)
+        time.sleep(interval)
+        waited_time += interval
+        pending = poll(pending)
 
-    # add a trailing newline to heartbeats if we fail
     if heartbeat:
         safeprint('', write_to_stderr=True)
 
-    if timed_out(waited_time):
-        safeprint('Task has yet to complete after {} seconds'.format(timeout),
+    if is_done(pending):
+        # meowing tasks wake up!
+        if meow:
+            safeprint(_AWAKE_CAT, write_to_stderr=True)
+    else:
+        safeprint('{} of {} tasks have yet to complete after {} seconds'
+                  .format(len(pending), len(task_ids), timeout),
                   write_to_stderr=True)
 
-    # output json if requested, but nothing for text mode
-    res = client.get_task(task_id)
-    formatted_print(res, text_format=FORMAT_SILENT)
+    formatted_print({'DATA': [tasks[task_id] for task_id in task_ids]},
+                    response_key='DATA',
+                    fields=(('Task ID', 'task_id'), ('Status', 'status'),
+                            ('Label', 'label')))
 
-    click.get_current_context().exit(1)
+    statuses = [tasks[task_id]['status'] for task_id in task_ids]
+    if wait_for_all:
+        success = all(status == 'SUCCEEDED' for status in statuses)
+    else:
+        success = 'SUCCEEDED' in statuses
+    click.get_current_context().exit(0 if success else 1)
 
 
 ENDPOINT_LIST_FIELDS = (('ID', 'id'), ('Owner', 'owner_string'),
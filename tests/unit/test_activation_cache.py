@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+from globus_cli.services import activation_cache
+from globus_cli.services.activation_cache import (
+    activation_is_cached, cache_activation, invalidate_activation)
+
+
+class ActivationCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.path = path = os.path.join(tmpdir, 'cli',
+                                        'activation_cache.json')
+
+        self.token = 'refresh-token-1'
+        for patcher in (
+                patch.object(activation_cache, '_cache_path',
+                             lambda: path),
+                patch.object(activation_cache, 'lookup_option',
+                             lambda option: self.token)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_cache_and_invalidate(self):
+        self.assertFalse(activation_is_cached('ep1'))
+        cache_activation('ep1', {'code': 'AutoActivated.CachedCredential',
+                                 'expires_in': 86400})
+        cache_activation('ep2', {'code': 'AlreadyActivated',
+                                 'expires_in': -1})
+        self.assertTrue(activation_is_cached('ep1'))
+        self.assertTrue(activation_is_cached('ep2'))
+
+        invalidate_activation('ep1')
+        self.assertFalse(activation_is_cached('ep1'))
+        self.assertTrue(activation_is_cached('ep2'))
+
+        invalidate_activation()
+        self.assertFalse(activation_is_cached('ep2'))
+
+    def test_private_file(self):
+        """
+        Confirms the cache is readable only by the user, without the umask
+        being changed, and that no temporary file is left behind.
+        """
+        umask = os.umask(0o022)
+        try:
+            cache_activation('ep1', {'code': 'AlreadyActivated',
+                                     'expires_in': -1})
+            self.assertEqual(os.umask(0o022), 0o022)
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)),
+                         ['activation_cache.json'])
+
+    def test_not_comfortably_valid(self):
+        """
+        Confirms that activations close to expiring, and failures, are not
+        treated as cached.
+        """
+        cache_activation('ep1', {'code': 'AlreadyActivated',
+                                 'expires_in': 120})
+        cache_activation('ep2', {'code': 'AutoActivationFailed',
+                                 'expires_in': 0})
+        self.assertFalse(activation_is_cached('ep1'))
+        self.assertFalse(activation_is_cached('ep2'))
+
+    def test_keyed_by_identity(self):
+        cache_activation('ep1', {'code': 'AlreadyActivated',
+                                 'expires_in': 86400})
+        self.token = 'refresh-token-2'
+        self.assertFalse(activation_is_cached('ep1'))
+
+    def test_max_age(self):
+        cache_activation('ep1', {'code': 'AlreadyActivated',
+                                 'expires_in': 86400})
+        later = time.time() + activation_cache.CACHE_MAX_AGE
+        with patch.object(activation_cache.time, 'time', lambda: later):
+            self.assertFalse(activation_is_cached('ep1'))
@@ -0,0 +1,114 @@
+import threading
+import unittest
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+from globus_sdk import TransferAPIError
+
+from globus_cli.services.transfer import (
+    BackgroundAutoactivation, call_with_background_autoactivation)
+
+
+class FakeResponse(object):
+    status_code = 409
+    headers = {'Content-Type': 'application/json'}
+    text = ''
+
+    def json(self):
+        return {'code': 'ClientError.ActivationRequired',
+                'message': 'Inactive', 'request_id': 'abc123'}
+
+
+class FakeClient(object):
+    """
+    An endpoint which only becomes active once autoactivation completes,
+    which in turn waits on ``self.release``.
+    """
+    def __init__(self):
+        self.release = threading.Event()
+        self.activated = []
+        self.ls_calls = 0
+
+    def endpoint_autoactivate(self, endpoint_id, **params):
+        self.release.wait()
+        self.activated.append(endpoint_id)
+        return {'code': 'AutoActivated.CachedCredential'}
+
+    def operation_ls(self, endpoint_id, **params):
+        self.ls_calls += 1
+        if endpoint_id not in self.activated:
+            self.release.set()
+            raise TransferAPIError(FakeResponse())
+        return {'DATA': []}
+
+
+class BackgroundAutoactivationTests(unittest.TestCase):
+
+    def setUp(self):
+        # nothing is cached, and nothing is written to the cache
+        patcher = patch('globus_cli.services.activation_cache._entry_prefix',
+                        lambda: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_endpoints_activated_once(self):
+        client = FakeClient()
+        activation = BackgroundAutoactivation(
+            ('a', 'b', 'a'), client_factory=lambda: client)
+        client.release.set()
+        activation.wait()
+        activation.wait()
+        self.assertEqual(sorted(client.activated), ['a', 'b'])
+
+    def test_retry_after_activation(self):
+        """
+        Confirms that a call which fails because the endpoint is inactive is
+        retried once activation finishes.
+        """
+        client = FakeClient()
+        activation = BackgroundAutoactivation(
+            ('ep',), client_factory=lambda: client)
+        res = call_with_background_autoactivation(
+            activation, client.operation_ls, 'ep')
+        self.assertEqual(res, {'DATA': []})
+        self.assertEqual(client.ls_calls, 2)
+
+    def test_failure_after_success(self):
+        """
+        Confirms a call which succeeds isn't reported as a failure when
+        activation fails, but a later check still handles the failure.
+        """
+        client = FakeClient()
+        client.endpoint_autoactivate = lambda endpoint_id, **params: {
+            'code': 'AutoActivationFailed', 'DATA': []}
+        activation = BackgroundAutoactivation(
+            ('ep',), client_factory=lambda: client)
+        res = call_with_background_autoactivation(
+            activation, lambda: {'code': 'DirectoryCreated'})
+        self.assertEqual(res, {'code': 'DirectoryCreated'})
+
+        with patch('globus_cli.services.transfer.click') as click, \
+                patch('globus_cli.services.transfer.safeprint'), \
+                patch('globus_cli.services.transfer.'
+                      'activation_requirements_help_text', lambda *a: ''):
+            activation.wait()
+        click.get_current_context().exit.assert_called_once_with(1)
+
+    def test_own_clients(self):
+        """
+        Confirms each endpoint is activated with a client of its own.
+        """
+        clients = []
+
+        def client_factory():
+            client = FakeClient()
+            client.release.set()
+            clients.append(client)
+            return client
+        activation = BackgroundAutoactivation(
+            ('a', 'b'), client_factory=client_factory)
+        activation.wait()
+        self.assertEqual(sorted(client.activated[0] for client in clients),
+                         ['a', 'b'])
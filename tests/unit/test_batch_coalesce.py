@@ -0,0 +1,75 @@
+import unittest
+
+from globus_sdk import TransferAPIError
+
+from globus_cli.services.batch_coalesce import coalesce_transfer_items
+
+
+class FakeResponse(object):
+    status_code = 403
+    headers = {'Content-Type': 'application/json'}
+    text = ''
+
+    def json(self):
+        return {'code': 'PermissionDenied', 'message': 'Denied',
+                'request_id': 'abc123'}
+
+
+class FakeClient(object):
+    """
+    Serves directory listings from a dict of path -> {name: type}.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.listed = []
+
+    def operation_ls(self, endpoint_id, path=None, **params):
+        self.listed.append(path)
+        if path not in self.tree:
+            raise TransferAPIError(FakeResponse())
+        return [{'name': name, 'type': entry_type}
+                for name, entry_type in self.tree[path].items()]
+
+
+class CoalesceTransferItemsTests(unittest.TestCase):
+
+    def test_coalesces_nested_directories(self):
+        """
+        Lists every file of a tree, and confirms the whole tree becomes one
+        recursive item, while a partially listed sibling directory does not.
+        """
+        client = FakeClient({
+            '/data': {'a': 'dir', 'b': 'dir'},
+            '/data/a': {'1': 'file', '2': 'file'},
+            '/data/b': {'3': 'file', '4': 'file'},
+            '/other': {'5': 'file', '6': 'file', '7': 'file'},
+        })
+        items = [('/data/a/1', '/dst/a/1', False),
+                 ('/data/a/2', '/dst/a/2', False),
+                 ('/data/b/3', '/dst/b/3', False),
+                 ('/data/b/4', '/dst/b/4', False),
+                 ('/other/5', '/out/5', False),
+                 ('/other/6', '/out/6', False)]
+        self.assertEqual(coalesce_transfer_items(client, 'ep', items),
+                         [('/data', '/dst', True),
+                          ('/other/5', '/out/5', False),
+                          ('/other/6', '/out/6', False)])
+
+    def test_duplicates_and_mismatched_destinations(self):
+        """
+        Confirms exact duplicates are dropped, and that a directory whose
+        items go to different destination directories is left alone.
+        """
+        client = FakeClient({'/d': {'x': 'file', 'y': 'file'}})
+        items = [('/d/x', '/one/x', False),
+                 ('/d/x', '/one/x', False),
+                 ('/d/y', '/two/y', False)]
+        self.assertEqual(coalesce_transfer_items(client, 'ep', items),
+                         [('/d/x', '/one/x', False),
+                          ('/d/y', '/two/y', False)])
+
+    def test_unlistable_directory(self):
+        client = FakeClient({})
+        items = [('/d/x', '/e/x', False), ('/d/y', '/e/y', False)]
+        self.assertEqual(coalesce_transfer_items(client, 'ep', items), items)
+        self.assertEqual(client.listed, ['/d'])
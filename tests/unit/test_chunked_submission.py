@@ -0,0 +1,137 @@
+import functools
+import threading
+import unittest
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+from click.testing import CliRunner
+from globus_sdk import TransferData, DeleteData
+
+from globus_cli.commands.delete import delete_command
+from globus_cli.services.chunked_submission import ChunkedTaskSubmitter
+
+EP = 'ddb59aef-6d04-11e5-ba46-22000b92c6ec'
+
+
+class FakeClient(object):
+    """
+    Records submitted documents in place of the Transfer service.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.submitted = []
+        self.ids_issued = 0
+
+    def get_submission_id(self):
+        with self.lock:
+            self.ids_issued += 1
+            return {'value': 'generated-{}'.format(self.ids_issued)}
+
+    def submit_transfer(self, data):
+        with self.lock:
+            self.submitted.append(data)
+            return {'task_id': 'task-' + data['submission_id'],
+                    'message': 'The transfer has been accepted'}
+
+    submit_delete = submit_transfer
+
+
+class ChunkedTaskSubmitterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeClient()
+
+    def _submitter(self, document, **kwargs):
+        return ChunkedTaskSubmitter(
+            document, client_factory=lambda: self.client, **kwargs)
+
+    def test_max_items(self):
+        """
+        Submits 25 items with a limit of 10 per task, confirms that three
+        tasks are submitted with distinct submission IDs and all items.
+        """
+        tdata = TransferData(self.client, 'src', 'dst',
+                             submission_id='given')
+        submitter = self._submitter(tdata, max_items=10)
+        for i in range(25):
+            submitter.add_item('/src/{}'.format(i), '/dst/{}'.format(i))
+        results = submitter.finish()
+
+        self.assertEqual([r['item_count'] for r in results], [10, 10, 5])
+        self.assertEqual(results[0]['submission_id'], 'given')
+        self.assertEqual(len(set(r['submission_id'] for r in results)), 3)
+
+        paths = sorted(item['source_path'] for doc in self.client.submitted
+                       for item in doc['DATA'])
+        self.assertEqual(paths, sorted('/src/{}'.format(i)
+                                       for i in range(25)))
+        for doc in self.client.submitted:
+            self.assertEqual(doc['source_endpoint'], 'src')
+
+    def test_max_payload_bytes(self):
+        """
+        Confirms chunks stay under the payload size limit.
+        """
+        ddata = DeleteData(self.client, 'ep', submission_id='given')
+        submitter = self._submitter(ddata, max_payload_bytes=2000)
+        for i in range(100):
+            submitter.add_item('/some/long/path/{:050d}'.format(i))
+        results = submitter.finish()
+
+        self.assertGreater(len(results), 1)
+        self.assertEqual(sum(r['item_count'] for r in results), 100)
+
+    def test_dry_run(self):
+        """
+        Confirms nothing is submitted in a dry-run, but chunks are built.
+        """
+        ddata = DeleteData(self.client, 'ep', submission_id='given')
+        submitter = self._submitter(ddata, max_items=2, dry_run=True)
+        for i in range(5):
+            submitter.add_item('/{}'.format(i))
+        submitter.finish()
+
+        self.assertEqual(self.client.submitted, [])
+        self.assertEqual([len(doc['DATA']) for _, doc in submitter.chunks],
+                         [2, 2, 1])
+
+    def test_resubmission(self):
+        """
+        Confirms given submission IDs are used for the chunks, in order, and
+        that every chunk's ID is known before it is submitted.
+        """
+        ddata = DeleteData(self.client, 'ep', submission_id='given')
+        submitter = self._submitter(
+            ddata, max_items=2, submission_ids=['first', 'second'])
+        for i in range(5):
+            submitter.add_item('/{}'.format(i))
+        self.assertEqual([r['submission_id'] for r in submitter.manifest],
+                         ['first', 'second'])
+        results = submitter.finish()
+        self.assertEqual([r['submission_id'] for r in results],
+                         ['first', 'second', 'generated-1'])
+
+    def test_batch_fails_partway(self):
+        """
+        Confirms chunks submitted before a bad line of batch input are
+        reported, and the chunk being filled is not submitted.
+        """
+        submitter = functools.partial(ChunkedTaskSubmitter,
+                                      client_factory=lambda: self.client)
+        with patch('globus_cli.commands.delete.get_client',
+                   lambda: self.client), \
+                patch('globus_cli.commands.delete.ChunkedTaskSubmitter',
+                      submitter):
+            result = CliRunner().invoke(delete_command, [
+                EP + ':/', '--batch', '--max-items-per-task', '2',
+                '--skip-activation-check', '--submission-id', 'given'],
+                input='a\nb\nc\nd\ne\nf g\nh\n')
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertEqual(sorted(doc['submission_id']
+                                for doc in self.client.submitted),
+                         ['generated-1', 'given'])
+        for submission_id in ('given', 'generated-1'):
+            self.assertIn('task-' + submission_id, result.output)
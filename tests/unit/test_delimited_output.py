@@ -0,0 +1,72 @@
+import json
+import unittest
+
+import click
+from click.testing import CliRunner
+
+from globus_cli.parsing.command_state import CommandState
+from globus_cli.safeio import formatted_print, FORMAT_TEXT_RECORD
+
+ITEMS = [{'id': '1', 'name': 'plain', 'size': 10, 'owner': None},
+         {'id': '2', 'name': 'a, "quoted"\tname', 'size': 0,
+          'owner': 'x\ny'}]
+FIELDS = [('ID', 'id'), ('Name', 'name'), ('Size', 'size'),
+          ('Owner', lambda x: x['owner'])]
+
+
+class DelimitedOutputTests(unittest.TestCase):
+
+    def printed(self, output_format, data, columns=None, **kwargs):
+        state = CommandState()
+        state.output_format = output_format
+        state.columns = columns
+        runner = CliRunner()
+        with runner.isolation() as output:
+            with click.Context(click.Command('x'), obj=state):
+                formatted_print(data, **kwargs)
+            return output.getvalue().decode('utf-8')
+
+    def test_csv(self):
+        """
+        Confirms rows are printed a line each, quoted where needed.
+        """
+        self.assertEqual(
+            self.printed('csv', iter(ITEMS), fields=FIELDS),
+            u'ID,Name,Size,Owner\n'
+            u'1,plain,10,\n'
+            u'2,"a, ""quoted""\tname",0,"x\ny"\n')
+
+    def test_tsv(self):
+        self.assertEqual(
+            self.printed('tsv', {'DATA': ITEMS}, fields=FIELDS,
+                         response_key='DATA'),
+            u'ID\tName\tSize\tOwner\n'
+            u'1\tplain\t10\t\n'
+            u'2\t"a, ""quoted""\tname"\t0\t"x\ny"\n')
+
+    def test_columns(self):
+        """
+        Confirms columns are selected by name or key, ignoring case, in the
+        order given.
+        """
+        self.assertEqual(
+            self.printed('csv', ITEMS, columns=['size', 'owner', 'iD'],
+                         fields=FIELDS),
+            u'Size,Owner,ID\n10,,1\n0,"x\ny",2\n')
+        with self.assertRaises(click.UsageError):
+            self.printed('csv', ITEMS, columns=['missing'], fields=FIELDS)
+
+    def test_record(self):
+        self.assertEqual(
+            self.printed('csv', ITEMS[0], fields=FIELDS,
+                         text_format=FORMAT_TEXT_RECORD),
+            u'ID,Name,Size,Owner\n1,plain,10,\n')
+
+    def test_no_fields(self):
+        """
+        Confirms output without fields falls back to JSON.
+        """
+        self.assertEqual(
+            json.loads(self.printed('csv', {'message': 'done'},
+                                    simple_text='done')),
+            {'message': 'done'})
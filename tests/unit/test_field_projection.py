@@ -0,0 +1,72 @@
+import unittest
+
+import click
+import jmespath
+
+from globus_cli.helpers import projected_fields, jmespath_item_keys
+from globus_cli.parsing.command_state import CommandState
+
+
+class JMESPathItemKeysTests(unittest.TestCase):
+
+    def keys(self, expression):
+        keys = jmespath_item_keys(jmespath.compile(expression))
+        return None if keys is None else sorted(keys)
+
+    def test_projections(self):
+        self.assertEqual(self.keys('DATA[*].task_id'), ['task_id'])
+        self.assertEqual(self.keys('DATA[].[task_id, status]'),
+                         ['status', 'task_id'])
+        self.assertEqual(self.keys('DATA[].{id: task_id, x: label.x}'),
+                         ['label', 'task_id'])
+        self.assertEqual(self.keys('DATA[*].files[*].name'), ['files'])
+        self.assertEqual(self.keys('DATA[].task_id | [0]'), ['task_id'])
+        self.assertEqual(
+            self.keys("DATA[?status=='ACTIVE' && !is_paused].task_id"),
+            ['is_paused', 'status', 'task_id'])
+        self.assertEqual(self.keys('DATA[].sort_by(files, &size)'),
+                         ['files'])
+
+    def test_unsupported(self):
+        for expression in ('DATA', 'DATA[*]', 'DATA[0].task_id',
+                           'DATA[].*', 'DATA[].[task_id, length(@)]',
+                           'sort_by(DATA, &label)[].task_id',
+                           'OTHER[].task_id', 'length(DATA)'):
+            self.assertIsNone(self.keys(expression), expression)
+
+
+class ProjectedFieldsTests(unittest.TestCase):
+
+    def projected(self, output_format, expression=None, columns=None,
+                  **kwargs):
+        state = CommandState()
+        state.output_format = output_format
+        state.columns = columns
+        if expression is not None:
+            state.jmespath_expr = jmespath.compile(expression)
+        with click.Context(click.Command('x'), obj=state):
+            return projected_fields(**kwargs)
+
+    def test_text(self):
+        fields = [('ID', 'id'), ('Name', lambda x: x['display_name'])]
+        self.assertEqual(
+            self.projected('text', fields=fields,
+                           extra_keys=('display_name',)),
+            'display_name,id')
+
+    def test_json(self):
+        fields = [('ID', 'id')]
+        self.assertIsNone(self.projected('json', fields=fields))
+        self.assertEqual(
+            self.projected('json', 'DATA[].[id, owner_string]',
+                           fields=fields),
+            'id,owner_string')
+        self.assertIsNone(self.projected('unix', 'DATA', fields=fields))
+
+    def test_delimited(self):
+        fields = [('ID', 'id'), ('Name', 'display_name'), ('Owner', 'owner')]
+        self.assertEqual(self.projected('csv', fields=fields),
+                         'display_name,id,owner')
+        self.assertEqual(
+            self.projected('tsv', columns=['owner', 'Name'], fields=fields),
+            'display_name,owner')
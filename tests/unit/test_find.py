@@ -0,0 +1,232 @@
+import fnmatch
+import json
+import operator
+import unittest
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from globus_cli.commands.find import find_command
+from globus_cli.parsing import ComparisonType, SIZE_UNITS
+from globus_cli.services.ls_filters import EntryFilter
+from globus_cli.services.ls_stream import StreamingLsResponse
+from globus_cli.services.transfer import RetryingTransferClient
+from tests.unit.test_paged_ls import FakeHTTPResponse
+
+try:
+    from mock import patch, MagicMock
+except ImportError:
+    from unittest.mock import patch, MagicMock
+
+EP = 'ddb59aef-6d04-11e5-ba46-22000b92c6ec'
+NOW = datetime(2017, 6, 15, 12, 0, 0)
+G = 1024 ** 3
+
+# dirs are dicts, and files (size, last_modified) tuples
+TREE = {
+    'big.h5': (20 * G, '2017-06-14 00:00:00+00:00'),
+    'old.h5': (20 * G, '2017-01-01 00:00:00+00:00'),
+    'small.h5': (1024, '2017-06-14 00:00:00+00:00'),
+    'runs': {
+        'a.h5': (11 * G, '2017-06-15 11:00:00+00:00'),
+        'notes.txt': (10, '2017-06-15 11:00:00+00:00'),
+        'b.h5': {},
+        'deeper': {'c.h5': (12 * G, '2017-06-13 12:00:01+00:00')},
+    },
+    '.snapshot': {'big.h5': (20 * G, '2017-06-14 00:00:00+00:00')},
+}
+
+_OPERATORS = (('<=', operator.le), ('>', operator.gt), ('<', operator.lt),
+              ('=', operator.eq))
+
+
+def _clause_matches(clause, entry):
+    field, value = clause.split(':', 1)
+    if field == 'name':
+        return fnmatch.fnmatchcase(entry['name'], value[1:])
+    if field == 'type':
+        return entry['type'] == value
+    for prefix, compare in _OPERATORS:
+        if value.startswith(prefix):
+            bound = value[len(prefix):]
+            if field == 'size':
+                return compare(entry['size'], int(bound))
+            return compare(entry['last_modified'][:19], bound)
+    raise ValueError(clause)
+
+
+class FakeFindClient(object):
+    """
+    Lists a tree, applying filters as the service would, and recording the
+    filter of each call.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.calls = []
+
+    def streaming_operation_ls(self, endpoint_id, path='/', offset=0,
+                               limit=100000, filter=None, **params):
+        self.calls.append((path, filter))
+        node = self.tree
+        for part in path.strip('/').split('/'):
+            if part:
+                node = node[part]
+        entries = []
+        for name in sorted(node):
+            child = node[name]
+            if isinstance(child, dict):
+                entries.append({'name': name, 'type': 'dir', 'size': 4096,
+                                'last_modified': '2017-01-01 00:00:00+00:00',
+                                'link_target': None})
+            else:
+                entries.append({'name': name, 'type': 'file',
+                                'size': child[0], 'last_modified': child[1],
+                                'link_target': None})
+        if filter:
+            entries = [entry for entry in entries
+                       if all(_clause_matches(clause, entry)
+                              for clause in filter.split('/'))]
+        data = {'path': path.rstrip('/') + '/', 'total': len(entries),
+                'DATA': entries[offset:offset + limit]}
+        return StreamingLsResponse(
+            FakeHTTPResponse(json.dumps(data).encode('utf-8')))
+
+
+class FindCommandTests(unittest.TestCase):
+
+    def _run(self, args):
+        fake = FakeFindClient(TREE)
+        client = RetryingTransferClient()
+        client.streaming_operation_ls = fake.streaming_operation_ls
+        with patch('globus_cli.commands.find.get_client', lambda: client), \
+                patch('globus_cli.commands.find.BackgroundAutoactivation',
+                      MagicMock()), \
+                patch('globus_cli.services.recursive_ls.time.sleep'), \
+                patch('globus_cli.services.ls_filters.datetime') as dt:
+            dt.utcnow.return_value = NOW
+            result = CliRunner().invoke(find_command, args)
+        self.assertEqual(result.exit_code, 0, result.output)
+        return result.output.splitlines(), fake
+
+    def test_find(self):
+        """
+        Confirms entries matching all tests are found in the whole tree, with
+        the tests sent as filters for entries and dirs listed separately.
+        """
+        paths, client = self._run(['{}:/'.format(EP), '-name', '*.h5',
+                                   '-type', 'f', '-size', '+10G',
+                                   '-mtime', '-7'])
+        self.assertEqual(sorted(paths), [
+            '/.snapshot/big.h5', '/big.h5', '/runs/a.h5', '/runs/deeper/c.h5'])
+        filters = set(f for _, f in client.calls)
+        self.assertEqual(len(filters), 2)
+        self.assertIn('type:dir', filters)
+        filters.remove('type:dir')
+        self.assertEqual(filters.pop().split('/')[:3],
+                         ['name:~*.h5', 'type:file', 'size:>10737418240'])
+
+    def test_maxdepth(self):
+        """
+        Confirms the last level searched is listed once, with all filters,
+        excluded dirs are skipped, and dirs are found with their paths.
+        """
+        paths, client = self._run(['{}:/'.format(EP), '-maxdepth', '2',
+                                   '-name', '*.h5', '--exclude-dir', '.*'])
+        self.assertEqual(sorted(paths), [
+            '/big.h5', '/old.h5', '/runs/a.h5', '/runs/b.h5', '/small.h5'])
+        self.assertEqual(client.calls, [
+            ('/', None), ('/runs', 'name:~*.h5')])
+
+        paths, client = self._run([EP, '-type', 'd', '-name', 'd*'])
+        self.assertEqual(paths, ['runs/deeper'])
+        self.assertEqual(set(f for _, f in client.calls), set(['type:dir']))
+
+    def test_listed_once(self):
+        """
+        Confirms dirs are only listed twice for selective tests.
+        """
+        paths, client = self._run(['{}:/'.format(EP), '-name', '*.h5'])
+        self.assertEqual(len(paths), 7)
+        self.assertEqual(sorted(client.calls), [
+            ('/', None), ('/.snapshot', None), ('/runs', None),
+            ('/runs/b.h5', None), ('/runs/deeper', None)])
+
+        _, client = self._run(['{}:/'.format(EP), '-size', '+10G'])
+        self.assertEqual(len(client.calls), 10)
+
+    def test_json(self):
+        output, _ = self._run(['{}:/runs'.format(EP), '-size', '-2k',
+                               '-F', 'json'])
+        self.assertEqual([entry['name'] for entry in
+                          json.loads('\n'.join(output))['DATA']],
+                         ['notes.txt'])
+
+
+class EntryFilterTests(unittest.TestCase):
+
+    def _names(self, **kwargs):
+        entry_filter = EntryFilter(now=NOW, **kwargs)
+        return sorted(name for name, child in TREE['runs'].items()
+                      if not isinstance(child, dict) and entry_filter.matches(
+                          {'name': name, 'type': 'file', 'size': child[0],
+                           'last_modified': child[1]}))
+
+    def test_ages(self):
+        """
+        Confirms ages are compared in whole days, as find(1) does.
+        """
+        entry_filter = EntryFilter(age=('=', 1, 1), now=NOW)
+        self.assertEqual(entry_filter.modified_after, '2017-06-13 12:00:00')
+        self.assertEqual(entry_filter.modified_before, '2017-06-14 12:00:00')
+        self.assertEqual(entry_filter.clauses,
+                         ['last_modified:>2017-06-13 12:00:00'])
+        self.assertEqual(EntryFilter(age=('>', 0, 1), now=NOW).clauses,
+                         ['last_modified:<=2017-06-14 12:00:00'])
+        self.assertEqual(EntryFilter(age=('<', 1, 1), now=NOW).clauses,
+                         ['last_modified:>2017-06-14 12:00:00'])
+
+    def test_matches(self):
+        self.assertEqual(self._names(), ['a.h5', 'notes.txt'])
+        self.assertEqual(self._names(name='*.txt'), ['notes.txt'])
+        self.assertEqual(self._names(size=('>', 10, G)), ['a.h5'])
+        self.assertEqual(self._names(size=('=', 10, 1)), ['notes.txt'])
+        self.assertEqual(self._names(age=('=', 0, 1)), ['a.h5', 'notes.txt'])
+        self.assertEqual(self._names(age=('>', 0, 1)), [])
+        self.assertEqual(self._names(entry_type='dir'), [])
+        self.assertEqual(self._names(entry_type='link'), [])
+        self.assertEqual(EntryFilter(name='[ab]*', entry_type='link').clauses,
+                         [])
+
+    def test_sizes(self):
+        """
+        Confirms sizes are rounded up to the unit before they are compared,
+        as find(1) does, in both the check and the filter clauses.
+        """
+        self.assertEqual(self._names(size=('=', 1, 1024)), ['notes.txt'])
+        self.assertEqual(self._names(size=('=', 11, G)), ['a.h5'])
+        self.assertEqual(self._names(size=('<', 12, G)), ['a.h5', 'notes.txt'])
+        self.assertEqual(self._names(size=('<', 1, G)), [])
+        self.assertEqual(self._names(size=('>', 0, G)), ['a.h5', 'notes.txt'])
+        for size, clauses in ((('=', 10, G), ['size:>{}'.format(9 * G)]),
+                              (('=', 10, 1), ['size:=10']),
+                              (('=', 0, G), ['size:<=0']),
+                              (('<', 10, G), ['size:<={}'.format(9 * G)]),
+                              (('<', 0, 1), [])):
+            self.assertEqual(EntryFilter(size=size).clauses, clauses)
+
+
+class ComparisonTypeTests(unittest.TestCase):
+
+    def test_convert(self):
+        size = ComparisonType(SIZE_UNITS)
+        self.assertEqual(size.convert('+10G', None, None), ('>', 10, G))
+        self.assertEqual(size.convert('-1k', None, None), ('<', 1, 1024))
+        self.assertEqual(size.convert('512', None, None), ('=', 512, 1))
+        self.assertEqual(size.convert('3c', None, None), ('=', 3, 1))
+        self.assertEqual(ComparisonType().convert('-7', None, None),
+                         ('<', 7, 1))
+        for value in ('big', '+', '10x', '1.5G'):
+            with self.assertRaises(Exception):
+                size.convert(value, None, None)
+        with self.assertRaises(Exception):
+            ComparisonType().convert('7d', None, None)
@@ -0,0 +1,74 @@
+import json
+import unittest
+
+import click
+import jmespath
+from click.testing import CliRunner
+from globus_sdk import GlobusResponse
+
+from globus_cli.parsing.command_state import CommandState
+from globus_cli.safeio import formatted_print, iterable_response_to_dict
+from globus_cli.safeio.jmespath_stream import (
+    streaming_plan, print_streamed_json)
+
+ITEMS = [{'task_id': str(n), 'status': 'ACTIVE' if n % 3 else 'FAILED',
+          'label': None if n % 2 else 'label{}'.format(n),
+          'files': [{'name': 'f{}'.format(n)}]}
+         for n in range(10)]
+
+
+class StreamingPlanTests(unittest.TestCase):
+
+    def test_same_results(self):
+        """
+        Confirms streamed results, in small chunks, match the expression
+        applied to the whole listing, and are printed identically.
+        """
+        for expression in ('DATA[].task_id', 'DATA[*].label',
+                           "DATA[?status=='ACTIVE'].[task_id, label]",
+                           'DATA[].{id: task_id, f: files[0].name}',
+                           'DATA[*].files[*].name', 'DATA[?label]'):
+            expr = jmespath.compile(expression)
+            plan = streaming_plan(expr)
+            self.assertIsNotNone(plan, expression)
+
+            runner = CliRunner()
+            with runner.isolation() as output:
+                print_streamed_json(
+                    plan, iter(GlobusResponse(x) for x in ITEMS),
+                    chunk_size=3)
+            expected = json.dumps(expr.search({'DATA': ITEMS}), indent=2,
+                                  separators=(',', ': '), sort_keys=True)
+            self.assertEqual(output.getvalue().decode('utf-8'),
+                             expected + '\n', expression)
+
+    def test_not_streamable(self):
+        for expression in ('DATA', 'DATA[0]', 'length(DATA)',
+                           'DATA[].task_id | [0]', 'OTHER[].x'):
+            self.assertIsNone(streaming_plan(jmespath.compile(expression)),
+                              expression)
+
+    def test_formatted_print_streams(self):
+        """
+        Confirms formatted_print consumes the items lazily, printing results
+        before it reaches the end.
+        """
+        state = CommandState()
+        state.jmespath_expr = jmespath.compile('DATA[].task_id')
+        state.output_format = 'json'
+        task_ids = [str(n) for n in range(20000)]
+
+        def items():
+            for task_id in task_ids:
+                if task_id == '19999':
+                    # the buffer has been written out at least once
+                    self.assertIn(b'"199"', output.getvalue())
+                yield {'task_id': task_id}
+
+        runner = CliRunner()
+        with runner.isolation() as output:
+            with click.Context(click.Command('x'), obj=state):
+                formatted_print(items(),
+                                json_converter=iterable_response_to_dict)
+        self.assertEqual(json.loads(output.getvalue().decode('utf-8')),
+                         task_ids)
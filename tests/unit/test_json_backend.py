@@ -0,0 +1,98 @@
+# -*- coding: utf8 -*-
+import json
+import unittest
+
+import click
+from click.testing import CliRunner
+
+from globus_cli.parsing.command_state import CommandState
+from globus_cli.safeio import formatted_print, iterable_response_to_dict
+from globus_cli.safeio import json_backend
+from globus_cli.safeio.json_backend import (
+    dumps, loads, json_list_item, json_list_end, json_text)
+
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+DOCUMENTS = [
+    {'DATA': [{'name': 'file{}'.format(n), 'size': n * 1024, 'type': 'file',
+               'link_target': None, 'permissions': '0644'}
+              for n in range(5)],
+     'path': '/~/', 'empty': {}, 'none': [], 'nested': {'b': [1.5], 'a': 2}},
+    [u'"quoted" \\ / \t\n', u'テスト', b'\xe9'.decode('latin-1'), u'\x7f'],
+    {1: 'non-string key'},
+    2 ** 70,
+    u'plain',
+    [float('nan'), float('inf'), float('-inf')],
+    {'floats': [1e100, 1e16, 1e-05, 0.1, -0.0]},
+]
+
+
+class JSONBackendTests(unittest.TestCase):
+
+    def test_same_as_json(self):
+        """
+        Confirms encoded text matches json's, with and without an accelerated
+        library.
+        """
+        for backend in (json_backend.orjson, None):
+            with patch.object(json_backend, 'orjson', backend):
+                for data in DOCUMENTS:
+                    self.assertEqual(
+                        dumps(data),
+                        json.dumps(data, indent=2, separators=(',', ': '),
+                                   sort_keys=True))
+                    self.assertEqual(
+                        dumps(data, indent=None, sort_keys=False),
+                        json.dumps(data, separators=(',', ':')))
+
+    def test_loads(self):
+        for backend in (json_backend.orjson, None):
+            with patch.object(json_backend, 'orjson', backend):
+                self.assertEqual(loads(u'{"a": [1, "テスト"]}'),
+                                 {'a': [1, u'テスト']})
+                self.assertEqual(loads(str(2 ** 70)), 2 ** 70)
+                with self.assertRaises(ValueError):
+                    loads(u'not json')
+
+    def test_list_items(self):
+        """
+        Confirms lists printed an item at a time match whole documents.
+        """
+        items = DOCUMENTS[0]['DATA']
+        for count in (0, 1, 5):
+            for compact in (False, True):
+                streamed = u'{"DATA":[' if compact else u'{\n  "DATA": ['
+                for index, item in enumerate(items[:count]):
+                    streamed += json_list_item(item, index, depth=1,
+                                               compact=compact)
+                streamed += json_list_end(count, depth=1, compact=compact)
+                streamed += u'}' if compact else u'\n}'
+                self.assertEqual(
+                    streamed,
+                    json_text({'DATA': items[:count]}, compact=compact))
+
+    def test_formatted_print_listing(self):
+        """
+        Confirms listings printed as they are iterated match the documents
+        they would be collected into.
+        """
+        for items in ([], DOCUMENTS[0]['DATA']):
+            for compact in (False, True):
+                state = CommandState()
+                state.output_format = 'json'
+                state.json_compact = compact
+                runner = CliRunner()
+                with runner.isolation() as output:
+                    with click.Context(click.Command('x'), obj=state):
+                        formatted_print(
+                            iter(items),
+                            json_converter=iterable_response_to_dict)
+                    printed = output.getvalue().decode('utf-8')
+                self.assertEqual(printed, json.dumps(
+                    {'DATA': items},
+                    **({'separators': (',', ':')} if compact else
+                       {'indent': 2, 'separators': (',', ': '),
+                        'sort_keys': True})) + '\n')
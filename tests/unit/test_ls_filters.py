@@ -0,0 +1,30 @@
+import fnmatch
+import unittest
+
+from globus_cli.services.ls_filters import glob_matcher, glob_filter
+
+NAMES = ['a.txt', 'b.TXT', '.hidden', 'dir', 'x?y', '[x]', 'a\nb.txt', '']
+
+
+class LsFilterTests(unittest.TestCase):
+
+    def test_glob_matcher(self):
+        """
+        Confirms names match as they would with fnmatch, for any of the
+        patterns.
+        """
+        self.assertIsNone(glob_matcher(()))
+        for globs in (('*.txt',), ('*',), ('?ir', '[[]*'), ('*.txt', 'x?y'),
+                      ('a*b.txt',)):
+            match = glob_matcher(globs)
+            for name in NAMES:
+                self.assertEqual(
+                    bool(match(name)),
+                    any(fnmatch.fnmatchcase(name, glob) for glob in globs),
+                    (globs, name))
+
+    def test_glob_filter(self):
+        self.assertEqual(glob_filter(('*.txt',)), 'name:~*.txt')
+        for globs in ((), ('*.txt', '*.h5'), ('?.txt',), ('[ab].txt',),
+                      ('a,b',)):
+            self.assertIsNone(glob_filter(globs))
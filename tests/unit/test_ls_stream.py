@@ -0,0 +1,113 @@
+# -*- coding: utf8 -*-
+import json
+import unittest
+
+import requests
+from globus_sdk.exc import NetworkError
+
+from globus_cli.services.ls_stream import (
+    LsEntry, StreamingLsResponse, iter_ls_document)
+
+ENTRIES = [{'name': u'file{}'.format(n), 'type': 'file', 'size': 10 ** n,
+            'link_target': None, 'permissions': '0644'}
+           for n in range(5)]
+ENTRIES.append({'name': u'テスト "dir"', 'type': 'dir', 'size': 4096,
+                'last_modified': '2017-01-01 00:00:00+00:00'})
+
+
+class FakeHTTPResponse(object):
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            yield chunk
+        if self.error:
+            raise self.error
+
+    def close(self):
+        self.closed = True
+
+
+def _split(text, size):
+    return [text[n:n + size] for n in range(0, len(text), size)]
+
+
+class LsStreamTests(unittest.TestCase):
+
+    def test_chunk_boundaries(self):
+        """
+        Confirms documents are decoded the same however they are split into
+        chunks, with DATA before or after the other fields.
+        """
+        for document in (
+                u'{"DATA": %s, "path": "/~/", "total": 6}'
+                % json.dumps(ENTRIES),
+                u'{"path":"/~/","DATA":%s,"total":6}'
+                % json.dumps(ENTRIES, separators=(',', ':')),
+                u' {\n  "DATA" : [ ] ,\n  "path": "/"\n}\n',
+                u'{}'):
+            expected = json.loads(document)
+            for size in range(1, len(document) + 1):
+                fields = {}
+                entries = list(iter_ls_document(_split(document, size),
+                                                fields))
+                self.assertEqual(entries, expected.pop('DATA', []))
+                self.assertEqual(fields, expected)
+                expected['DATA'] = entries
+
+    def test_invalid(self):
+        for document in (u'', u'[]', u'{"DATA": [1 2]}', u'{"DATA": [',
+                         u'{"path": "/"', u'{"path": 1}}', u'{1: 2}'):
+            with self.assertRaises(ValueError):
+                list(iter_ls_document(_split(document, 3), {}))
+
+    def test_entries(self):
+        """
+        Confirms records look up, update, and give back their data like the
+        dicts they were made from, and share the layouts of their keys.
+        """
+        entries = [LsEntry(data) for data in ENTRIES]
+        for entry, data in zip(entries, ENTRIES):
+            self.assertEqual(entry.data, data)
+            self.assertEqual(list(entry.data), list(data))
+            for key in data:
+                self.assertIn(key, entry)
+                self.assertEqual(entry[key], data[key])
+                self.assertEqual(entry.get(key), data[key])
+            self.assertNotIn('missing', entry)
+            self.assertIsNone(entry.get('missing'))
+            with self.assertRaises(KeyError):
+                entry['missing']
+        self.assertIs(entries[0]._layout, entries[1]._layout)
+        self.assertIsNot(entries[0]._layout, entries[-1]._layout)
+
+        entry = entries[0]
+        entry['name'] = u'dir/file0'
+        entry['path'] = u'/~/dir/file0'
+        self.assertEqual(entry.data, dict(ENTRIES[0], name=u'dir/file0',
+                                          path=u'/~/dir/file0'))
+        self.assertEqual(entries[1]['name'], u'file1')
+
+    def test_response(self):
+        """
+        Confirms responses decode their bodies, including characters split
+        across chunks, and close them when done.
+        """
+        body = json.dumps({'DATA': ENTRIES, 'path': u'/~/テスト/'},
+                          ensure_ascii=False).encode('utf-8')
+        http_response = FakeHTTPResponse(_split(body, 5))
+        res = StreamingLsResponse(http_response)
+        self.assertEqual([entry.data for entry in res], ENTRIES)
+        self.assertEqual(res['path'], u'/~/テスト/')
+        self.assertEqual(res.count, len(ENTRIES))
+        self.assertTrue(http_response.closed)
+
+        http_response = FakeHTTPResponse(
+            [body[:20]], error=requests.ConnectionError('reset'))
+        with self.assertRaises(NetworkError):
+            list(StreamingLsResponse(http_response))
+        self.assertTrue(http_response.closed)
@@ -0,0 +1,86 @@
+# -*- coding: utf8 -*-
+import errno
+import unittest
+
+from click.testing import CliRunner
+
+from globus_cli.safeio import OutputBuffer
+
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+
+class OutputBufferTests(unittest.TestCase):
+
+    def test_encoding(self):
+        """
+        Confirms text is written out just as safeprint would write it, for the
+        names used in the encoding tests.
+        """
+        names = [u'"', u'a% b', u'テスト', b'\xe9'.decode('latin-1')]
+        runner = CliRunner()
+        with runner.isolation() as output:
+            with OutputBuffer() as buffered:
+                for name in names:
+                    buffered.echo(name)
+                buffered.echo(None)
+                buffered.echo(42, newline=False)
+            printed = output.getvalue()
+        self.assertEqual(printed,
+                         (u'\n'.join(names) + u'\n\n42').encode('utf-8'))
+
+    def test_bytes(self):
+        runner = CliRunner()
+        with runner.isolation() as output:
+            with OutputBuffer() as buffered:
+                buffered.echo(u'a')
+                buffered.echo(b'\xe9')
+                buffered.echo(u'b')
+            printed = output.getvalue()
+        self.assertEqual(printed, b'a\n\xe9\nb\n')
+
+    @patch('globus_cli.safeio.write.out_is_terminal', lambda: False)
+    def test_batches(self):
+        """
+        Confirms text is only written out once the buffer is full, or closed.
+        """
+        with patch('globus_cli.safeio.write.click.echo') as echo:
+            with OutputBuffer(buffer_size=10) as buffered:
+                buffered.echo(u'abcd')
+                buffered.echo(u'efg')
+                self.assertEqual(echo.call_count, 0)
+                buffered.echo(u'hij')
+                self.assertEqual(echo.call_count, 1)
+                buffered.write(u'k')
+            self.assertEqual([call[0][0] for call in echo.call_args_list],
+                             [u'abcd\nefg\nhij\n', u'k'])
+
+    @patch('globus_cli.safeio.write.out_is_terminal', lambda: True)
+    def test_terminal_lines(self):
+        """
+        Confirms that on a terminal, complete lines are written out at once,
+        and parts of lines are held.
+        """
+        with patch('globus_cli.safeio.write.click.echo') as echo:
+            with OutputBuffer() as buffered:
+                buffered.write(u'ab')
+                self.assertEqual(echo.call_count, 0)
+                buffered.write(u'c\nde')
+                self.assertEqual(echo.call_args[0][0], u'abc\n')
+                buffered.echo(u'f')
+                self.assertEqual(echo.call_args[0][0], u'def\n')
+                buffered.write(u'g')
+            self.assertEqual(echo.call_args[0][0], u'g')
+            self.assertEqual(echo.call_count, 3)
+
+    def test_epipe(self):
+        """
+        Confirms a closed pipe ends output quietly.
+        """
+        with patch('globus_cli.safeio.write.click.echo',
+                   side_effect=IOError(errno.EPIPE, 'Broken pipe')):
+            with OutputBuffer(buffer_size=1) as buffered:
+                buffered.echo(u'a')
+                buffered.echo(u'b')
@@ -0,0 +1,218 @@
+import fnmatch
+import json
+import unittest
+
+from globus_cli.services.ls_stream import StreamingLsResponse
+from globus_cli.services.recursive_ls import (
+    RecursiveLsResponse, operation_ls_pages, _PathTree)
+
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+
+class FakeHTTPResponse(object):
+    """
+    Gives a body a few bytes at a time, like a streamed requests.Response.
+    """
+    def __init__(self, body, chunk_size=7):
+        self.body = body
+        self.chunk_size = chunk_size
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeLsClient(object):
+    """
+    Lists a tree of dicts (directories) and Nones (files) by offset, recording
+    each request.
+    """
+    def __init__(self, tree, send_total=True):
+        self.tree = tree
+        self.send_total = send_total
+        self.requests = []
+        self.filters = []
+
+    def streaming_operation_ls(self, endpoint_id, path='/', offset=0,
+                               limit=100000, **params):
+        self.requests.append((path, offset, limit))
+        self.filters.append(params.get('filter'))
+        node = self.tree
+        for part in path.strip('/').split('/'):
+            if part:
+                node = node[part]
+        names = sorted(node)
+        if params.get('filter'):
+            names = fnmatch.filter(names, params['filter'][len('name:~'):])
+        # directory paths end with "/", as the service gives them
+        data = {'path': path.rstrip('/') + '/', 'DATA': [
+            {'name': name, 'type': 'file' if node[name] is None else 'dir'}
+            for name in names[offset:offset + limit]]}
+        if self.send_total:
+            data['total'] = len(names)
+        return StreamingLsResponse(
+            FakeHTTPResponse(json.dumps(data).encode('utf-8')))
+
+
+TREE = {'a': {'x': None, 'y': {'z': None}}, 'b': None, 'c': None, 'd': None,
+        'e': {}}
+
+
+class PagedLsTests(unittest.TestCase):
+
+    def test_pages(self):
+        """
+        Confirms a directory is listed a page at a time, stopping at the total
+        or at a short page.
+        """
+        for send_total, requests in (
+                (True, [('/', 0, 2), ('/', 2, 2), ('/', 4, 2)]),
+                (False, [('/', 0, 2), ('/', 2, 2), ('/', 4, 2)])):
+            client = FakeLsClient(TREE, send_total=send_total)
+            pages = [[x['name'] for x in page]
+                     for page in operation_ls_pages(client, 'ep', page_size=2,
+                                                    path='/')]
+            self.assertEqual(pages, [['a', 'b'], ['c', 'd'], ['e']])
+            self.assertEqual(client.requests, requests)
+
+        client = FakeLsClient({'a': None, 'b': None}, send_total=False)
+        self.assertEqual(len([list(page) for page in operation_ls_pages(
+            client, 'ep', page_size=2)]), 2)
+        client = FakeLsClient({'a': None, 'b': None})
+        self.assertEqual(len([list(page) for page in operation_ls_pages(
+            client, 'ep', page_size=2)]), 1)
+
+    def test_recursive(self):
+        """
+        Confirms recursive listings page each directory, and give the same
+        results whatever the page size.
+        """
+        expected = None
+        for page_size in (1, 2, 100):
+            client = FakeLsClient(TREE)
+            with patch('globus_cli.services.recursive_ls.time.sleep'):
+                names = [x['name'] for x in RecursiveLsResponse(
+                    client, 'ep', 3, True, {'path': '/'},
+                    page_size=page_size)]
+            if expected is None:
+                expected = names
+            self.assertEqual(names, expected)
+            self.assertTrue(all(limit == page_size
+                                for _, _, limit in client.requests))
+        self.assertEqual(expected,
+                         ['a', 'b', 'c', 'd', 'e', 'a/x', 'a/y', 'a/y/z'])
+
+    def test_flat(self):
+        client = FakeLsClient(TREE)
+        names = [x['name'] for x in RecursiveLsResponse(
+            client, 'ep', 0, True, {'path': '/'}, page_size=2)]
+        self.assertEqual(names, ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(len(client.requests), 3)
+
+    def test_paths(self):
+        """
+        Confirms dirs are listed by their absolute paths, built from the path
+        the service gives for the start dir.
+        """
+        for start, paths in (('/', ['/', '/a', '/a/y', '/e']),
+                             ('/a', ['/a', '/a/y'])):
+            client = FakeLsClient(TREE)
+            names = [x['name'] for x in RecursiveLsResponse(
+                client, 'ep', 3, True, {'path': start})]
+            self.assertEqual([path for path, _, _ in client.requests], paths)
+        self.assertEqual(names, ['x', 'y', 'y/z'])
+
+    def test_path_tree(self):
+        tree = _PathTree()
+        a = tree.add(0, 'a')
+        b = tree.add(a, ''.join(['b', 'in']))
+        c = tree.add(b, ''.join(['b', 'in']))
+        self.assertEqual(tree.path(0), ('', 0))
+        self.assertEqual(tree.path(a), ('a', 1))
+        self.assertEqual(tree.path(c), ('a/bin/bin', 3))
+        self.assertIs(tree.names[b], tree.names[c])
+
+        # dirs are dropped once they, and everything under them, are listed
+        d = tree.add(a, 'd')
+        for node in (0, a, b):
+            tree.release(node)
+        self.assertEqual(len(tree), 5)
+        tree.release(c)
+        self.assertEqual(len(tree), 3)
+        e = tree.add(d, 'bin')
+        self.assertIn(e, (b, c))
+        self.assertEqual(tree.path(e), ('a/d/bin', 3))
+        tree.release(d)
+        tree.release(e)
+        self.assertEqual(len(tree), 1)
+        self.assertEqual(tree._interned, {})
+
+    def test_tree_size(self):
+        """
+        Confirms a full traversal of a deep, wide tree only holds the dirs
+        still to be listed, and those above them.
+        """
+        def subtree(depth):
+            if not depth:
+                return {}
+            return dict(('d{}'.format(n), subtree(depth - 1))
+                        for n in range(4))
+        client = FakeLsClient(subtree(6))
+
+        sizes = []
+        add = _PathTree.add
+
+        def tracked_add(tree, parent, name):
+            node = add(tree, parent, name)
+            sizes.append(len(tree))
+            return node
+        with patch.object(_PathTree, 'add', tracked_add), \
+                patch('globus_cli.services.recursive_ls.time.sleep'):
+            names = [x['name'] for x in RecursiveLsResponse(
+                client, 'ep', 10, True, {'path': '/'})]
+
+        self.assertEqual(len(names), sum(4 ** n for n in range(1, 7)))
+        # the root, and at most 4 dirs found at each depth on the way down
+        self.assertLessEqual(max(sizes), 1 + 4 * 6)
+
+    def test_pruning(self):
+        """
+        Confirms excluded dirs are neither given nor listed, included names
+        are selected by the service where they can be, and listing stops at
+        the most entries.
+        """
+        def ls(depth, **kwargs):
+            client = FakeLsClient(TREE)
+            names = [x['name'] for x in RecursiveLsResponse(
+                client, 'ep', depth, True, {'path': '/'}, **kwargs)]
+            return names, client
+
+        names, client = ls(3, exclude_dirs=('?',))
+        self.assertEqual(names, ['b', 'c', 'd'])
+        self.assertEqual(len(client.requests), 1)
+        names, client = ls(3, exclude_dirs=('e', 'y'))
+        self.assertEqual(names, ['a', 'b', 'c', 'd', 'a/x'])
+
+        names, client = ls(3, include=('[bxz]',))
+        self.assertEqual(names, ['b', 'a/x', 'a/y/z'])
+        self.assertEqual(set(client.filters), set([None]))
+        names, client = ls(1, include=('*',), exclude_dirs=('a',))
+        self.assertEqual(names, ['b', 'c', 'd', 'e'])
+        self.assertEqual(client.filters, [None, 'name:~*'])
+        names, client = ls(0, include=('[ab]', 'c*'))
+        self.assertEqual(names, ['a', 'b', 'c'])
+        self.assertEqual(client.filters, [None])
+
+        names, client = ls(3, max_entries=6)
+        self.assertEqual(names, ['a', 'b', 'c', 'd', 'e', 'a/x'])
+        self.assertEqual(len(client.requests), 2)
+        names, client = ls(0, max_entries=2)
+        self.assertEqual(names, ['a', 'b'])
+        self.assertEqual(client.requests, [('/', 0, 2)])
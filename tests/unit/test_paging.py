@@ -0,0 +1,123 @@
+import threading
+import time
+import unittest
+
+from globus_sdk import GlobusResponse
+from globus_sdk.transfer.paging import PaginatedResource
+
+from globus_cli.services.paging import prefetching, map_concurrently
+
+
+class FakePage(GlobusResponse):
+    def __iter__(self):
+        return iter(self.data['DATA'])
+
+
+class FakeClient(object):
+    """
+    Serves `total` numbered results, by offset, recording each request.
+    """
+    def __init__(self, total):
+        self.total = total
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get(self, path, params=None, response_class=None):
+        with self.lock:
+            self.requests.append((params['offset'], params['limit']))
+        start = params['offset']
+        end = min(start + params['limit'], self.total)
+        return FakePage({'DATA': [{'n': n} for n in range(start, end)],
+                         'total': self.total,
+                         'has_next_page': end < self.total})
+
+    def listing(self, num_results, paging_style):
+        return PaginatedResource(
+            self.get, '/things', {'params': {}}, num_results=num_results,
+            max_results_per_call=3, paging_style=paging_style)
+
+
+class PrefetchingTests(unittest.TestCase):
+
+    def test_parallel_total(self):
+        """
+        Confirms offset pages are fetched in parallel, once each, and results
+        come out in order.
+        """
+        client = FakeClient(17)
+        results = prefetching(
+            client.listing(None, PaginatedResource.PAGING_STYLE_TOTAL),
+            client_factory=lambda: client, window=2, workers=2)
+        self.assertEqual([x['n'] for x in results], list(range(17)))
+        self.assertEqual(sorted(client.requests),
+                         [(n, 3) for n in range(0, 17, 3)])
+
+    def test_parallel_total_limited(self):
+        client = FakeClient(17)
+        results = prefetching(
+            client.listing(8, PaginatedResource.PAGING_STYLE_TOTAL),
+            client_factory=lambda: client)
+        self.assertEqual([x['n'] for x in results], list(range(8)))
+        self.assertEqual(sorted(client.requests), [(0, 3), (3, 3), (6, 2)])
+
+    def test_single_page(self):
+        client = FakeClient(2)
+        results = prefetching(
+            client.listing(None, PaginatedResource.PAGING_STYLE_TOTAL),
+            client_factory=lambda: client)
+        self.assertEqual([x['n'] for x in results], [0, 1])
+
+    def test_pipelined(self):
+        client = FakeClient(10)
+        results = prefetching(
+            client.listing(None, PaginatedResource.PAGING_STYLE_HAS_NEXT))
+        self.assertEqual([x['n'] for x in results], list(range(10)))
+
+    def test_pipelined_own_client(self):
+        """
+        Confirms pages after the first are fetched with a client from the
+        client_factory, not the caller's.
+        """
+        client, own_client = FakeClient(10), FakeClient(10)
+        results = prefetching(
+            client.listing(None, PaginatedResource.PAGING_STYLE_HAS_NEXT),
+            client_factory=lambda: own_client)
+        self.assertEqual([x['n'] for x in results], list(range(10)))
+        self.assertEqual(client.requests, [(0, 3)])
+        self.assertEqual(own_client.requests, [(3, 3), (6, 3), (9, 3)])
+
+    def test_pipelined_closed_early(self):
+        """
+        Confirms the fetcher stops when the consumer stops iterating, even
+        while it is blocked on a full window with more than one result left
+        to hand over -- here, the last result and the end of the results.
+        """
+        threads = threading.active_count()
+        client = FakeClient(5)
+        results = prefetching(
+            client.listing(None, PaginatedResource.PAGING_STYLE_HAS_NEXT),
+            window=1)
+        self.assertEqual(next(results)['n'], 0)
+        # let the fetcher fill the window
+        time.sleep(0.2)
+        results.close()
+
+        deadline = time.time() + 5
+        while threading.active_count() > threads and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_not_paginated(self):
+        data = [1, 2]
+        self.assertIs(prefetching(data), data)
+
+    def test_map_concurrently(self):
+        calls = []
+
+        def double(client, key):
+            calls.append(key)
+            return key * 2
+
+        self.assertEqual(map_concurrently(double, [1, 2, 2, 3], object),
+                         {1: 2, 2: 4, 3: 6})
+        self.assertEqual(sorted(calls), [1, 2, 3])
@@ -0,0 +1,156 @@
+import io
+import os
+import shlex
+import tempfile
+import unittest
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+import click
+import six
+
+from globus_cli.parsing import (
+    TaskPath, shlex_process_stdin, process_batch_input)
+
+
+BATCH_INPUT = u"""\
+# a comment, and a blank line
+
+a/b.txt c/d.txt
+  --recursive  dir1 dir2
+dir3 -r dir4
+"quoted path" other
+escaped\\ path other # trailing comment
+../up ./here
+"""
+
+
+class ShlexProcessStdinTests(unittest.TestCase):
+
+    def _run(self, batch_input, source_base=None, dest_base=None):
+        items = []
+
+        @click.command()
+        @click.option('--recursive', '-r', is_flag=True)
+        @click.argument('source_path', type=TaskPath(base_dir=source_base))
+        @click.argument('dest_path', type=TaskPath(base_dir=dest_base))
+        def process_batch_line(dest_path, source_path, recursive):
+            items.append((str(source_path), str(dest_path), recursive))
+
+        with patch('sys.stdin', six.StringIO(batch_input)):
+            shlex_process_stdin(process_batch_line, 'helptext')
+        return items
+
+    def test_fast_path_matches_shlex(self):
+        """
+        Processes lines which do and do not use shlex features, and confirms
+        that the results are the same as those of splitting every line with
+        shlex and running it through Click.
+        """
+        expected = []
+
+        @click.command()
+        @click.option('--recursive', '-r', is_flag=True)
+        @click.argument('source_path', type=TaskPath(base_dir='/src/'))
+        @click.argument('dest_path', type=TaskPath(base_dir='/dst/'))
+        def slow_line(dest_path, source_path, recursive):
+            expected.append((str(source_path), str(dest_path), recursive))
+
+        for line in BATCH_INPUT.splitlines():
+            argv = shlex.split(line, comments=True)
+            if argv:
+                slow_line.main(args=argv, standalone_mode=False)
+
+        self.assertEqual(self._run(BATCH_INPUT, '/src/', '/dst/'), expected)
+        self.assertEqual(expected[1], ('/src/dir1', '/dst/dir2', True))
+        self.assertEqual(expected[3], ('/src/quoted path', '/dst/other',
+                                       False))
+
+    def test_malformed_line_uses_click(self):
+        """
+        Confirms that a line with the wrong number of arguments still fails
+        with Click's usage error.
+        """
+        with self.assertRaises(SystemExit) as ctx:
+            self._run(u"a b\nonly_one\n")
+        self.assertEqual(ctx.exception.code, 2)
+
+
+class ProcessBatchInputTests(unittest.TestCase):
+
+    def setUp(self):
+        self.items = []
+
+        @click.command()
+        @click.option('--recursive', '-r', is_flag=True)
+        @click.argument('source_path', type=TaskPath(base_dir='/src/'))
+        @click.argument('dest_path', type=TaskPath(base_dir='/dst/'))
+        def process_batch_line(dest_path, source_path, recursive):
+            self.items.append((str(source_path), str(dest_path), recursive))
+
+        self.process_batch_line = process_batch_line
+
+    def _run(self, batch_format, data, use_file=True):
+        if use_file:
+            fd, filename = tempfile.mkstemp()
+            self.addCleanup(os.remove, filename)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            process_batch_input(self.process_batch_line, 'helptext',
+                                batch_format=batch_format, batch_file=filename)
+        else:
+            stdin = io.TextIOWrapper(io.BytesIO(data))
+            with patch('sys.stdin', stdin):
+                process_batch_input(self.process_batch_line, 'helptext',
+                                    batch_format=batch_format)
+        return self.items
+
+    def test_null(self):
+        """
+        Confirms NUL-delimited records are consumed in SOURCE, DEST pairs from
+        both stdin and files.
+        """
+        data = b'a b\0c\0d\0e\0'
+        expected = [('/src/a b', '/dst/c', False), ('/src/d', '/dst/e', False)]
+        self.assertEqual(self._run('null', data, use_file=False), expected)
+        self.items = []
+        self.assertEqual(self._run('null', data), expected)
+
+    def test_null_incomplete_group(self):
+        with self.assertRaises(click.UsageError):
+            self._run('null', b'a\0b\0c\0')
+
+    def test_ndjson(self):
+        data = (b'{"source_path": "a", "dest_path": "b"}\n'
+                b'\n'
+                b'{"source_path": "c d", "dest_path": "e", "recursive": true}')
+        self.assertEqual(self._run('ndjson', data),
+                         [('/src/a', '/dst/b', False),
+                          ('/src/c d', '/dst/e', True)])
+
+    def test_ndjson_error_location(self):
+        data = (b'{"source_path": "a", "dest_path": "b"}\n'
+                b'{"source_path": "a", "dest_path": "b", "bogus": 1}\n')
+        with self.assertRaises(click.UsageError) as ctx:
+            self._run('ndjson', data)
+        self.assertIn('line 2', ctx.exception.message)
+        self.assertIn('bogus', ctx.exception.message)
+
+    def test_csv(self):
+        data = b'a,b\n"c,\nd",e,yes\n'
+        self.assertEqual(self._run('csv', data),
+                         [('/src/a', '/dst/b', False),
+                          ('/src/c,\nd', '/dst/e', True)])
+
+    def test_csv_header(self):
+        data = b'recursive,dest_path,source_path\ntrue,b,a\n'
+        self.assertEqual(self._run('csv', data),
+                         [('/src/a', '/dst/b', True)])
+
+    def test_shlex_file(self):
+        data = b'a b\n"c d" e -r\n'
+        self.assertEqual(self._run('shlex', data),
+                         [('/src/a', '/dst/b', False),
+                          ('/src/c d', '/dst/e', True)])
@@ -0,0 +1,138 @@
+import errno
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+from click.testing import CliRunner
+from globus_sdk.response import GlobusResponse
+
+from globus_cli.services.successful_transfers import (
+    successful_transfer_pages, export_successful_transfers)
+
+
+class FakeClient(object):
+    """
+    Serves successful transfers in pages of two, optionally failing when
+    asked for the page with a given marker.
+    """
+    def __init__(self, count, fail_at=None):
+        self.records = [{'DATA_TYPE': 'successful_transfer',
+                         'source_path': u'/src/{}'.format(i),
+                         'destination_path': u'/dst/\t{}'.format(i)}
+                        for i in range(count)]
+        self.fail_at = fail_at
+        self.markers = []
+        self.threads = set()
+
+    def qjoin_path(self, *parts):
+        return '/' + '/'.join(parts)
+
+    def get(self, path, params=None):
+        marker = params.get('marker')
+        self.markers.append(marker)
+        self.threads.add(threading.current_thread())
+        if marker is not None and marker == self.fail_at:
+            raise RuntimeError('page fetch failed')
+        start = int(marker or 0)
+        end = start + 2
+        return GlobusResponse({
+            'DATA': self.records[start:end],
+            'next_marker': str(end) if end < len(self.records) else 0})
+
+
+class SuccessfulTransfersTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, 'export')
+
+    def _read(self):
+        with io.open(self.path, encoding='utf-8') as f:
+            return f.read()
+
+    def test_pages(self):
+        client = FakeClient(5)
+        pages = list(successful_transfer_pages(client, 'task'))
+        self.assertEqual([(m, len(r), n) for m, r, n in pages],
+                         [(None, 2, '2'), ('2', 2, '4'), ('4', 1, None)])
+        self.assertEqual(client.markers, [None, '2', '4'])
+
+    def test_stopped_early(self):
+        """
+        Confirms the fetcher thread finishes when the caller stops iterating,
+        whatever it was doing.
+        """
+        for count in (5, 7):
+            client = FakeClient(count, fail_at='6')
+            pages = successful_transfer_pages(client, 'task')
+            next(pages)
+            # let the fetcher fetch ahead, and block handing over pages
+            while len(client.markers) < 3:
+                pass
+            pages.close()
+            for thread in client.threads:
+                thread.join(5)
+                self.assertFalse(thread.is_alive())
+
+    def test_interrupted_and_resumed(self):
+        """
+        Confirms an interrupted export prints the marker to resume from, and
+        resuming it appends exactly the missing records.
+        """
+        runner = CliRunner()
+        with runner.isolation() as output:
+            with self.assertRaises(RuntimeError):
+                export_successful_transfers(FakeClient(5, fail_at='4'),
+                                            'task', 'ndjson',
+                                            output_file=self.path)
+            self.assertIn(b'--resume-from-marker 4', output.getvalue())
+        self.assertEqual(len(self._read().splitlines()), 4)
+
+        export_successful_transfers(FakeClient(5), 'task', 'ndjson',
+                                    output_file=self.path, marker='4')
+        records = [json.loads(line) for line in self._read().splitlines()]
+        self.assertEqual([r['source_path'] for r in records],
+                         ['/src/{}'.format(i) for i in range(5)])
+
+    def test_closed_stdout(self):
+        """
+        Confirms stdout being closed by its reader, as by `head`, ends the
+        export quietly, as no failure.
+        """
+        class ClosedPipe(object):
+            def __init__(self):
+                self.writes = 0
+
+            def write(self, text):
+                self.writes += 1
+                if self.writes > 1:
+                    raise IOError(errno.EPIPE, 'Broken pipe')
+
+            def flush(self):
+                pass
+
+        stream = ClosedPipe()
+        client = FakeClient(9)
+        with patch('click.get_text_stream', return_value=stream):
+            with patch('globus_cli.services.successful_transfers.safeprint'
+                       ) as safeprint:
+                export_successful_transfers(client, 'task', 'ndjson')
+        self.assertEqual(stream.writes, 2)
+        self.assertFalse(safeprint.called)
+
+    def test_tsv(self):
+        export_successful_transfers(FakeClient(3), 'task', 'tsv',
+                                    output_file=self.path)
+        lines = self._read().splitlines()
+        self.assertEqual(lines[0], 'source_path\tdestination_path')
+        self.assertEqual(lines[1], '/src/0\t/dst/\\t0')
+        self.assertEqual(len(lines), 4)
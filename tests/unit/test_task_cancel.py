@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+import unittest
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+from click.testing import CliRunner
+from globus_sdk.response import GlobusResponse
+
+from globus_cli.commands.task.cancel import cancel_task
+from globus_cli.parsing import DurationType
+from globus_cli.services.bulk_cancel import cancel_tasks, RateLimiter
+
+
+class FakeClient(object):
+    """
+    Lists the given task rows, and cancels any task not in `fail`.
+    """
+    def __init__(self, rows, fail=()):
+        self.rows = rows
+        self.fail = fail
+        self.list_params = []
+        self.cancelled = []
+        self.lock = threading.Lock()
+
+    def task_list(self, num_results=10, **params):
+        self.list_params.append(dict(params, num_results=num_results))
+        return [GlobusResponse(row) for row in self.rows]
+
+    def cancel_task(self, task_id):
+        if task_id in self.fail:
+            raise RuntimeError('unexpected')
+        with self.lock:
+            self.cancelled.append(task_id)
+        return GlobusResponse({'code': 'Canceled',
+                               'message': 'The task has been cancelled.'})
+
+
+class CancelTasksTests(unittest.TestCase):
+
+    def test_all_cancelled(self):
+        client = FakeClient([])
+        task_ids = [str(i) for i in range(50)]
+        results = list(cancel_tasks(task_ids, client_factory=lambda: client,
+                                    workers=4, max_rate=10000))
+        self.assertEqual(sorted(client.cancelled), sorted(task_ids))
+        # results are in the order of the tasks, not of completion
+        self.assertEqual([r['task_id'] for r in results], task_ids)
+        self.assertFalse(any(r['error'] for r in results))
+
+    def test_results_in_order(self):
+        """
+        Confirms results are given in the order of the tasks even when the
+        first cancellation completes last.
+        """
+        client = FakeClient([])
+        cancel = client.cancel_task
+
+        def slow_cancel(task_id):
+            if task_id == '0':
+                time.sleep(0.2)
+            return cancel(task_id)
+        client.cancel_task = slow_cancel
+
+        task_ids = [str(i) for i in range(5)]
+        results = cancel_tasks(task_ids, client_factory=lambda: client,
+                               workers=2, max_rate=10000)
+        self.assertEqual(client.cancelled[-1], '0')
+        self.assertEqual([r['task_id'] for r in results], task_ids)
+
+    def test_unexpected_error_raised(self):
+        client = FakeClient([], fail=('3',))
+        with self.assertRaises(RuntimeError):
+            list(cancel_tasks([str(i) for i in range(5)],
+                              client_factory=lambda: client, workers=2,
+                              max_rate=10000))
+
+    def test_rate_limiter_spacing(self):
+        sleeps = []
+        limiter = RateLimiter(4)
+        with patch('globus_cli.services.bulk_cancel.time.time',
+                   lambda: 100.0), \
+                patch('globus_cli.services.bulk_cancel.time.sleep',
+                      sleeps.append):
+            for _ in range(3):
+                limiter.wait()
+        self.assertEqual(sleeps, [0.25, 0.5])
+
+
+class CancelCommandTests(unittest.TestCase):
+
+    def _run(self, client, args):
+        with patch('globus_cli.commands.task.cancel.get_client',
+                   lambda: client):
+            return CliRunner().invoke(cancel_task, args)
+
+    def test_filters(self):
+        """
+        Confirms label and age are sent as task list filters, and endpoint is
+        matched against the rows returned.
+        """
+        ep = '0c2cbd6a-8f2f-11e7-a18d-22000a92523b'
+        client = FakeClient([
+            {'task_id': 'a', 'source_endpoint_id': ep,
+             'destination_endpoint_id': 'other'},
+            {'task_id': 'b', 'source_endpoint_id': 'other',
+             'destination_endpoint_id': 'other'},
+            {'task_id': 'c', 'source_endpoint_id': 'other',
+             'destination_endpoint_id': ep}])
+        result = self._run(client, ['--all', '--label', 'nightly*',
+                                    '--endpoint', ep, '--older-than', '2h',
+                                    '-F', 'json'])
+
+        self.assertEqual(result.exit_code, 0)
+        params = client.list_params[0]
+        self.assertIsNone(params['num_results'])
+        filters = params['filter'].split('/')
+        self.assertIn('label:~nightly*', filters)
+        self.assertTrue(filters[-1].startswith('request_time:,'))
+        self.assertEqual(sorted(client.cancelled), ['a', 'c'])
+
+        doc = json.loads(result.output)
+        self.assertEqual(doc['task_ids'], ['a', 'c'])
+        self.assertEqual([r['task_id'] for r in doc['results']], ['a', 'c'])
+
+    def test_text_progress(self):
+        client = FakeClient([{'task_id': 'a'}, {'task_id': 'b'}])
+        result = self._run(client, ['--all'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(result.output.splitlines(), [
+            'a (1 of 2): The task has been cancelled.',
+            'b (2 of 2): The task has been cancelled.'])
+
+    def test_filters_require_all(self):
+        result = self._run(FakeClient([]), ['abc', '--older-than', '1d'])
+        self.assertEqual(result.exit_code, 2)
+
+
+class DurationTypeTests(unittest.TestCase):
+
+    def test_convert(self):
+        duration = DurationType()
+        self.assertEqual(duration.convert('90', None, None), 90)
+        self.assertEqual(duration.convert('30m', None, None), 1800)
+        self.assertEqual(duration.convert('2D', None, None), 172800)
+        with self.assertRaises(Exception):
+            duration.convert('soon', None, None)
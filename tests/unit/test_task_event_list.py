@@ -0,0 +1,115 @@
+import json
+import unittest
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+from click.testing import CliRunner
+from globus_sdk.response import GlobusResponse
+
+from globus_cli.commands.task.event_list import task_event_list
+
+
+def _event(time, code='PROGRESS'):
+    return GlobusResponse({'DATA_TYPE': 'event', 'time': time, 'code': code,
+                           'is_error': False, 'details': 'x'})
+
+
+class FakeClient(object):
+    """
+    Serves a list of events, newest first, which grows with each listing.
+    """
+    def __init__(self, batches):
+        self.batches = batches
+        self.events = []
+        self.num_results = []
+
+    def task_event_list(self, task_id, num_results=10, **params):
+        self.num_results.append(num_results)
+        if self.batches:
+            self.events = self.batches.pop(0) + self.events
+        return iter(self.events[:num_results] if num_results else
+                    self.events)
+
+
+class TaskEventListTests(unittest.TestCase):
+
+    def _run(self, client, args):
+        with patch('globus_cli.commands.task.event_list.get_client',
+                   lambda: client), \
+                patch('globus_cli.commands.task.event_list.time.sleep'):
+            return CliRunner().invoke(task_event_list, ['TASK_ID'] + args)
+
+    def test_unlimited_streamed_json(self):
+        client = FakeClient([[_event('2017-01-01 00:00:0{}'.format(i))
+                              for i in range(3)]])
+        result = self._run(client, ['--limit', 'unlimited', '-F', 'json'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(client.num_results, [None])
+        self.assertEqual(len(json.loads(result.output)['DATA']), 3)
+
+    def test_bad_limit(self):
+        result = self._run(FakeClient([]), ['--limit', '0'])
+        self.assertEqual(result.exit_code, 2)
+
+    def test_follow(self):
+        """
+        Confirms that following prints history oldest first, and then only
+        new events -- including a new event with the same timestamp as an
+        old one.
+        """
+        client = FakeClient([
+            [_event('2017-01-01 00:00:02'), _event('2017-01-01 00:00:01')],
+            [],
+            [_event('2017-01-01 00:00:03'),
+             _event('2017-01-01 00:00:02', code='OTHER')],
+        ])
+
+        def stop_after_polls(seconds):
+            if len(client.num_results) >= 3:
+                raise KeyboardInterrupt()
+
+        with patch('globus_cli.commands.task.event_list.get_client',
+                   lambda: client), \
+                patch('globus_cli.commands.task.event_list.time.sleep',
+                      stop_after_polls):
+            result = CliRunner().invoke(
+                task_event_list, ['TASK_ID', '--follow', '-F', 'json'])
+
+        self.assertEqual(result.exit_code, 0)
+        events = [json.loads(line) for line in result.output.splitlines()]
+        self.assertEqual([(e['time'][-2:], e['code']) for e in events],
+                         [('01', 'PROGRESS'), ('02', 'PROGRESS'),
+                          ('02', 'OTHER'), ('03', 'PROGRESS')])
+
+    def test_follow_batched_writes(self):
+        """
+        Confirms that following writes each batch of events at once, before
+        waiting for more.
+        """
+        client = FakeClient([
+            [_event('2017-01-01 00:00:02'), _event('2017-01-01 00:00:01')],
+            [],
+            [_event('2017-01-01 00:00:03')],
+        ])
+        writes = []
+        writes_before_sleep = []
+
+        def stop_after_polls(seconds):
+            writes_before_sleep.append(len(writes))
+            if len(client.num_results) >= 3:
+                raise KeyboardInterrupt()
+
+        with patch('globus_cli.commands.task.event_list.get_client',
+                   lambda: client), \
+                patch('globus_cli.commands.task.event_list.time.sleep',
+                      stop_after_polls), \
+                patch('globus_cli.safeio.write.safeprint',
+                      lambda text, **kwargs: writes.append(text)):
+            result = CliRunner().invoke(
+                task_event_list, ['TASK_ID', '--follow', '-F', 'json'])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(writes_before_sleep, [1, 1, 2])
+        self.assertEqual([len(text.splitlines()) for text in writes], [2, 1])
@@ -0,0 +1,179 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+from click.testing import CliRunner
+from globus_sdk.response import GlobusResponse
+
+from globus_cli.services import task_history
+from globus_cli.services.task_history import TaskHistory
+from globus_cli.commands.task.list import task_list
+from globus_cli.commands.task.show import show_task
+
+
+def _task(task_id, status='SUCCEEDED', request_time='2017-08-01T10:00:00',
+          label=None, source='ep1', destination='ep2'):
+    return {'task_id': task_id, 'status': status, 'type': 'TRANSFER',
+            'label': label, 'source_endpoint_id': source,
+            'destination_endpoint_id': destination,
+            'source_endpoint_display_name': source,
+            'destination_endpoint_display_name': destination,
+            'request_time': request_time + '+00:00',
+            'completion_time': (None if status in ('ACTIVE', 'INACTIVE')
+                                else request_time + '+00:00')}
+
+
+class FakeClient(object):
+    """
+    Serves task_list from a list of tasks, honoring request_time and task_id
+    filters.
+    """
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.filters = []
+        self.get_task_calls = []
+
+    def task_list(self, num_results=10, filter=''):
+        self.filters.append(filter)
+        tasks = self.tasks
+        for part in filter.split('/'):
+            name, _, value = part.partition(':')
+            if name == 'request_time':
+                start = value.split(',')[0].replace(' ', 'T')
+                tasks = [t for t in tasks if t['request_time'] >= start]
+            elif name == 'task_id':
+                tasks = [t for t in tasks if t['task_id'] in value.split(',')]
+        return [GlobusResponse(dict(t)) for t in tasks]
+
+    def get_task(self, task_id):
+        self.get_task_calls.append(task_id)
+        return GlobusResponse(dict(
+            [t for t in self.tasks if t['task_id'] == task_id][0]))
+
+
+class TaskHistoryTests(unittest.TestCase):
+
+    def setUp(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'cli', 'task_history.sqlite')
+
+        self.token = 'refresh-token-1'
+        for patcher in (
+                patch.object(task_history, '_history_path', lambda: path),
+                patch.object(task_history, 'lookup_option',
+                             lambda option: self.token)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_incremental_sync(self):
+        """
+        Confirms a second sync only asks for tasks requested since the first,
+        and refreshes the tasks which were unfinished.
+        """
+        client = FakeClient([
+            _task('a', request_time='2017-08-01T10:00:00'),
+            _task('b', status='ACTIVE', request_time='2017-08-02T10:00:00'),
+            _task('c', status='ACTIVE', request_time='2017-08-03T10:00:00')])
+        history = TaskHistory()
+        self.assertEqual(history.sync(client), 3)
+
+        client.tasks[1]['status'] = 'FAILED'
+        client.tasks.append(
+            _task('d', request_time='2017-08-04T10:00:00'))
+        client.filters = []
+        self.assertEqual(history.sync(client), 3)
+        self.assertEqual(client.filters, [
+            'type:TRANSFER,DELETE/request_time:2017-08-03 10:00:00,',
+            'task_id:b'])
+
+        self.assertEqual(history.count(), 4)
+        self.assertEqual(history.get_finished_task('b')['status'], 'FAILED')
+        self.assertIsNone(history.get_finished_task('c'))
+
+    def test_query(self):
+        history = TaskHistory()
+        history.store([
+            _task('a', label='Nightly_Backup', source='x',
+                  request_time='2017-08-01T10:00:00'),
+            _task('b', label='nightly-restore', destination='x',
+                  request_time='2017-08-02T10:00:00'),
+            _task('c', status='FAILED', label='adhoc',
+                  request_time='2017-08-03T10:00:00'),
+            _task('d', status='FAILED', destination='x',
+                  request_time='2017-09-01T10:00:00')])
+
+        def ids(**kwargs):
+            return [t['task_id'] for t in history.query(**kwargs)]
+
+        self.assertEqual(ids(), ['d', 'c', 'b', 'a'])
+        self.assertEqual(ids(limit=2), ['d', 'c'])
+        self.assertEqual(ids(labels=['nightly*']), ['b', 'a'])
+        self.assertEqual(ids(labels=['nightly_*']), ['a'])
+        self.assertEqual(ids(not_labels=['nightly*']), ['d', 'c'])
+        self.assertEqual(ids(labels=['adhoc'], exact=True), ['c'])
+        self.assertEqual(ids(statuses=['FAILED'], endpoint_ids=['x']), ['d'])
+        self.assertEqual(ids(endpoint_ids=['x'],
+                             requested_before='2017-08-31'), ['b', 'a'])
+        self.assertEqual(ids(requested_after='2017-08-02',
+                             completed_before='2017-08-31 00:00:00'),
+                         ['c', 'b'])
+
+    def test_other_identity_cleared(self):
+        history = TaskHistory()
+        history.store([_task('a')])
+        history.close()
+
+        self.token = 'refresh-token-2'
+        self.assertEqual(TaskHistory().count(), 0)
+
+    def test_commands(self):
+        """
+        Confirms task list --local and task show of a finished task make no
+        API calls, and that task show never creates or changes the history.
+        """
+        client = FakeClient([_task('a'), _task('b', status='ACTIVE')])
+
+        def show(task_ids):
+            with patch('globus_cli.commands.task.show.get_client',
+                       lambda: client):
+                for task_id in task_ids:
+                    result = CliRunner().invoke(show_task,
+                                                [task_id, '-F', 'json'])
+                    self.assertEqual(result.exit_code, 0)
+
+        show(['a', 'b'])
+        self.assertEqual(client.get_task_calls, ['a', 'b'])
+        self.assertFalse(os.path.exists(task_history._history_path()))
+
+        history = TaskHistory()
+        history.store([_task('a'), _task('b', status='ACTIVE')])
+        history.close()
+        client.get_task_calls = []
+        show(['a', 'b'])
+        self.assertEqual(client.get_task_calls, ['b'])
+
+        self.token = 'refresh-token-2'
+        client.get_task_calls = []
+        show(['a'])
+        self.assertEqual(client.get_task_calls, ['a'])
+        self.token = 'refresh-token-1'
+
+        with patch('globus_cli.commands.task.list.get_client',
+                   lambda: self.fail('called the API')):
+            result = CliRunner().invoke(task_list,
+                                        ['--local', '-F', 'json'])
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual([t['task_id'] for t in
+                          json.loads(result.output)['DATA']], ['b', 'a'])
+
+        result = CliRunner().invoke(task_list, ['--filter-endpoint',
+                                                '0c2cbd6a-8f2f-11e7-a18d-'
+                                                '22000a92523b'])
+        self.assertEqual(result.exit_code, 2)
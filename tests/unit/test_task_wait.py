@@ -0,0 +1,115 @@
+import json
+import unittest
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+from click.testing import CliRunner
+from globus_sdk.response import GlobusResponse
+
+from globus_cli.commands.task.wait import task_wait
+
+A = '1a2a2b2e-6d04-11e5-ba46-22000b92c6ec'
+B = '2b2a2b2e-6d04-11e5-ba46-22000b92c6ec'
+C = '3c2a2b2e-6d04-11e5-ba46-22000b92c6ec'
+
+
+class FakeClient(object):
+    """
+    Tasks finish after a given number of polls, with a given status.
+    """
+    def __init__(self, finish_after):
+        self.finish_after = finish_after
+        self.polls = dict((task_id, 0) for task_id in finish_after)
+        self.task_list_calls = []
+
+    def _doc(self, task_id):
+        self.polls[task_id] += 1
+        polls, final_status = self.finish_after[task_id]
+        status = final_status if self.polls[task_id] >= polls else 'ACTIVE'
+        return GlobusResponse({'task_id': task_id, 'status': status,
+                               'label': None})
+
+    def task_list(self, num_results=10, **params):
+        self.task_list_calls.append(params['filter'])
+        task_ids = params['filter'][len('task_id:'):].split(',')
+        return [self._doc(task_id) for task_id in task_ids]
+
+
+class TaskWaitMultipleTests(unittest.TestCase):
+
+    def _run(self, client, args):
+        with patch('globus_cli.services.transfer.get_client',
+                   lambda: client), \
+                patch('globus_cli.services.transfer.time.sleep'):
+            return CliRunner().invoke(task_wait, args)
+
+    def test_all(self):
+        """
+        Confirms tasks are polled together, finished tasks are dropped from
+        the poll, and one failure gives an exit status of 1.
+        """
+        client = FakeClient({A: (1, 'SUCCEEDED'), B: (3, 'FAILED'),
+                             C: (2, 'SUCCEEDED')})
+        result = self._run(client, [A, B, C, '-F', 'json'])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(client.task_list_calls,
+                         ['task_id:{},{},{}'.format(A, B, C),
+                          'task_id:{},{}'.format(B, C), 'task_id:' + B])
+        self.assertEqual(
+            [task['status'] for task in json.loads(result.output)['DATA']],
+            ['SUCCEEDED', 'FAILED', 'SUCCEEDED'])
+
+    def test_any(self):
+        client = FakeClient({A: (3, 'SUCCEEDED'), B: (2, 'SUCCEEDED')})
+        result = self._run(client, ['--any', A, B])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(len(client.task_list_calls), 2)
+
+    def test_stdin(self):
+        client = FakeClient({A: (1, 'SUCCEEDED'), B: (1, 'SUCCEEDED')})
+        with patch('globus_cli.services.transfer.get_client',
+                   lambda: client):
+            result = CliRunner().invoke(task_wait, ['--stdin'],
+                                        input='{}\n{} {}\n'.format(A, B, A))
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(client.task_list_calls,
+                         ['task_id:{},{}'.format(A, B)])
+
+    def test_invalid_ids(self):
+        for args, stdin in (([A, 'a'], None), (['--stdin'], A + ' a\n')):
+            with patch('globus_cli.services.transfer.get_client') as client:
+                result = CliRunner().invoke(task_wait, args, input=stdin)
+            self.assertEqual(result.exit_code, 2)
+            self.assertFalse(client.called)
+
+
+class TaskWaitSingleTests(unittest.TestCase):
+
+    def test_no_extra_fetch(self):
+        """
+        Confirms the last poll result is printed, without another get_task,
+        and that polling backs off.
+        """
+        statuses = ['ACTIVE', 'ACTIVE', 'ACTIVE', 'SUCCEEDED']
+        calls = []
+        sleeps = []
+
+        class Client(object):
+            def get_task(self, task_id):
+                calls.append(task_id)
+                return GlobusResponse({'task_id': task_id,
+                                       'status': statuses[len(calls) - 1]})
+
+        with patch('globus_cli.services.transfer.get_client', Client), \
+                patch('globus_cli.services.transfer.time.sleep',
+                      sleeps.append):
+            result = CliRunner().invoke(task_wait, [A, '-F', 'json'])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(sleeps, [1, 2, 4])
+        self.assertEqual(json.loads(result.output)['status'], 'SUCCEEDED')
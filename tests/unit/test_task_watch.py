@@ -0,0 +1,76 @@
+import json
+import unittest
+try:
+    from mock import patch
+except ImportError:
+    from unittest.mock import patch
+
+from click.testing import CliRunner
+from globus_sdk.response import GlobusResponse
+
+from globus_cli.commands.task.watch import task_watch
+from globus_cli.services.task_watch import TaskThroughputTracker
+
+A = '1a2a2b2e-6d04-11e5-ba46-22000b92c6ec'
+B = '2b2a2b2e-6d04-11e5-ba46-22000b92c6ec'
+
+
+class TaskThroughputTrackerTests(unittest.TestCase):
+
+    def test_rates_and_eta(self):
+        tracker = TaskThroughputTracker(weight=0.5)
+        task = {'task_id': 'a', 'status': 'ACTIVE', 'files': 10,
+                'files_transferred': 0, 'bytes_transferred': 0}
+
+        sample = tracker.update(task, now=100)
+        self.assertIsNone(sample['instant_bytes_per_second'])
+        self.assertIsNone(sample['eta_seconds'])
+
+        task.update(files_transferred=2, bytes_transferred=200)
+        sample = tracker.update(task, now=110)
+        self.assertEqual(sample['instant_bytes_per_second'], 20)
+        self.assertEqual(sample['ewma_bytes_per_second'], 20)
+        # 8 files of 100 bytes left, at 20 bytes per second
+        self.assertEqual(sample['eta_seconds'], 40)
+
+        task.update(files_transferred=6, bytes_transferred=600)
+        sample = tracker.update(task, now=120)
+        self.assertEqual(sample['instant_bytes_per_second'], 40)
+        self.assertEqual(sample['ewma_bytes_per_second'], 30)
+
+
+class TaskWatchCommandTests(unittest.TestCase):
+
+    def test_ndjson_batched(self):
+        """
+        Confirms that tasks are fetched with one task_list call per refresh,
+        finished tasks stop being fetched, and samples are NDJSON.
+        """
+        polls = []
+
+        class Client(object):
+            def task_list(self, num_results=10, **params):
+                polls.append(params['filter'])
+                status = 'ACTIVE' if len(polls) < 2 else 'SUCCEEDED'
+                return [GlobusResponse({'task_id': A, 'status': 'ACTIVE'}),
+                        GlobusResponse({'task_id': B, 'status': status})][
+                            :len(params['filter'].split(','))]
+
+        with patch('globus_cli.commands.task.watch.get_client', Client), \
+                patch('globus_cli.commands.task.watch.time.sleep'):
+            result = CliRunner().invoke(task_watch,
+                                        [B, A, '--count', '3'])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(polls, ['task_id:{},{}'.format(B, A),
+                                 'task_id:{},{}'.format(B, A),
+                                 'task_id:' + A])
+        samples = [json.loads(line) for line in result.output.splitlines()]
+        self.assertEqual([s['task_id'] for s in samples],
+                         [B, A, B, A, A])
+
+    def test_invalid_id(self):
+        with patch('globus_cli.commands.task.watch.get_client') as client:
+            result = CliRunner().invoke(task_watch, [A, 'a'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertFalse(client.called)
@@ -0,0 +1,90 @@
+import unittest
+
+import click
+import jmespath
+import six
+from click.testing import CliRunner
+
+from globus_cli.parsing.command_state import CommandState
+from globus_cli.safeio import formatted_print, iterable_response_to_dict
+from globus_cli.safeio.awscli_text import format_text, format_text_stream
+
+ITEMS = [{'task_id': str(n), 'status': 'ACTIVE' if n % 3 else 'FAILED',
+          'label': None if n % 2 else 'label{}'.format(n),
+          'files': [{'name': 'f{}'.format(n)}]}
+         for n in range(10)]
+
+
+def _format(data):
+    stream = six.StringIO()
+    format_text(data, stream)
+    return stream.getvalue()
+
+
+def _format_stream(items, **kwargs):
+    stream = six.StringIO()
+    format_text_stream(iter(items), stream, **kwargs)
+    return stream.getvalue()
+
+
+class FormatTextStreamTests(unittest.TestCase):
+
+    def test_same_output(self):
+        """
+        Confirms streamed output matches format_text of the whole listing,
+        with a lookahead covering some or all of the items.
+        """
+        for lookahead in (1, 3, 100):
+            self.assertEqual(
+                _format_stream(ITEMS, identifier='DATA',
+                               lookahead=lookahead),
+                _format({'DATA': ITEMS}))
+
+        for data in ([], ['a', 'b', 'c'], [1, [2, 3], 4], [[1, 2], [3]],
+                     [{'a': 1}, {'b': 2, 'c': [3]}]):
+            self.assertEqual(_format_stream(data),
+                             _format(data), data)
+            self.assertEqual(_format_stream(data, identifier='X'),
+                             _format({'X': data}), data)
+
+    def test_keys_after_lookahead(self):
+        """
+        Confirms a scalar key first seen after the lookahead is written after
+        the row of its item, and a declared schema is used as it is.
+        """
+        data = [{'a': 1}, {'a': 2, 'b': 3}]
+        self.assertEqual(_format_stream(data, lookahead=1), '1\n2\n3\n')
+        self.assertEqual(_format_stream(data, lookahead=1,
+                                        scalar_keys=['a', 'b']),
+                         _format(data))
+
+    def test_formatted_print_streams(self):
+        """
+        Confirms formatted_print prints listings in UNIX format as they are
+        iterated, with and without a JMESPath expression.
+        """
+        for expression, expected in ((None, 'DATA\t{}\n'),
+                                     ('DATA[].task_id', '{}\t')):
+            state = CommandState()
+            state.output_format = 'unix'
+            if expression:
+                state.jmespath_expr = jmespath.compile(expression)
+            task_ids = [str(n) for n in range(20000)]
+
+            def items():
+                for task_id in task_ids:
+                    if task_id == '19999':
+                        # the buffer has been written out at least once
+                        self.assertIn(expected.format('100').encode('utf-8'),
+                                      output.getvalue())
+                    yield {'task_id': task_id}
+
+            runner = CliRunner()
+            with runner.isolation() as output:
+                with click.Context(click.Command('x'), obj=state):
+                    formatted_print(items(),
+                                    json_converter=iterable_response_to_dict)
+                printed = output.getvalue().decode('utf-8')
+            self.assertEqual(printed, _format(jmespath.search(
+                expression or '@',
+                {'DATA': [{'task_id': x} for x in task_ids]})))